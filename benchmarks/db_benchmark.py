@@ -0,0 +1,222 @@
+"""
+Замер скорости записи и чтения базы данных логов.
+
+Сравниваются две конфигурации на временных файлах:
+    baseline - движок SQLite без настроек, индекс только по (timestamp, id),
+        запись логов по одной с commit на каждую, удаление суток логов
+        через DELETE
+    tuned - движок из init_db (WAL, synchronous=NORMAL, пул соединений
+        с настройками при открытии), индекс по (level, timestamp, id), запись пачками через
+        DatabaseService.add_logs, удаление суток логов через DROP TABLE
+
+Запуск из корня проекта:
+    python benchmarks/db_benchmark.py --rows 100000
+"""
+
+import argparse
+import datetime
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, insert, text
+from sqlalchemy.orm import sessionmaker
+from modules.config.settings import RETENTION_SETTINGS
+from modules.database.db_models import (
+    TerminatedProcess,
+    create_log_partition,
+    log_partition_table,
+)
+from modules.database.db_service import DatabaseService
+
+LEVELS = ["DEBUG", "INFO", "INFO", "INFO", "WARNING", "ERROR"]
+WORDS = "процесс память диск сеть замер ошибка таймаут монитор агент кэш".split()
+
+
+def make_logs(count, start):
+    """Записи (timestamp, level, source, message) с шагом 10 мс"""
+    rng = random.Random(count)
+    return [
+        (
+            start + datetime.timedelta(milliseconds=10 * i),
+            rng.choice(LEVELS),
+            f"module_{i % 17}.py:func:{i % 300}",
+            " ".join(rng.choice(WORDS) for _ in range(8)) + f" #{i}",
+        )
+        for i in range(count)
+    ]
+
+
+def open_service(path, tuned):
+    """Сервис базы данных в выбранной конфигурации"""
+    service = DatabaseService(path)
+    if not tuned:
+        service.engine.dispose()
+        service.engine = create_engine(f"sqlite:///{path}")
+        service.Session = sessionmaker(bind=service.engine)
+        with service.engine.begin() as connection:
+            connection.execute(text("PRAGMA journal_mode=DELETE"))
+            connection.execute(
+                text(
+                    f"DROP INDEX IF EXISTS "
+                    f"ix_{service.current_partition}_level_timestamp_id"
+                )
+            )
+    return service
+
+
+def insert_per_row(service, records):
+    """Прежний путь записи: commit на каждую запись"""
+    logs = log_partition_table(service.get_write_partition())
+    for timestamp, level, source, message in records:
+        with service.engine.begin() as connection:
+            connection.execute(
+                insert(logs).values(
+                    timestamp=timestamp, level=level, source=source, message=message
+                )
+            )
+
+
+def insert_batched(service, records, batch_size=500):
+    for i in range(0, len(records), batch_size):
+        service.add_logs(records[i : i + batch_size])
+
+
+def fill(service, rows, start):
+    """Быстрое заполнение таблиц для замеров чтения"""
+    records = make_logs(rows, start)
+    insert_batched(service, records, 5000)
+    processes = [
+        {
+            "timestamp": start + datetime.timedelta(seconds=i),
+            "process_name": f"proc_{i}",
+            "pid": str(1000 + i),
+            "memory_usage": float(i % 500),
+            "cpu_usage": float(i % 100),
+            "status": "running",
+            "terminated_by": "user",
+        }
+        for i in range(rows // 10)
+    ]
+    with service.engine.begin() as connection:
+        connection.execute(insert(TerminatedProcess), processes)
+
+
+def remove_day(service, tuned, rows):
+    """
+    Время удаления суток логов (rows записей), миллисекунды: таблица за
+    день удаляется целиком или те же записи удаляются через DELETE.
+    """
+    day = datetime.date(2000, 1, 1)
+    name = create_log_partition(service.engine, day, service.fts_enabled)
+    insert_batched_into(service, name, make_logs(rows, datetime.datetime(2000, 1, 1)))
+    started = time.perf_counter()
+    if tuned:
+        service.drop_log_partition(name)
+    else:
+        with service.engine.begin() as connection:
+            connection.execute(text(f"DELETE FROM {name}"))
+    return (time.perf_counter() - started) * 1000
+
+
+def insert_batched_into(service, name, records, batch_size=5000):
+    logs = log_partition_table(name)
+    keys = ("timestamp", "level", "source", "message")
+    for i in range(0, len(records), batch_size):
+        with service.engine.begin() as connection:
+            connection.execute(
+                insert(logs),
+                [dict(zip(keys, record)) for record in records[i : i + batch_size]],
+            )
+
+
+def measure(function, repeat):
+    """Медиана времени вызова, миллисекунды"""
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        times.append((time.perf_counter() - started) * 1000)
+    return statistics.median(times)
+
+
+def run(label, tuned, args, directory):
+    path = os.path.join(directory, f"{label}.db")
+    service = open_service(path, tuned)
+    start = datetime.datetime(2024, 1, 1)
+
+    sample = make_logs(args.insert_rows, start)
+    started = time.perf_counter()
+    if tuned:
+        insert_batched(service, sample)
+    else:
+        insert_per_row(service, sample)
+    insert_rate = len(sample) / (time.perf_counter() - started)
+
+    fill(service, args.rows, start + datetime.timedelta(days=1))
+
+    # Курсор страницы в середине таблицы
+    middle = service.get_logs(limit=1, before=None)[0]
+    cursor = (middle.timestamp - datetime.timedelta(seconds=args.rows // 200), 0)
+
+    results = {
+        "Запись логов, строк/с": insert_rate,
+        "Первая страница логов, мс": measure(
+            lambda: service.get_logs(limit=100), args.repeat
+        ),
+        "Страница логов ERROR, мс": measure(
+            lambda: service.get_logs(limit=100, level="ERROR"), args.repeat
+        ),
+        "Страница логов ERROR по курсору, мс": measure(
+            lambda: service.get_logs(limit=100, level="ERROR", before=cursor),
+            args.repeat,
+        ),
+        "Страница завершенных процессов, мс": measure(
+            lambda: service.get_terminated_processes(limit=100), args.repeat
+        ),
+    }
+    results["Удаление суток логов, мс"] = remove_day(service, tuned, args.day_rows)
+    service.engine.dispose()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Замер базы данных логов")
+    parser.add_argument("--rows", type=int, default=100000, help="Строк в таблице")
+    parser.add_argument(
+        "--insert-rows", type=int, default=2000, help="Строк в замере записи"
+    )
+    parser.add_argument("--repeat", type=int, default=20, help="Повторов запроса")
+    parser.add_argument(
+        "--day-rows", type=int, default=100000, help="Строк в удаляемых сутках"
+    )
+    args = parser.parse_args()
+    # Фоновая очистка не должна мешать замерам
+    RETENTION_SETTINGS["enabled"] = False
+
+    directory = tempfile.mkdtemp(prefix="db_benchmark_")
+    try:
+        # Вывод сервиса о каждом запросе мешает таблице результатов
+        with open(os.devnull, "w") as devnull:
+            stdout, sys.stdout = sys.stdout, devnull
+            try:
+                baseline = run("baseline", False, args, directory)
+                tuned = run("tuned", True, args, directory)
+            finally:
+                sys.stdout = stdout
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+    print(f"{'':40} {'baseline':>12} {'tuned':>12}")
+    for name in baseline:
+        print(f"{name:40} {baseline[name]:12.1f} {tuned[name]:12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,21 +1,134 @@
-import flet as ft
-from modules.ui.app import SystemMonitorApp
+import argparse
+from modules.utils import startup_report
 from modules.utils.logger import get_logger
 
 # Инициализация логгера
 logger = get_logger()
 
 
-def main():
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Системный монитор")
+    parser.add_argument(
+        "--headless",
+        action="store_true",
+        help="Запустить только сборщики данных, без графического интерфейса",
+    )
+    parser.add_argument(
+        "--metrics",
+        action="store_true",
+        help="Включить экспорт метрик в формате OpenMetrics",
+    )
+    parser.add_argument("--metrics-host", help="Адрес для экспорта метрик")
+    parser.add_argument("--metrics-port", type=int, help="Порт для экспорта метрик")
+    parser.add_argument("--record", metavar="FILE", help="Записывать сеанс в файл")
+    parser.add_argument(
+        "--replay", metavar="FILE", help="Воспроизвести записанный сеанс"
+    )
+    parser.add_argument(
+        "--replay-speed",
+        default="1",
+        choices=["1", "10", "max"],
+        help="Скорость воспроизведения (max - без пауз, для замера производительности UI)",
+    )
+    parser.add_argument(
+        "--agent",
+        action="store_true",
+        help="Раздавать снимки агрегатору по TCP (вместе с --headless)",
+    )
+    parser.add_argument("--agent-host", help="Адрес агента")
+    parser.add_argument("--agent-port", type=int, help="Порт агента")
+    parser.add_argument("--agent-name", help="Имя хоста для агрегатора")
+    parser.add_argument(
+        "--startup-report",
+        action="store_true",
+        help="Вывести в stderr время этапов запуска до первого кадра интерфейса",
+    )
+    parser.add_argument(
+        "--log-level",
+        choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+        help="Минимальный уровень записываемых сообщений",
+    )
+    parser.add_argument(
+        "--fleet",
+        metavar="HOST:PORT,...",
+        help="Показать сводные данные с перечисленных агентов",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    startup_report.mark("Запуск интерпретатора и импорт main")
+    args = parse_args(argv)
+    if args.startup_report:
+        startup_report.enable()
+    if args.log_level:
+        from modules.config.settings import LOG_SETTINGS
+
+        LOG_SETTINGS["level"] = args.log_level
+        logger.configure(LOG_SETTINGS)
+
+    # Настройка отображения логов в чате приложения
+    def show_log_in_chat(message, level=None, source=None):
+        # Эта функция будет переопределена в SystemMonitorApp
+        # для отображения логов в интерфейсе
+        print(message)
+
+    logger.set_chat_callback(show_log_in_chat)
+
+    if args.headless:
+        # Режим без интерфейса: Flet не импортируется вовсе
+        from modules.monitoring.headless import run_headless
+
+        try:
+            run_headless(
+                metrics=args.metrics or None,
+                metrics_host=args.metrics_host,
+                metrics_port=args.metrics_port,
+                record_path=args.record,
+                agent=args.agent,
+                agent_host=args.agent_host,
+                agent_port=args.agent_port,
+                agent_name=args.agent_name,
+                replay_path=args.replay,
+                replay_speed=(
+                    None if args.replay_speed == "max" else float(args.replay_speed)
+                ),
+            )
+        except Exception as e:
+            logger.exception(e, "Критическая ошибка в режиме без интерфейса:")
+        return
+
     logger.info("Запуск приложения Системный монитор")
     try:
-        # Настройка отображения логов в чате приложения
-        def show_log_in_chat(message):
-            # Эта функция будет переопределена в SystemMonitorApp
-            # для отображения логов в интерфейсе
-            print(message)
+        import flet as ft
+
+        startup_report.mark("Импорт flet")
+        from modules.ui.app import SystemMonitorApp
+        from modules.config.settings import (
+            METRICS_SETTINGS,
+            RECORDING_SETTINGS,
+            FLEET_SETTINGS,
+        )
+
+        startup_report.mark("Импорт интерфейса")
 
-        logger.set_chat_callback(show_log_in_chat)
+        if args.record:
+            RECORDING_SETTINGS["record_path"] = args.record
+        if args.replay:
+            RECORDING_SETTINGS["replay_path"] = args.replay
+            RECORDING_SETTINGS["replay_speed"] = (
+                None if args.replay_speed == "max" else float(args.replay_speed)
+            )
+        if args.fleet:
+            FLEET_SETTINGS["agents"] = [
+                address.strip() for address in args.fleet.split(",") if address.strip()
+            ]
+        if args.metrics:
+            METRICS_SETTINGS["enabled"] = True
+            if args.metrics_host:
+                METRICS_SETTINGS["host"] = args.metrics_host
+            if args.metrics_port is not None:
+                METRICS_SETTINGS["port"] = args.metrics_port
 
         # Запуск приложения
         ft.app(SystemMonitorApp)
@@ -13,6 +13,11 @@ WINDOW_SETTINGS = {
 TABLE_SETTINGS = {
     "height": 700,
     "padding": 15,
+    "row_height": 40,  # высота строки списка процессов, пиксели
+    "overscan": 10,  # строки, создаваемые сверх видимого окна с каждой стороны
+    # Пауза, после которой нажатие начинает новую серию: первое нажатие серии
+    # фильтруется сразу, следующие - после такой паузы в наборе, секунды
+    "search_debounce": 0.03,
 }
 
 # Настройки мониторинга
@@ -20,6 +25,132 @@ MONITORING_SETTINGS = {
     "process_update_interval": 2,  # секунды
     "performance_update_interval": 1,  # секунды
     "performance_history_length": 60,  # количество точек в истории
+    "stream_queue_size": 256,  # размер очереди потоковых подписчиков
+    "collector_workers": 2,  # потоки для блокирующих замеров в режиме asyncio
+    "process_limit": None,  # сколько процессов отдавать (None - все)
+}
+
+# Настройки логгера
+LOG_SETTINGS = {
+    "level": "INFO",  # минимальный записываемый уровень (DEBUG для отладки)
+    "rate_limit": 20,  # сообщений в секунду из одного места вызова (0 - без ограничения)
+    "rate_limit_level": "INFO",  # старший ограничиваемый уровень (WARNING и выше - никогда)
+    "queue_size": 10000,  # записей в очереди до отбрасывания
+    "batch_size": 500,  # записей в одной пачке (одна вставка и один commit)
+    "flush_interval": 0.5,  # секунды накопления пачки
+    "block_timeout": 0.5,  # ожидание места в очереди для WARNING и выше
+    # Файлы лога: новый файл каждый день и при превышении размера
+    "max_file_bytes": 10 * 1024 * 1024,  # 0 - только ротация по дням
+    "max_total_bytes": 200 * 1024 * 1024,  # все файлы лога (0 - без ограничения)
+    "compress": True,  # сжимать закрытые файлы gzip в фоновом потоке
+    "compress_level": 6,
+}
+logger.configure(LOG_SETTINGS)
+
+# Настройки отрисовки интерфейса
+RENDER_SETTINGS = {
+    "max_hz": 10,  # максимальная частота отправки изменений клиенту
+    "stats_interval": 60,  # секунды между записями статистики отрисовки в лог
+}
+
+# Настройки консоли логов в интерфейсе
+LOG_CONSOLE_SETTINGS = {
+    "retention": 2000,  # строк в кольцевом буфере консоли
+    "height": 250,  # высота списка строк, пиксели
+    "row_height": 18,  # высота строки, пиксели
+    "overscan": 5,  # строки, создаваемые сверх видимого окна с каждой стороны
+}
+
+# Настройки просмотра истории из базы данных
+HISTORY_SETTINGS = {
+    "page_size": 100,  # записей в одной странице
+    "prefetch_pixels": 600,  # остаток прокрутки, при котором грузится страница
+}
+
+# Настройки базы данных SQLite
+DATABASE_SETTINGS = {
+    "path": None,  # файл базы данных (None - database/system_monitor.db)
+    "journal_mode": "WAL",  # чтение не блокирует запись логов
+    "synchronous": "NORMAL",  # в режиме WAL не теряет целостность при сбое
+    "cache_size_kb": 16384,  # кэш страниц на одно соединение
+    "busy_timeout_ms": 5000,  # ожидание блокировки другим соединением
+}
+
+# Удаление старых данных из базы данных
+RETENTION_SETTINGS = {
+    "enabled": True,
+    "interval": 3600,  # секунды между проверками
+    "initial_delay": 60,  # первая проверка после запуска, секунды
+    # Логи хранятся таблицами по дням и удаляются целыми днями
+    "logs": {
+        "max_age_days": 30,  # None - без ограничения
+        "max_rows": 2000000,  # None - без ограничения
+    },
+    "terminated_processes": {
+        "max_age_days": 365,
+        "max_rows": 100000,
+    },
+    "delete_batch": 1000,  # строк в одном DELETE
+    "vacuum_pages": 256,  # страниц за один шаг incremental_vacuum
+    "vacuum_pause": 0.05,  # пауза между шагами, секунды
+}
+
+# Настройки страницы "О системе"
+SYSTEM_INFO_SETTINGS = {
+    # Предельное время ожидания каждого опроса, секунды
+    "probe_timeouts": {
+        "general": 5.0,  # ОС, процессор, видеокарта, материнская плата
+        "memory": 1.0,
+        "network": 2.0,  # может зависнуть на определении внешнего IP
+        "uptime": 1.0,
+        "disks": 3.0,  # может зависнуть на недоступной сетевой ФС
+    },
+}
+
+# Настройки экспорта метрик в формате OpenMetrics (Prometheus)
+METRICS_SETTINGS = {
+    "enabled": False,
+    "host": "127.0.0.1",  # по умолчанию доступно только локально
+    "port": 9108,
+    "top_k": 10,  # количество процессов в экспорте
+}
+
+# Настройки записи и воспроизведения сеансов мониторинга
+RECORDING_SETTINGS = {
+    "record_path": None,  # файл для записи сеанса
+    "replay_path": None,  # файл записи для воспроизведения
+    "replay_speed": 1.0,  # множитель скорости, None - максимальная скорость
+    "block_frames": 64,  # кадров в одном сжатом блоке
+    "block_seconds": 30,  # максимальный возраст блока перед сбросом на диск
+}
+
+# Настройки быстрого запуска с сохраненным состоянием мониторов
+WARM_START_SETTINGS = {
+    "enabled": True,
+    "path": None,  # файл состояния (None - cache/monitor_state.bin)
+    "save_interval": 30,  # секунды между периодическими сохранениями
+    "max_age": 3600,  # секунды: более старое состояние не показывается
+}
+
+# Настройки мониторинга нескольких хостов
+FLEET_SETTINGS = {
+    "agent_host": "127.0.0.1",  # адрес агента (по умолчанию только локально)
+    "agent_port": 9200,
+    "agents": [],  # адреса агентов 'host:port' для сводного интерфейса
+    "top_k": 50,  # размер общего топа процессов
+    "reconnect_delay": 5,  # секунды между попытками переподключения
+    "merge_delay": 0.2,  # секунды накопления обновлений перед объединением
+}
+
+# Настройки обнаружения аномалий
+ANOMALY_SETTINGS = {
+    "enabled": True,
+    "alpha": 0.05,  # коэффициент сглаживания EWMA для системных метрик
+    "process_alpha": 0.1,  # коэффициент сглаживания EWMA для процессов
+    "threshold": 4.0,  # порог по z-оценке
+    "warmup": 20,  # точек до начала обнаружения
+    "cooldown": 30,  # точек подавления повторных срабатываний
+    "process_cpu_min_delta": 20.0,  # минимальный всплеск CPU процесса, %
 }
 
 
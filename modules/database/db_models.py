@@ -6,9 +6,17 @@ from sqlalchemy import (
     Float,
     DateTime,
     Text,
+    Index,
+    event,
+    text,
+    table,
+    column,
 )
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from modules.config.settings import DATABASE_SETTINGS
+from contextlib import contextmanager
 import os
 import datetime
 
@@ -19,7 +27,11 @@ Base = declarative_base()
 # Определяем модели данных
 class Log(Base):
     """
-    Модель для хранения логов в базе данных.
+    Модель для чтения логов из базы данных.
+
+    logs - представление (VIEW), объединяющее таблицы логов по дням
+    (см. create_log_partition), поэтому модель используется только в
+    запросах на чтение, а запись идет в таблицу текущего дня.
 
     Атрибуты:
         id (int): Уникальный идентификатор записи
@@ -57,6 +69,8 @@ class TerminatedProcess(Base):
     """
 
     __tablename__ = "terminated_processes"
+    # Индекс для постраничного чтения по курсору (timestamp, id)
+    __table_args__ = (Index("ix_terminated_processes_timestamp_id", "timestamp", "id"),)
 
     id = Column(Integer, primary_key=True)
     timestamp = Column(DateTime, default=datetime.datetime.now)
@@ -71,11 +85,339 @@ class TerminatedProcess(Base):
         return f"<TerminatedProcess(id={self.id}, process_name={self.process_name}, pid={self.pid})>"
 
 
+# Логи хранятся в отдельной таблице на каждый день (logs_ГГГГММДД) со
+# своими индексами и полнотекстовым индексом FTS5 (logs_fts_ГГГГММДД).
+# Представление logs объединяет их через UNION ALL: SQLite переносит
+# условия запроса в каждую таблицу и сливает уже упорядоченные по индексу
+# результаты, поэтому чтение по курсору не зависит от числа таблиц.
+# Старые данные удаляются целой таблицей (DROP TABLE) вместо DELETE.
+LOGS_VIEW = "logs"
+_PARTITION_PREFIX = "logs_"
+_PARTITION_GLOB = _PARTITION_PREFIX + "[0-9]" * 8
+
+_PARTITION_SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS {table} (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        timestamp DATETIME,
+        level VARCHAR(10),
+        source VARCHAR(255),
+        message TEXT
+    )""",
+    # Постраничное чтение по курсору (timestamp, id)
+    "CREATE INDEX IF NOT EXISTS ix_{table}_timestamp_id ON {table} (timestamp, id)",
+    # То же с фильтром по уровню (вкладка логов в истории)
+    """CREATE INDEX IF NOT EXISTS ix_{table}_level_timestamp_id
+        ON {table} (level, timestamp, id)""",
+]
+
+_PARTITION_FTS_SCHEMA = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5(
+        message, source, content='{table}', content_rowid='id'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS {fts}_insert AFTER INSERT ON {table} BEGIN
+        INSERT INTO {fts}(rowid, message, source)
+        VALUES (new.id, new.message, new.source);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS {fts}_delete AFTER DELETE ON {table} BEGIN
+        INSERT INTO {fts}({fts}, rowid, message, source)
+        VALUES ('delete', old.id, old.message, old.source);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS {fts}_update AFTER UPDATE ON {table} BEGIN
+        INSERT INTO {fts}({fts}, rowid, message, source)
+        VALUES ('delete', old.id, old.message, old.source);
+        INSERT INTO {fts}(rowid, message, source)
+        VALUES (new.id, new.message, new.source);
+    END""",
+]
+
+# Объекты единой таблицы logs из прежних версий
+_LEGACY_LOGS_OBJECTS = [
+    "DROP TRIGGER IF EXISTS logs_fts_insert",
+    "DROP TRIGGER IF EXISTS logs_fts_delete",
+    "DROP TRIGGER IF EXISTS logs_fts_update",
+    "DROP TABLE IF EXISTS logs_fts",
+    "DROP INDEX IF EXISTS ix_logs_timestamp_id",
+    "DROP INDEX IF EXISTS ix_logs_level_timestamp_id",
+]
+
+
+def log_partition_name(day):
+    """Имя таблицы логов за день day (date)"""
+    return f"{_PARTITION_PREFIX}{day:%Y%m%d}"
+
+
+def log_partition_day(name):
+    """День (date), за который таблица name хранит логи"""
+    return datetime.datetime.strptime(name[len(_PARTITION_PREFIX) :], "%Y%m%d").date()
+
+
+def log_fts_name(partition):
+    """Имя полнотекстового индекса таблицы логов partition"""
+    return f"logs_fts_{partition[len(_PARTITION_PREFIX):]}"
+
+
+def log_partition_table(name):
+    """Описание таблицы логов name для вставки через SQLAlchemy Core"""
+    return table(
+        name,
+        column("id", Integer),
+        column("timestamp", DateTime),
+        column("level", String),
+        column("source", String),
+        column("message", Text),
+    )
+
+
+def fts5_available(engine):
+    """
+    Проверяет, собран ли SQLite с FTS5.
+
+    Возвращает:
+        bool: True, если FTS5 доступен, иначе False (поиск через LIKE)
+    """
+    try:
+        with engine.begin() as connection:
+            connection.execute(
+                text("CREATE VIRTUAL TABLE IF NOT EXISTS temp.fts5_probe USING fts5(x)")
+            )
+            connection.execute(text("DROP TABLE temp.fts5_probe"))
+        return True
+    except OperationalError as e:
+        # SQLite собран без FTS5
+        print(f"Полнотекстовый поиск по логам недоступен: {str(e)}")
+        return False
+
+
+@contextmanager
+def _schema_transaction(engine):
+    """
+    Выполняет изменения схемы в одной транзакции BEGIN IMMEDIATE, чтобы
+    другие соединения не увидели представление logs пересоздаваемым.
+    """
+    raw = engine.raw_connection()
+    try:
+        dbapi_connection = raw.driver_connection
+        isolation_level = dbapi_connection.isolation_level
+        # Управляем транзакцией сами: модуль sqlite3 фиксирует DDL сразу
+        dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        try:
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                yield cursor
+                cursor.execute("COMMIT")
+            except BaseException:
+                cursor.execute("ROLLBACK")
+                raise
+        finally:
+            cursor.close()
+            dbapi_connection.isolation_level = isolation_level
+    finally:
+        raw.close()
+
+
+def _list_partitions(cursor):
+    cursor.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'table' AND name GLOB ? "
+        "ORDER BY name",
+        (_PARTITION_GLOB,),
+    )
+    return [row[0] for row in cursor.fetchall()]
+
+
+def _create_partition_objects(cursor, name, fts):
+    for statement in _PARTITION_SCHEMA:
+        cursor.execute(statement.format(table=name))
+    if fts:
+        for statement in _PARTITION_FTS_SCHEMA:
+            cursor.execute(statement.format(table=name, fts=log_fts_name(name)))
+
+
+def _rebuild_logs_view(cursor, partitions):
+    cursor.execute(f"DROP VIEW IF EXISTS {LOGS_VIEW}")
+    cursor.execute(
+        f"CREATE VIEW {LOGS_VIEW} AS "
+        + " UNION ALL ".join(
+            f"SELECT id, timestamp, level, source, message FROM {name}"
+            for name in partitions
+        )
+    )
+
+
+def list_log_partitions(engine):
+    """Имена таблиц логов по дням, от старых к новым"""
+    with engine.connect() as connection:
+        return list(
+            connection.execute(
+                text(
+                    "SELECT name FROM sqlite_master WHERE type = 'table' "
+                    "AND name GLOB :pattern ORDER BY name"
+                ),
+                {"pattern": _PARTITION_GLOB},
+            ).scalars()
+        )
+
+
+def create_log_partition(engine, day, fts):
+    """
+    Создает таблицу логов за день day и добавляет ее в представление logs.
+
+    Идентификаторы записей продолжают последовательность предыдущих
+    таблиц (AUTOINCREMENT с начальным значением в sqlite_sequence), поэтому
+    они уникальны во всем представлении.
+
+    Возвращает:
+        str: Имя таблицы
+    """
+    name = log_partition_name(day)
+    with _schema_transaction(engine) as cursor:
+        partitions = _list_partitions(cursor)
+        if name in partitions:
+            return name
+        # Записи из таблиц не удаляются, поэтому max(id) - последний
+        # выданный идентификатор
+        last_id = 0
+        for partition in partitions:
+            cursor.execute(f"SELECT max(id) FROM {partition}")
+            last_id = max(last_id, cursor.fetchone()[0] or 0)
+
+        _create_partition_objects(cursor, name, fts)
+        cursor.execute(
+            "INSERT INTO sqlite_sequence (name, seq) VALUES (?, ?)", (name, last_id)
+        )
+        _rebuild_logs_view(cursor, sorted(partitions + [name]))
+    return name
+
+
+def drop_log_partition(engine, name):
+    """
+    Удаляет таблицу логов name вместе с ее индексами, полнотекстовым
+    индексом и триггерами. Освободившиеся страницы возвращаются системе
+    постепенно (incremental_vacuum).
+
+    Возвращает:
+        bool: True, если таблица удалена
+    """
+    with _schema_transaction(engine) as cursor:
+        partitions = _list_partitions(cursor)
+        if name not in partitions or len(partitions) == 1:
+            # Представление logs не может быть пустым
+            return False
+        partitions.remove(name)
+        _rebuild_logs_view(cursor, partitions)
+        cursor.execute(f"DROP TABLE {name}")
+        cursor.execute(f"DROP TABLE IF EXISTS {log_fts_name(name)}")
+        cursor.execute("DELETE FROM sqlite_sequence WHERE name = ?", (name,))
+    return True
+
+
+def init_log_partitions(engine, fts):
+    """
+    Подготавливает хранение логов по дням: переносит единую таблицу logs
+    прежних версий в таблицу за день ее последней записи и создает
+    таблицу текущего дня.
+
+    Возвращает:
+        str: Имя таблицы, в которую пишутся новые логи
+    """
+    with _schema_transaction(engine) as cursor:
+        cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+            (LOGS_VIEW,),
+        )
+        if cursor.fetchone():
+            cursor.execute(f"SELECT max(timestamp) FROM {LOGS_VIEW}")
+            latest = cursor.fetchone()[0]
+            day = (
+                datetime.date.fromisoformat(latest[:10])
+                if latest
+                else datetime.date.today()
+            )
+            name = log_partition_name(day)
+            print(f"Перенос логов в таблицу {name}")
+            for statement in _LEGACY_LOGS_OBJECTS:
+                cursor.execute(statement)
+            cursor.execute(f"ALTER TABLE {LOGS_VIEW} RENAME TO {name}")
+            _create_partition_objects(cursor, name, fts)
+            if fts:
+                fts_name = log_fts_name(name)
+                cursor.execute(f"INSERT INTO {fts_name}({fts_name}) VALUES ('rebuild')")
+            _rebuild_logs_view(cursor, _list_partitions(cursor))
+
+    # Новые логи пишутся в таблицу текущего дня (или более позднего, если
+    # часы были переведены назад)
+    partitions = list_log_partitions(engine)
+    today = log_partition_name(datetime.date.today())
+    if partitions and partitions[-1] >= today:
+        return partitions[-1]
+    return create_log_partition(engine, datetime.date.today(), fts)
+
+
+def _apply_pragmas(dbapi_connection, connection_record):
+    """Настраивает каждое новое соединение SQLite под частую запись логов"""
+    cursor = dbapi_connection.cursor()
+    try:
+        # В новой базе действует только до записи первой страницы, поэтому
+        # выполняется раньше перехода в WAL (см. _enable_incremental_vacuum)
+        cursor.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        cursor.execute(f"PRAGMA journal_mode={DATABASE_SETTINGS['journal_mode']}")
+        cursor.execute(f"PRAGMA synchronous={DATABASE_SETTINGS['synchronous']}")
+        # Отрицательное значение - размер в килобайтах
+        cursor.execute(f"PRAGMA cache_size=-{int(DATABASE_SETTINGS['cache_size_kb'])}")
+        cursor.execute(
+            f"PRAGMA busy_timeout={int(DATABASE_SETTINGS['busy_timeout_ms'])}"
+        )
+        cursor.execute("PRAGMA temp_store=MEMORY")
+    finally:
+        cursor.close()
+
+
+def _enable_incremental_vacuum(engine):
+    """
+    Включает auto_vacuum=INCREMENTAL. В новой базе режим действует сразу,
+    существующую базу нужно один раз перестроить полным VACUUM.
+    """
+    with engine.connect() as connection:
+        if connection.exec_driver_sql("PRAGMA auto_vacuum").scalar() == 2:
+            return
+        connection.exec_driver_sql("PRAGMA auto_vacuum=INCREMENTAL")
+        has_tables = connection.exec_driver_sql(
+            "SELECT 1 FROM sqlite_master LIMIT 1"
+        ).first()
+        if has_tables:
+            print("Перестроение базы данных для incremental_vacuum")
+            connection.exec_driver_sql("VACUUM")
+        connection.commit()
+
+
+def create_db_engine(db_path):
+    """
+    Создает движок SQLAlchemy для файла базы данных SQLite.
+
+    Соединения берутся из обычного пула QueuePool и возвращаются в него
+    после запроса, поэтому число потоков, работающих с базой (интерфейс,
+    фоновая запись логов, очистка), не ограничено. Соединение может
+    перейти к другому потоку, отсюда check_same_thread=False. Настройки
+    соединения (журнал WAL, synchronous, кэш страниц) применяются один
+    раз при его открытии.
+    """
+    engine = create_engine(
+        f"sqlite:///{db_path}",
+        connect_args={"check_same_thread": False},
+    )
+    event.listen(engine, "connect", _apply_pragmas)
+    return engine
+
+
 # Функция для инициализации базы данных
-def init_db():
+def init_db(db_path=None):
     """
     Инициализирует базу данных и создает необходимые таблицы.
 
+    Аргументы:
+        db_path (str, optional): Файл базы данных (по умолчанию из
+            DATABASE_SETTINGS или database/system_monitor.db)
+
     Возвращает:
         tuple: (engine, Session) - объект движка SQLAlchemy и класс сессии
 
@@ -84,20 +426,31 @@ def init_db():
         2. Создает все таблицы, определенные в моделях
         3. Создает и возвращает фабрику сессий
     """
-    # Создаем директорию для базы данных, если её нет
-    db_dir = os.path.join(
-        os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "database"
-    )
-    os.makedirs(db_dir, exist_ok=True)
-
     # Путь к файлу базы данных
-    db_path = os.path.join(db_dir, "system_monitor.db")
+    db_path = db_path or DATABASE_SETTINGS["path"]
+    if db_path is None:
+        db_path = os.path.join(
+            os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
+            "database",
+            "system_monitor.db",
+        )
+    # Создаем директорию для базы данных, если её нет
+    os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
 
     # Создаем движок SQLAlchemy
-    engine = create_engine(f"sqlite:///{db_path}")
+    engine = create_db_engine(db_path)
+
+    # Освобожденные страницы возвращаются системе постепенно
+    # (PRAGMA incremental_vacuum), а не только полным VACUUM
+    _enable_incremental_vacuum(engine)
 
-    # Создаем таблицы
-    Base.metadata.create_all(engine)
+    # Создаем таблицы (logs - представление, см. init_log_partitions)
+    tables = [t for t in Base.metadata.sorted_tables if t.name != LOGS_VIEW]
+    Base.metadata.create_all(engine, tables=tables)
+    # create_all не добавляет новые индексы к уже существующим таблицам
+    for model_table in tables:
+        for index in model_table.indexes:
+            index.create(engine, checkfirst=True)
 
     # Создаем фабрику сессий
     Session = sessionmaker(bind=engine)
@@ -1,16 +1,69 @@
-from modules.database.db_models import init_db, Log, TerminatedProcess
+from modules.database.db_models import (
+    init_db,
+    fts5_available,
+    init_log_partitions,
+    list_log_partitions,
+    create_log_partition,
+    drop_log_partition,
+    log_partition_name,
+    log_partition_table,
+    log_fts_name,
+    Log,
+    TerminatedProcess,
+)
+from modules.config.settings import RETENTION_SETTINGS
+from sqlalchemy import select, insert, tuple_, text
+from collections import namedtuple
 import datetime
-import os
-import sys
+import re
+import threading
 
-# Добавляем путь к корневой директории проекта в sys.path
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
-
-# Инициализация базы данных
-engine, Session = init_db()
-
-# Глобальный экземпляр сервиса
+# Глобальный экземпляр сервиса (база данных открывается при его создании)
 _db_service_instance = None
+_db_service_lock = threading.Lock()
+
+# Маркеры совпадений во фрагментах результатов поиска
+HIGHLIGHT_START = "\x02"
+HIGHLIGHT_END = "\x03"
+# Строка результата поиска по логам
+LogSearchResult = namedtuple(
+    "LogSearchResult", ["id", "timestamp", "level", "source", "message", "snippet"]
+)
+# Длина фрагмента сообщения в результатах поиска, символов
+_SNIPPET_CHARS = 120
+# Сколько самых новых совпадений ранжируется по релевантности
+_SEARCH_WINDOW = 2000
+
+
+def _fts_query(search_text):
+    """
+    Превращает ввод пользователя в запрос FTS5: каждое слово ищется как
+    литерал (спецсимволы синтаксиса FTS5 не действуют), все слова должны
+    встретиться в записи.
+    """
+    terms = ['"' + term.replace('"', '""') + '"' for term in search_text.split()]
+    return " ".join(terms) or None
+
+
+def _make_snippet(message, terms, whole_words):
+    """
+    Фрагмент сообщения вокруг первого совпадения, в котором совпадения
+    окружены маркерами HIGHLIGHT_START и HIGHLIGHT_END.
+    """
+    pattern = "|".join(re.escape(term) for term in terms)
+    if whole_words:
+        pattern = rf"(?<!\w)(?:{pattern})(?!\w)"
+    regex = re.compile(pattern, re.IGNORECASE)
+
+    first = regex.search(message)
+    start = max(0, first.start() - _SNIPPET_CHARS // 4) if first else 0
+    fragment = message[start : start + _SNIPPET_CHARS]
+    fragment = regex.sub(
+        lambda match: HIGHLIGHT_START + match.group(0) + HIGHLIGHT_END, fragment
+    )
+    prefix = "…" if start > 0 else ""
+    suffix = "…" if start + _SNIPPET_CHARS < len(message) else ""
+    return prefix + fragment + suffix
 
 
 class DatabaseService:
@@ -22,34 +75,108 @@ class DatabaseService:
             cls._instance = DatabaseService()
         return cls._instance
 
-    def __init__(self):
+    def __init__(self, db_path=None):
         if DatabaseService._instance is not None:
             raise Exception("DatabaseService - это Singleton класс!")
 
         print("Инициализация сервиса базы данных")
-        self.engine = engine
-        self.Session = Session
+        self.engine, self.Session = init_db(db_path)
+        # Полнотекстовый поиск по логам (без FTS5 - поиск через LIKE)
+        self.fts_enabled = fts5_available(self.engine)
+        # Таблица логов по дням, в которую пишутся новые записи
+        self.partition_lock = threading.Lock()
+        self.current_partition = init_log_partitions(self.engine, self.fts_enabled)
+
+        # Удаление старых данных в фоновом потоке
+        self.retention = None
+        if RETENTION_SETTINGS["enabled"]:
+            # Импортируем здесь, чтобы избежать циклических импортов
+            from modules.database.retention import RetentionWorker
+
+            self.retention = RetentionWorker(self)
+            self.retention.start()
+
+    def get_write_partition(self):
+        """
+        Таблица логов, в которую пишутся новые записи: таблица текущего
+        дня, создаваемая при первой записи за день. Пишется только самая
+        новая таблица, поэтому идентификаторы записей растут во всем
+        представлении logs.
+        """
+        name = log_partition_name(datetime.date.today())
+        if name > self.current_partition:
+            with self.partition_lock:
+                if name > self.current_partition:
+                    self.current_partition = create_log_partition(
+                        self.engine, datetime.date.today(), self.fts_enabled
+                    )
+        return self.current_partition
+
+    def get_log_partitions(self):
+        """Таблицы логов по дням, от старых к новым"""
+        return list_log_partitions(self.engine)
+
+    def drop_log_partition(self, name):
+        """
+        Удаляет таблицу логов за день (таблица, в которую идет запись,
+        не удаляется).
+
+        Возвращает:
+            bool: True, если таблица удалена
+        """
+        with self.partition_lock:
+            if name >= self.current_partition:
+                return False
+            return drop_log_partition(self.engine, name)
 
     def add_log(self, level, source, message):
         """Добавляет запись лога в базу данных"""
         try:
-            session = self.Session()
-            log = Log(
-                timestamp=datetime.datetime.now(),
-                level=level,
-                source=source,
-                message=message,
-            )
-            session.add(log)
-            session.commit()
-            print(f"Лог добавлен в базу данных: {level} - {source}")
-            return log.id
+            partition = log_partition_table(self.get_write_partition())
+            with self.engine.begin() as connection:
+                result = connection.execute(
+                    insert(partition).values(
+                        timestamp=datetime.datetime.now(),
+                        level=level,
+                        source=source,
+                        message=message,
+                    )
+                )
+            return result.inserted_primary_key[0]
         except Exception as e:
             print(f"Ошибка при добавлении лога в базу данных: {str(e)}")
-            session.rollback()
             return None
-        finally:
-            session.close()
+
+    def add_logs(self, records):
+        """
+        Добавляет пачку записей лога одной вставкой (executemany) и одним
+        commit (вызывается фоновой записью логов).
+
+        Аргументы:
+            records (list): Кортежи (timestamp, level, source, message)
+
+        Возвращает:
+            int: Количество добавленных записей
+        """
+        if not records:
+            return 0
+        rows = [
+            {
+                "timestamp": timestamp,
+                "level": level,
+                "source": source,
+                "message": message,
+            }
+            for timestamp, level, source, message in records
+        ]
+        try:
+            partition = log_partition_table(self.get_write_partition())
+            with self.engine.begin() as connection:
+                connection.execute(insert(partition), rows)
+            return len(rows)
+        except Exception as e:
+            print(f"Ошибка при добавлении логов в базу данных: {str(e)}")
+            return 0
 
     def add_terminated_process(self, process_data, terminated_by="user"):
         """
@@ -69,10 +196,7 @@ class DatabaseService:
             3. Создает запись в таблице terminated_processes
             4. Сохраняет запись в базе данных
         """
-        session = None
         try:
-            session = self.Session()
-
             # Распаковываем данные процесса
             name, pid, memory, cpu, status = process_data
 
@@ -96,87 +220,239 @@ class DatabaseService:
                 cpu_float = 0.0
 
             # Создаем новую запись
-            terminated_process = TerminatedProcess(
-                timestamp=datetime.datetime.now(),
-                process_name=str(name),
-                pid=str(pid),
-                memory_usage=memory_float,
-                cpu_usage=cpu_float,
-                status=str(status),
-                terminated_by=str(terminated_by),
-            )
-
-            session.add(terminated_process)
-            session.commit()
+            with self.engine.begin() as connection:
+                result = connection.execute(
+                    insert(TerminatedProcess).values(
+                        timestamp=datetime.datetime.now(),
+                        process_name=str(name),
+                        pid=str(pid),
+                        memory_usage=memory_float,
+                        cpu_usage=cpu_float,
+                        status=str(status),
+                        terminated_by=str(terminated_by),
+                    )
+                )
             print(
                 f"Информация о завершенном процессе добавлена в базу данных: {name} (PID: {pid})"
             )
-            return terminated_process.id
+            return result.inserted_primary_key[0]
         except Exception as e:
             import traceback
 
             print(f"Ошибка при добавлении информации о завершенном процессе: {str(e)}")
             print(traceback.format_exc())
-            if session:
-                session.rollback()
             return None
-        finally:
-            if session:
-                session.close()
 
-    def get_logs(self, limit=100, level=None, start_date=None, end_date=None):
-        """Получает логи из базы данных с возможностью фильтрации"""
+    def get_logs(
+        self, limit=100, level=None, start_date=None, end_date=None, before=None
+    ):
+        """
+        Получает логи из базы данных с возможностью фильтрации.
+
+        Логи читаются страницами от новых к старым. Следующая страница
+        запрашивается по курсору - (timestamp, id) последней полученной
+        записи, - поэтому ее чтение не зависит от размера таблицы.
+
+        Аргументы:
+            limit (int, optional): Размер страницы
+            level (str, optional): Уровень логов
+            start_date (datetime, optional): Начало периода
+            end_date (datetime, optional): Конец периода
+            before (tuple, optional): Курсор (timestamp, id): вернуть записи
+                старше него
+
+        Возвращает:
+            list: Строки (id, timestamp, level, source, message)
+        """
+        session = None
         try:
             session = self.Session()
-            query = session.query(Log)
+            query = select(Log.id, Log.timestamp, Log.level, Log.source, Log.message)
 
             # Применяем фильтры, если они указаны
             if level:
-                query = query.filter(Log.level == level)
+                query = query.where(Log.level == level)
 
             if start_date:
-                query = query.filter(Log.timestamp >= start_date)
+                query = query.where(Log.timestamp >= start_date)
 
             if end_date:
-                query = query.filter(Log.timestamp <= end_date)
+                query = query.where(Log.timestamp <= end_date)
+
+            if before:
+                query = query.where(tuple_(Log.timestamp, Log.id) < tuple(before))
 
             # Сортируем по времени (сначала новые)
-            query = query.order_by(Log.timestamp.desc())
+            query = query.order_by(Log.timestamp.desc(), Log.id.desc())
 
             # Ограничиваем количество результатов
             if limit:
                 query = query.limit(limit)
 
-            logs = query.all()
+            logs = session.execute(query).all()
             print(f"Получено {len(logs)} логов из базы данных")
             return logs
         except Exception as e:
             print(f"Ошибка при получении логов из базы данных: {str(e)}")
             return []
         finally:
-            session.close()
+            if session:
+                session.close()
+
+    def search_logs(
+        self, search_text, limit=100, level=None, offset=0, window=_SEARCH_WINDOW
+    ):
+        """
+        Полнотекстовый поиск по сообщениям и источникам логов.
+
+        Ищутся записи, содержащие все слова запроса. Самые новые window
+        совпадений упорядочиваются по релевантности (BM25): ранжирование
+        всех совпадений частого слова в миллионах записей заняло бы секунды.
+        Полнотекстовые индексы таблиц логов по дням просматриваются от
+        новых к старым, пока не наберется window совпадений; BM25 каждой
+        записи считается по статистике индекса ее дня.
+        Каждая строка содержит фрагмент сообщения, в котором совпадения
+        окружены маркерами HIGHLIGHT_START и HIGHLIGHT_END. Если SQLite
+        собран без FTS5, выполняется поиск подстрок через LIKE (полный
+        просмотр таблицы, от новых записей к старым).
+
+        Аргументы:
+            search_text (str): Слова для поиска
+            limit (int, optional): Размер страницы
+            level (str, optional): Уровень логов
+            offset (int, optional): Сколько результатов пропустить
+            window (int, optional): Сколько последних совпадений ранжировать
+
+        Возвращает:
+            list: LogSearchResult (id, timestamp, level, source, message, snippet)
+        """
+        terms = search_text.split()
+        if not terms:
+            return []
+
+        session = None
+        try:
+            session = self.Session()
+            if self.fts_enabled:
+                rows = self._search_partitions(
+                    session, _fts_query(search_text), level, window
+                )[offset : offset + limit]
+            else:
+                query = select(
+                    Log.id, Log.timestamp, Log.level, Log.source, Log.message
+                )
+                for term in terms:
+                    query = query.where(Log.message.ilike(f"%{term}%"))
+                if level:
+                    query = query.where(Log.level == level)
+                query = (
+                    query.order_by(Log.timestamp.desc(), Log.id.desc())
+                    .limit(limit)
+                    .offset(offset)
+                )
+                rows = session.execute(query).all()
+
+            logs = [
+                LogSearchResult(
+                    *row, _make_snippet(row.message or "", terms, self.fts_enabled)
+                )
+                for row in rows
+            ]
+            print(f"Найдено {len(logs)} логов по запросу '{search_text}'")
+            return logs
+        except Exception as e:
+            print(f"Ошибка при поиске логов: {str(e)}")
+            return []
+        finally:
+            if session:
+                session.close()
+
+    def _search_partitions(self, session, match, level, window):
+        """
+        Самые новые window совпадений по полнотекстовым индексам таблиц
+        логов (от новых таблиц к старым), упорядоченные по релевантности.
+        """
+        hits = []
+        remaining = window
+        for partition in reversed(self.get_log_partitions()):
+            if remaining <= 0:
+                break
+            fts = log_fts_name(partition)
+            ranks = dict(
+                session.execute(
+                    text(
+                        f"SELECT rowid, rank FROM {fts} WHERE {fts} MATCH :match "
+                        "ORDER BY rowid DESC LIMIT :window"
+                    ),
+                    {"match": match, "window": remaining},
+                ).all()
+            )
+            remaining -= len(ranks)
+            if ranks:
+                logs = log_partition_table(partition)
+                query = select(
+                    logs.c.id,
+                    logs.c.timestamp,
+                    logs.c.level,
+                    logs.c.source,
+                    logs.c.message,
+                ).where(logs.c.id.in_(list(ranks)))
+                if level:
+                    query = query.where(logs.c.level == level)
+                hits.extend((ranks[row.id], row) for row in session.execute(query))
+        hits.sort(key=lambda hit: (hit[0], -hit[1].id))
+        return [row for _, row in hits]
+
+    def get_terminated_processes(
+        self, limit=100, start_date=None, end_date=None, before=None
+    ):
+        """
+        Получает информацию о завершенных процессах из базы данных.
 
-    def get_terminated_processes(self, limit=100, start_date=None, end_date=None):
-        """Получает информацию о завершенных процессах из базы данных"""
+        Записи читаются страницами от новых к старым по курсору
+        (timestamp, id), как в get_logs.
+
+        Возвращает:
+            list: Строки (id, timestamp, process_name, pid, memory_usage,
+                cpu_usage, status, terminated_by)
+        """
+        session = None
         try:
             session = self.Session()
-            query = session.query(TerminatedProcess)
+            query = select(
+                TerminatedProcess.id,
+                TerminatedProcess.timestamp,
+                TerminatedProcess.process_name,
+                TerminatedProcess.pid,
+                TerminatedProcess.memory_usage,
+                TerminatedProcess.cpu_usage,
+                TerminatedProcess.status,
+                TerminatedProcess.terminated_by,
+            )
 
             # Применяем фильтры, если они указаны
             if start_date:
-                query = query.filter(TerminatedProcess.timestamp >= start_date)
+                query = query.where(TerminatedProcess.timestamp >= start_date)
 
             if end_date:
-                query = query.filter(TerminatedProcess.timestamp <= end_date)
+                query = query.where(TerminatedProcess.timestamp <= end_date)
+
+            if before:
+                query = query.where(
+                    tuple_(TerminatedProcess.timestamp, TerminatedProcess.id)
+                    < tuple(before)
+                )
 
             # Сортируем по времени (сначала новые)
-            query = query.order_by(TerminatedProcess.timestamp.desc())
+            query = query.order_by(
+                TerminatedProcess.timestamp.desc(), TerminatedProcess.id.desc()
+            )
 
             # Ограничиваем количество результатов
             if limit:
                 query = query.limit(limit)
 
-            processes = query.all()
+            processes = session.execute(query).all()
             print(
                 f"Получено {len(processes)} записей о завершенных процессах из базы данных"
             )
@@ -185,12 +461,15 @@ class DatabaseService:
             print(f"Ошибка при получении информации о завершенных процессах: {str(e)}")
             return []
         finally:
-            session.close()
+            if session:
+                session.close()
 
 
 # Функция для получения экземпляра сервиса базы данных
 def get_db_service():
     global _db_service_instance
-    if _db_service_instance is None:
-        _db_service_instance = DatabaseService.get_instance()
+    # Сервис может впервые запрашиваться одновременно из нескольких потоков
+    with _db_service_lock:
+        if _db_service_instance is None:
+            _db_service_instance = DatabaseService.get_instance()
     return _db_service_instance
@@ -0,0 +1,208 @@
+import datetime
+import threading
+import time
+from sqlalchemy import delete, func, select, text
+from modules.database.db_models import TerminatedProcess, log_partition_day
+from modules.config.settings import RETENTION_SETTINGS
+
+
+class RetentionWorker:
+    """
+    Удаление старых данных из базы данных в фоновом потоке.
+
+    Логи хранятся таблицами по дням, поэтому устаревшие логи удаляются
+    целой таблицей (DROP TABLE): это не зависит от количества записей и не
+    раздувает журнал. Если логов больше max_rows, удаляются самые старые
+    дни; таблица текущего дня не удаляется никогда. Завершенные процессы
+    удаляются небольшими пачками DELETE. Освободившиеся страницы
+    возвращаются системе шагами incremental_vacuum с паузами, чтобы не
+    задерживать запись логов.
+
+    Аргументы:
+        db_service (DatabaseService): Сервис базы данных
+    """
+
+    def __init__(self, db_service):
+        self.db_service = db_service
+        self.engine = db_service.engine
+        self.interval = RETENTION_SETTINGS["interval"]
+        self.initial_delay = RETENTION_SETTINGS["initial_delay"]
+        self.stop_event = threading.Event()
+        self.thread = None
+        # Количество записей в таблицах прошлых дней (они не меняются)
+        self.partition_rows = {}
+
+    def start(self):
+        """Запускает периодическую проверку в фоновом потоке"""
+        if self.thread:
+            return
+        self.stop_event.clear()
+        self.thread = threading.Thread(
+            target=self._run, name="db-retention", daemon=True
+        )
+        self.thread.start()
+
+    def stop(self):
+        """Останавливает фоновую проверку"""
+        self.stop_event.set()
+        if self.thread:
+            self.thread.join(timeout=1)
+            self.thread = None
+
+    def _run(self):
+        delay = self.initial_delay
+        while not self.stop_event.wait(delay):
+            delay = self.interval
+            try:
+                self.run_once()
+            except Exception as e:
+                print(f"Ошибка при удалении старых данных: {str(e)}")
+
+    def run_once(self, today=None):
+        """
+        Удаляет устаревшие данные и возвращает освободившиеся страницы.
+
+        Аргументы:
+            today (date, optional): Текущий день (для проверки)
+
+        Возвращает:
+            dict: Удалено таблиц логов, строк завершенных процессов и
+                освобождено страниц
+        """
+        today = today or datetime.date.today()
+        stats = {
+            "log_partitions": self.prune_logs(today),
+            "terminated_processes": self.prune_terminated_processes(today),
+        }
+        stats["pages"] = self.vacuum()
+        print(
+            f"Очистка базы данных: удалено дней логов {stats['log_partitions']}, "
+            f"завершенных процессов {stats['terminated_processes']}, "
+            f"освобождено страниц {stats['pages']}"
+        )
+        return stats
+
+    def prune_logs(self, today):
+        """Удаляет таблицы логов старше max_age_days и сверх max_rows"""
+        limits = RETENTION_SETTINGS["logs"]
+        partitions = self.db_service.get_log_partitions()
+        # Таблица, в которую идет запись, не удаляется
+        candidates = partitions[:-1]
+        dropped = []
+
+        if limits["max_age_days"] is not None:
+            cutoff = today - datetime.timedelta(days=limits["max_age_days"])
+            dropped = [name for name in candidates if log_partition_day(name) < cutoff]
+
+        if limits["max_rows"] is not None:
+            kept = [name for name in partitions if name not in dropped]
+            total = sum(self._count_rows(name) for name in kept)
+            for name in kept[:-1]:
+                if total <= limits["max_rows"]:
+                    break
+                total -= self._count_rows(name)
+                dropped.append(name)
+
+        count = 0
+        for name in dropped:
+            if self.stop_event.is_set():
+                break
+            if self.db_service.drop_log_partition(name):
+                self.partition_rows.pop(name, None)
+                count += 1
+        return count
+
+    def _count_rows(self, name):
+        rows = self.partition_rows.get(name)
+        if rows is None:
+            with self.engine.connect() as connection:
+                rows = connection.execute(text(f"SELECT count(*) FROM {name}")).scalar()
+            if name != self.db_service.current_partition:
+                self.partition_rows[name] = rows
+        return rows
+
+    def prune_terminated_processes(self, today):
+        """Удаляет завершенные процессы старше max_age_days и сверх max_rows"""
+        limits = RETENTION_SETTINGS["terminated_processes"]
+        deleted = 0
+
+        if limits["max_age_days"] is not None:
+            cutoff = datetime.datetime.combine(
+                today - datetime.timedelta(days=limits["max_age_days"]),
+                datetime.time(),
+            )
+            deleted += self._delete_oldest(TerminatedProcess.timestamp < cutoff)
+
+        if limits["max_rows"] is not None:
+            with self.engine.connect() as connection:
+                total = connection.execute(
+                    select(func.count()).select_from(TerminatedProcess)
+                ).scalar()
+            if total > limits["max_rows"]:
+                deleted += self._delete_oldest(limit=total - limits["max_rows"])
+        return deleted
+
+    def _delete_oldest(self, condition=None, limit=None):
+        """
+        Удаляет самые старые завершенные процессы (подходящие под condition,
+        не больше limit) пачками, каждую в своей короткой транзакции.
+        """
+        batch = RETENTION_SETTINGS["delete_batch"]
+        deleted = 0
+        while not self.stop_event.is_set():
+            size = batch if limit is None else min(batch, limit - deleted)
+            if size <= 0:
+                break
+            ids = (
+                select(TerminatedProcess.id)
+                .order_by(TerminatedProcess.timestamp, TerminatedProcess.id)
+                .limit(size)
+            )
+            if condition is not None:
+                ids = ids.where(condition)
+            with self.engine.begin() as connection:
+                result = connection.execute(
+                    delete(TerminatedProcess).where(
+                        TerminatedProcess.id.in_(ids.scalar_subquery())
+                    )
+                )
+            if not result.rowcount:
+                break
+            deleted += result.rowcount
+        return deleted
+
+    def vacuum(self):
+        """
+        Возвращает свободные страницы системе шагами incremental_vacuum.
+
+        Возвращает:
+            int: Количество освобожденных страниц
+        """
+        pages = RETENTION_SETTINGS["vacuum_pages"]
+        pause = RETENTION_SETTINGS["vacuum_pause"]
+        freed = 0
+        raw = self.engine.raw_connection()
+        try:
+            cursor = raw.cursor()
+            try:
+                while not self.stop_event.is_set():
+                    free = cursor.execute("PRAGMA freelist_count").fetchone()[0]
+                    if not free:
+                        break
+                    # execute() модуля sqlite3 выполняет только первый шаг
+                    # прагмы (одну страницу), executescript() - до конца
+                    cursor.executescript(f"PRAGMA incremental_vacuum({pages});")
+                    left = cursor.execute("PRAGMA freelist_count").fetchone()[0]
+                    if left >= free:
+                        # База без auto_vacuum=INCREMENTAL
+                        break
+                    freed += free - left
+                    time.sleep(pause)
+                if freed:
+                    # Файл базы уменьшается при переносе журнала WAL
+                    cursor.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchall()
+            finally:
+                cursor.close()
+        finally:
+            raw.close()
+        return freed
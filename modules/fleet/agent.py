@@ -0,0 +1,193 @@
+import asyncio
+import socket
+import threading
+from modules.fleet.protocol import (
+    MSG_PERFORMANCE,
+    MSG_PROCESSES_DELTA,
+    MSG_PROCESSES_FULL,
+    pack_hello,
+    pack_message,
+)
+from modules.system.snapshot_codec import (
+    encode_performance,
+    encode_process_delta,
+    encode_process_table,
+    index_processes,
+)
+from modules.config.settings import FLEET_SETTINGS
+from modules.utils.logger import get_logger
+
+# Инициализация логгера
+logger = get_logger()
+
+
+class _Connection:
+    """Состояние одного подключенного агрегатора"""
+
+    def __init__(self, writer):
+        self.writer = writer
+        self.changed = asyncio.Event()
+        # Индекс последней отправленной таблицы (None - нужен полный снимок)
+        self.process_index = None
+        self.sent_processes = None
+        self.sent_performance = None
+
+
+class FleetAgent:
+    """
+    Агент, раздающий снимки мониторов по TCP.
+
+    После подключения агрегатор получает приветствие и полный снимок,
+    затем только разницу таблиц процессов. Если агрегатор не успевает
+    читать, промежуточные снимки пропускаются: отправляется только
+    самый свежий, поэтому память на соединение ограничена.
+    """
+
+    def __init__(self, host=None, port=None, name=None):
+        self.host = host or FLEET_SETTINGS["agent_host"]
+        self.port = port if port is not None else FLEET_SETTINGS["agent_port"]
+        self.name = name or socket.gethostname()
+        self.loop = None
+        self.server = None
+        self.thread = None
+        self.started = threading.Event()
+        self.connections = set()
+        self.processes = None
+        self.performance = None
+
+    def attach(self, process_monitor, performance_monitor):
+        """Подписывает агента на callback-и мониторов"""
+        process_monitor.register_callback(self.publish_processes)
+        performance_monitor.register_callback(self.publish_performance)
+
+    def publish_processes(self, processes):
+        """Callback для ProcessMonitor (можно вызывать из любого потока)"""
+        self._call_in_loop(self._set_processes, processes)
+
+    def publish_performance(self, performance_data):
+        """Callback для PerformanceMonitor (можно вызывать из любого потока)"""
+        self._call_in_loop(self._set_performance, encode_performance(performance_data))
+
+    def _call_in_loop(self, callback, data):
+        loop = self.loop
+        if loop is None or loop.is_closed():
+            return
+        try:
+            loop.call_soon_threadsafe(callback, data)
+        except RuntimeError:
+            # Цикл был закрыт между проверкой и вызовом
+            pass
+
+    def _set_processes(self, processes):
+        self.processes = processes
+        for connection in self.connections:
+            connection.changed.set()
+
+    def _set_performance(self, data):
+        self.performance = data
+        for connection in self.connections:
+            connection.changed.set()
+
+    def start(self):
+        """Запуск сервера в фоновом потоке с собственным циклом asyncio"""
+        if self.thread:
+            return
+
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+        self.started.wait(timeout=5)
+
+    def _run(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        try:
+            self.server = self.loop.run_until_complete(
+                asyncio.start_server(self._handle, self.host, self.port)
+            )
+            self.port = self.server.sockets[0].getsockname()[1]
+            logger.info(f"Агент '{self.name}' слушает {self.host}:{self.port}")
+        except OSError as e:
+            logger.exception(e, "Не удалось запустить агент:")
+            self.started.set()
+            return
+
+        self.started.set()
+        try:
+            self.loop.run_forever()
+        finally:
+            self.server.close()
+            for task in asyncio.all_tasks(self.loop):
+                task.cancel()
+            self.loop.run_until_complete(
+                asyncio.gather(*asyncio.all_tasks(self.loop), return_exceptions=True)
+            )
+            self.loop.close()
+
+    def stop(self):
+        """Остановка сервера"""
+        if not self.thread:
+            return
+
+        if self.loop and self.loop.is_running():
+            self.loop.call_soon_threadsafe(self._shutdown)
+        self.thread.join(timeout=2)
+        self.thread = None
+        logger.info("Агент остановлен")
+
+    def _shutdown(self):
+        self.loop.stop()
+
+    async def _handle(self, reader, writer):
+        peer = writer.get_extra_info("peername")
+        logger.info(f"Подключен агрегатор {peer}")
+        connection = _Connection(writer)
+        self.connections.add(connection)
+        connection.changed.set()
+
+        # Агрегатор ничего не присылает, чтение нужно только для обнаружения
+        # отключения
+        closed = asyncio.ensure_future(reader.read())
+        try:
+            writer.write(pack_hello(self.name))
+            while not closed.done():
+                changed = asyncio.ensure_future(connection.changed.wait())
+                await asyncio.wait(
+                    {changed, closed}, return_when=asyncio.FIRST_COMPLETED
+                )
+                if closed.done():
+                    changed.cancel()
+                    break
+                connection.changed.clear()
+                self._send_updates(connection)
+                await writer.drain()
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            self.connections.discard(connection)
+            closed.cancel()
+            writer.close()
+            logger.info(f"Агрегатор {peer} отключен")
+
+    def _send_updates(self, connection):
+        """Отправляет свежие снимки, которые еще не были отправлены"""
+        writer = connection.writer
+        performance = self.performance
+        if performance is not None and performance is not connection.sent_performance:
+            writer.write(pack_message(MSG_PERFORMANCE, performance))
+            connection.sent_performance = performance
+
+        processes = self.processes
+        if processes is not None and processes is not connection.sent_processes:
+            if connection.process_index is None:
+                writer.write(
+                    pack_message(MSG_PROCESSES_FULL, encode_process_table(processes))
+                )
+            else:
+                writer.write(
+                    pack_message(
+                        MSG_PROCESSES_DELTA,
+                        encode_process_delta(connection.process_index, processes),
+                    )
+                )
+            connection.process_index = index_processes(processes)
+            connection.sent_processes = processes
@@ -0,0 +1,237 @@
+import asyncio
+import heapq
+import threading
+from modules.fleet.protocol import (
+    MSG_HELLO,
+    MSG_PERFORMANCE,
+    MSG_PROCESSES_DELTA,
+    MSG_PROCESSES_FULL,
+    ProtocolError,
+    read_message,
+    unpack_hello,
+)
+from modules.system.monitor_facade import SourcePerformanceMonitor, SourceProcessMonitor
+from modules.system.snapshot_codec import (
+    apply_process_delta,
+    decode_performance,
+    decode_process_table,
+    index_processes,
+)
+from modules.config.settings import FLEET_SETTINGS, MONITORING_SETTINGS
+from modules.utils.logger import get_logger
+
+# Инициализация логгера
+logger = get_logger()
+
+
+def parse_address(address):
+    """Разбирает строку 'host:port' (порт по умолчанию из настроек)"""
+    host, _, port = address.rpartition(":")
+    if not host:
+        return address, FLEET_SETTINGS["agent_port"]
+    return host, int(port)
+
+
+class _HostState:
+    """Последние данные одного агента"""
+
+    def __init__(self, address):
+        self.address = address
+        self.name = address
+        self.connected = False
+        self.process_index = {}
+        self.processes = []
+        self.performance = None
+
+
+class FleetProcessMonitor(SourceProcessMonitor):
+    # В таблице процессов показывается колонка с именем хоста
+    show_host = True
+
+
+class FleetAggregator:
+    """
+    Агрегатор данных с нескольких агентов.
+
+    Подключается ко всем агентам одновременно в собственном цикле asyncio,
+    переподключается при обрыве и объединяет данные: process_monitor отдает
+    общий топ процессов по памяти с меткой хоста, performance_monitor -
+    суммарную нагрузку (средний CPU, суммарные память, диск и сеть).
+
+    Аргументы:
+        addresses (list): Адреса агентов в виде 'host:port'
+        top_k (int, optional): Размер общего топа процессов
+    """
+
+    def __init__(self, addresses, top_k=None, history_length=None):
+        self.addresses = [parse_address(address) for address in addresses]
+        self.top_k = top_k or FLEET_SETTINGS["top_k"]
+        self.hosts = {
+            f"{host}:{port}": _HostState(f"{host}:{port}")
+            for host, port in self.addresses
+        }
+        self.process_monitor = FleetProcessMonitor(self)
+        self.performance_monitor = SourcePerformanceMonitor(
+            self, history_length or MONITORING_SETTINGS["performance_history_length"]
+        )
+        self.loop = None
+        self.thread = None
+        self.tasks = []
+        self._merge_scheduled = {}
+
+    def start(self):
+        """Запуск подключений (повторные вызовы игнорируются)"""
+        if self.thread:
+            return
+
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """Остановка всех подключений"""
+        if not self.thread:
+            return
+
+        if self.loop and self.loop.is_running():
+            self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join(timeout=2)
+        self.thread = None
+
+    def _run(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        # Храним ссылки на задачи, иначе их может собрать сборщик мусора
+        self.tasks = [
+            self.loop.create_task(self._connect_loop(host, port))
+            for host, port in self.addresses
+        ]
+        try:
+            self.loop.run_forever()
+        finally:
+            for task in asyncio.all_tasks(self.loop):
+                task.cancel()
+            self.loop.run_until_complete(
+                asyncio.gather(*asyncio.all_tasks(self.loop), return_exceptions=True)
+            )
+            self.loop.close()
+
+    async def _connect_loop(self, host, port):
+        """Поддерживает соединение с одним агентом"""
+        state = self.hosts[f"{host}:{port}"]
+        while True:
+            writer = None
+            try:
+                reader, writer = await asyncio.open_connection(host, port)
+                await self._receive(state, reader)
+            except (OSError, asyncio.IncompleteReadError, ProtocolError) as e:
+                if state.connected:
+                    logger.warning(
+                        f"Соединение с агентом {state.address} потеряно: {e}"
+                    )
+            finally:
+                if writer:
+                    writer.close()
+                if state.connected:
+                    state.connected = False
+                    state.process_index = {}
+                    state.processes = []
+                    state.performance = None
+                    self._schedule_merge("processes")
+                    self._schedule_merge("performance")
+
+            await asyncio.sleep(FLEET_SETTINGS["reconnect_delay"])
+
+    async def _receive(self, state, reader):
+        kind, payload = await read_message(reader)
+        if kind != MSG_HELLO:
+            raise ProtocolError("Агент не прислал приветствие")
+        state.name = self._unique_name(state, unpack_hello(payload)["name"])
+        state.connected = True
+        logger.info(f"Подключен агент {state.name} ({state.address})")
+
+        while True:
+            kind, payload = await read_message(reader)
+            if kind == MSG_PERFORMANCE:
+                state.performance = decode_performance(payload)
+                self._schedule_merge("performance")
+            elif kind == MSG_PROCESSES_FULL:
+                state.processes = decode_process_table(payload)
+                state.process_index = index_processes(state.processes)
+                self._schedule_merge("processes")
+            elif kind == MSG_PROCESSES_DELTA:
+                state.processes, state.process_index = apply_process_delta(
+                    state.process_index, payload
+                )
+                self._schedule_merge("processes")
+
+    def _unique_name(self, state, name):
+        """Добавляет адрес к имени, если агент с таким именем уже подключен"""
+        taken = {
+            other.name
+            for other in self.hosts.values()
+            if other is not state and other.connected
+        }
+        return name if name not in taken else f"{name} ({state.address})"
+
+    def _schedule_merge(self, kind):
+        """
+        Откладывает объединение данных на короткое время, чтобы обновления
+        от многих агентов за один такт объединялись один раз.
+        """
+        if self._merge_scheduled.get(kind):
+            return
+        self._merge_scheduled[kind] = True
+        merge = (
+            self._merge_processes if kind == "processes" else self._merge_performance
+        )
+        self.loop.call_later(FLEET_SETTINGS["merge_delay"], merge)
+
+    def _merge_processes(self):
+        self._merge_scheduled["processes"] = False
+        rows = (
+            row + [state.name]
+            for state in self.hosts.values()
+            if state.connected
+            for row in state.processes
+        )
+        top = heapq.nlargest(self.top_k, rows, key=lambda row: float(row[2]))
+        self.process_monitor.publish(top)
+
+    def _merge_performance(self):
+        self._merge_scheduled["performance"] = False
+        records = [
+            state.performance
+            for state in self.hosts.values()
+            if state.connected and state.performance
+        ]
+        if not records:
+            return
+
+        memory_total = sum(record["memory_total"] for record in records)
+        memory_used = sum(record["memory_used"] for record in records)
+        breakdowns = [record["memory_breakdown"] for record in records]
+        breakdown = None
+        if all(breakdowns):
+            breakdown = {
+                key: sum(item[key] for item in breakdowns) for key in breakdowns[0]
+            }
+
+        self.performance_monitor.publish_record(
+            {
+                "cpu": sum(record["cpu"] for record in records) / len(records),
+                "memory": memory_used / memory_total * 100 if memory_total else 0,
+                "memory_total": memory_total,
+                "memory_used": memory_used,
+                "disk_io": tuple(
+                    sum(record["disk_io"][i] for record in records) for i in (0, 1)
+                ),
+                "network": tuple(
+                    sum(record["network"][i] for record in records) for i in (0, 1)
+                ),
+                "memory_breakdown": breakdown,
+                "anomalies": {
+                    chart: any(record["anomalies"][chart] for record in records)
+                    for chart in records[0]["anomalies"]
+                },
+            }
+        )
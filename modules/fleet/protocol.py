@@ -0,0 +1,58 @@
+import json
+import struct
+
+# Сообщение: длина данных (4 байта, big-endian), тип (1 байт), данные.
+# Данные снимков кодируются модулем snapshot_codec.
+HEADER = struct.Struct(">IB")
+MAX_MESSAGE_SIZE = 16 * 1024 * 1024
+
+MSG_HELLO = 1  # JSON: {"name": имя агента, "version": версия протокола}
+MSG_PERFORMANCE = 2  # encode_performance
+MSG_PROCESSES_FULL = 3  # encode_process_table
+MSG_PROCESSES_DELTA = 4  # encode_process_delta
+
+PROTOCOL_VERSION = 1
+
+
+class ProtocolError(Exception):
+    pass
+
+
+def pack_message(kind, payload):
+    """Упаковывает сообщение для отправки"""
+    return HEADER.pack(len(payload), kind) + payload
+
+
+def pack_hello(name):
+    """Упаковывает приветствие агента"""
+    payload = json.dumps({"name": name, "version": PROTOCOL_VERSION}).encode("utf-8")
+    return pack_message(MSG_HELLO, payload)
+
+
+def unpack_hello(payload):
+    """Распаковывает приветствие агента"""
+    hello = json.loads(payload.decode("utf-8"))
+    if hello.get("version") != PROTOCOL_VERSION:
+        raise ProtocolError(
+            f"Неподдерживаемая версия протокола: {hello.get('version')}"
+        )
+    return hello
+
+
+async def read_message(reader):
+    """
+    Читает одно сообщение из asyncio.StreamReader.
+
+    Возвращает:
+        tuple: (тип, данные)
+
+    Исключения:
+        asyncio.IncompleteReadError: Соединение закрыто
+        ProtocolError: Некорректная длина сообщения
+    """
+    header = await reader.readexactly(HEADER.size)
+    length, kind = HEADER.unpack(header)
+    if length > MAX_MESSAGE_SIZE:
+        raise ProtocolError(f"Слишком большое сообщение: {length} байт")
+    payload = await reader.readexactly(length)
+    return kind, payload
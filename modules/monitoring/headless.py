@@ -0,0 +1,175 @@
+import signal
+import threading
+from modules.config.settings import (
+    MONITORING_SETTINGS,
+    METRICS_SETTINGS,
+    RECORDING_SETTINGS,
+    FLEET_SETTINGS,
+    WARM_START_SETTINGS,
+)
+from modules.system.process_monitor import ProcessMonitor
+from modules.system.performance_monitor import PerformanceMonitor
+from modules.utils.logger import get_logger
+
+# Инициализация логгера
+logger = get_logger()
+
+
+def run_headless(
+    metrics=None,
+    metrics_host=None,
+    metrics_port=None,
+    record_path=None,
+    agent=False,
+    agent_host=None,
+    agent_port=None,
+    agent_name=None,
+    replay_path=None,
+    replay_speed=1.0,
+):
+    """
+    Запускает сборщики без графического интерфейса (Flet не импортируется).
+
+    Аргументы:
+        metrics (bool, optional): Включить экспорт метрик OpenMetrics
+            (по умолчанию берется из METRICS_SETTINGS)
+        metrics_host (str, optional): Адрес для экспорта метрик
+        metrics_port (int, optional): Порт для экспорта метрик
+        record_path (str, optional): Файл для записи сеанса
+            (по умолчанию берется из RECORDING_SETTINGS)
+        agent (bool, optional): Раздавать снимки агрегатору по TCP
+        agent_host (str, optional): Адрес агента (по умолчанию из FLEET_SETTINGS)
+        agent_port (int, optional): Порт агента (по умолчанию из FLEET_SETTINGS)
+        agent_name (str, optional): Имя хоста, передаваемое агрегатору
+        replay_path (str, optional): Файл записи сеанса, который
+            воспроизводится вместо живых данных
+        replay_speed (float или None, optional): Скорость воспроизведения
+            (None - без пауз)
+
+    Действия:
+        1. Запускает ProcessMonitor и PerformanceMonitor в фоновых потоках
+           (или воспроизведение записи сеанса)
+        2. При необходимости запускает HTTP-эндпоинт метрик, запись сеанса
+           и агента для сводного мониторинга
+        3. Раздает новые снимки подписчикам, пока не придет SIGINT/SIGTERM
+           или не закончится воспроизводимая запись
+        4. Останавливает мониторы и сервер метрик
+    """
+    logger.info("Запуск сборщиков в режиме без интерфейса")
+    stop_event = threading.Event()
+
+    # Сигнал о новых данных в шинах мониторов
+    data_event = threading.Event()
+
+    def handle_signal(signum, frame):
+        logger.info(f"Получен сигнал {signum}, завершение работы")
+        stop_event.set()
+        data_event.set()
+
+    signal.signal(signal.SIGINT, handle_signal)
+    signal.signal(signal.SIGTERM, handle_signal)
+
+    replay_source = None
+    if replay_path:
+        from modules.system.session_recorder import ReplaySource
+
+        # Метрики, запись и агент получают снимки из записи сеанса
+        replay_source = ReplaySource(
+            replay_path,
+            speed=replay_speed,
+            history_length=MONITORING_SETTINGS["performance_history_length"],
+        )
+        process_monitor = replay_source.process_monitor
+        performance_monitor = replay_source.performance_monitor
+        logger.info("Воспроизведение записи: %s", replay_path)
+    else:
+        process_monitor = ProcessMonitor()
+        process_monitor.update_interval = MONITORING_SETTINGS["process_update_interval"]
+        performance_monitor = PerformanceMonitor(
+            history_length=MONITORING_SETTINGS["performance_history_length"]
+        )
+        performance_monitor.update_interval = MONITORING_SETTINGS[
+            "performance_update_interval"
+        ]
+
+    if metrics is None:
+        metrics = METRICS_SETTINGS["enabled"]
+
+    metrics_server = None
+    if metrics:
+        from modules.monitoring.metrics_server import start_metrics_export
+
+        metrics_server = start_metrics_export(
+            process_monitor, performance_monitor, metrics_host, metrics_port
+        )
+
+    recorder = None
+    record_path = record_path or RECORDING_SETTINGS["record_path"]
+    if record_path:
+        from modules.system.session_recorder import SessionRecorder
+
+        recorder = SessionRecorder(record_path)
+        recorder.attach(process_monitor, performance_monitor)
+        logger.info(f"Запись сеанса в файл: {record_path}")
+
+    fleet_agent = None
+    if agent:
+        from modules.fleet.agent import FleetAgent
+
+        fleet_agent = FleetAgent(agent_host, agent_port, agent_name)
+        fleet_agent.attach(process_monitor, performance_monitor)
+        fleet_agent.start()
+
+    # Состояние сохраняется для быстрого запуска интерфейса
+    warm_start = None
+    if WARM_START_SETTINGS["enabled"] and not replay_source:
+        from modules.system.warm_start import WarmStartStore
+
+        warm_start = WarmStartStore(process_monitor, performance_monitor)
+        warm_start.start()
+
+    # Подписчики вызываются сразу после публикации нового снимка,
+    # без периодического опроса шин
+    process_monitor.bus.set_notifier(data_event.set)
+    performance_monitor.bus.set_notifier(data_event.set)
+
+    process_monitor.start_monitoring()
+    performance_monitor.start_monitoring()
+    logger.info("Сборщики запущены")
+
+    try:
+        while not stop_event.is_set():
+            # Окончание записи не публикует снимок, поэтому при
+            # воспроизведении ожидание периодически прерывается
+            data_event.wait(1.0 if replay_source else None)
+            data_event.clear()
+            # Проверяется до раздачи: все кадры записи уже опубликованы
+            finished = replay_source is not None and not replay_source.running
+            process_monitor.process_callbacks()
+            performance_monitor.process_callbacks()
+            if finished:
+                logger.info("Запись сеанса воспроизведена, завершение работы")
+                break
+    finally:
+        process_monitor.stop_monitoring()
+        performance_monitor.stop_monitoring()
+        if metrics_server:
+            metrics_server.stop()
+        if warm_start:
+            warm_start.stop()
+        if fleet_agent:
+            fleet_agent.stop()
+        if recorder:
+            # Дописываем снимки, оставшиеся в очередях
+            process_monitor.process_callbacks()
+            performance_monitor.process_callbacks()
+            recorder.close()
+        for monitor in (process_monitor, performance_monitor):
+            for stats in monitor.bus.stats():
+                if stats["dropped"]:
+                    logger.info(
+                        f"Подписчик {stats['callback']} ({stats['topic']}): "
+                        f"доставлено {stats['delivered']}, "
+                        f"пропущено {stats['dropped']}"
+                    )
+        logger.info("Сборщики остановлены")
@@ -0,0 +1,226 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from modules.utils.logger import get_logger
+from modules.config.settings import METRICS_SETTINGS
+
+# Инициализация логгера
+logger = get_logger()
+
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+PREFIX = "system_monitor"
+MB = 1024 * 1024
+
+
+def _escape_label(value):
+    """Экранирует значение метки по правилам OpenMetrics"""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class MetricsStore:
+    """
+    Хранилище последних собранных снимков для экспорта метрик.
+
+    Снимки попадают сюда через callback-и мониторов, поэтому экспорт
+    никогда не вызывает psutil сам. Отрисованный текст кэшируется до
+    следующего снимка: сколько бы скрейперов ни пришло за один такт,
+    рендеринг выполняется один раз.
+    """
+
+    def __init__(self, top_k=10):
+        self.top_k = top_k
+        self.lock = threading.Lock()
+        self.performance = None
+        self.processes = None
+        self.tick = 0
+        self._rendered_tick = -1
+        self._rendered_body = b""
+
+    def update_performance(self, performance_data):
+        """Callback для PerformanceMonitor"""
+        with self.lock:
+            self.performance = performance_data
+            self.tick += 1
+
+    def update_processes(self, processes):
+        """Callback для ProcessMonitor"""
+        with self.lock:
+            self.processes = processes
+            self.tick += 1
+
+    def render(self):
+        """Возвращает тело ответа в формате OpenMetrics (с кэшированием по такту)"""
+        with self.lock:
+            if self._rendered_tick != self.tick:
+                self._rendered_body = self._render(
+                    self.performance, self.processes
+                ).encode("utf-8")
+                self._rendered_tick = self.tick
+            return self._rendered_body
+
+    def _render(self, performance, processes):
+        lines = []
+
+        def gauge(name, help_text, samples):
+            lines.append(f"# TYPE {PREFIX}_{name} gauge")
+            lines.append(f"# HELP {PREFIX}_{name} {help_text}")
+            for labels, value in samples:
+                if labels:
+                    label_text = ",".join(
+                        f'{key}="{_escape_label(val)}"' for key, val in labels.items()
+                    )
+                    lines.append(f"{PREFIX}_{name}{{{label_text}}} {value}")
+                else:
+                    lines.append(f"{PREFIX}_{name} {value}")
+
+        if performance:
+            cpu = performance["cpu"]["current"]
+            memory = performance["memory"]
+            read_speed, write_speed = performance["disk_io"]["current"]
+            sent_speed, recv_speed = performance["network"]["current"]
+
+            gauge("cpu_usage_percent", "Загрузка ЦП.", [({}, cpu)])
+            gauge(
+                "memory_usage_percent",
+                "Использование оперативной памяти.",
+                [({}, memory["current"])],
+            )
+            gauge(
+                "memory_used_bytes",
+                "Используемая оперативная память.",
+                [({}, memory["used"])],
+            )
+            gauge(
+                "memory_total_bytes",
+                "Общий объем оперативной памяти.",
+                [({}, memory["total"])],
+            )
+
+            breakdown = (performance.get("memory_breakdown") or {}).get("current")
+            if breakdown:
+                gauge(
+                    "memory_breakdown_bytes",
+                    "Структура памяти по /proc/meminfo.",
+                    [
+                        ({"kind": kind}, breakdown[kind])
+                        for kind in ("anon", "file", "slab", "dirty", "writeback")
+                    ],
+                )
+
+            gauge(
+                "disk_io_bytes_per_second",
+                "Скорость дискового ввода-вывода.",
+                [
+                    ({"direction": "read"}, read_speed * MB),
+                    ({"direction": "write"}, write_speed * MB),
+                ],
+            )
+            gauge(
+                "network_bytes_per_second",
+                "Скорость сетевого обмена.",
+                [
+                    ({"direction": "sent"}, sent_speed * MB),
+                    ({"direction": "recv"}, recv_speed * MB),
+                ],
+            )
+
+        if processes:
+            top = processes[: self.top_k]
+            gauge(
+                "process_resident_memory_bytes",
+                "Резидентная память процессов (топ по памяти).",
+                [
+                    ({"pid": pid, "name": name}, float(memory) * MB)
+                    for name, pid, memory, cpu, status in top
+                ],
+            )
+            gauge(
+                "process_cpu_usage_percent",
+                "Загрузка ЦП процессами (топ по памяти).",
+                [
+                    ({"pid": pid, "name": name}, float(cpu))
+                    for name, pid, memory, cpu, status in top
+                ],
+            )
+
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+
+class _MetricsRequestHandler(BaseHTTPRequestHandler):
+    store = None
+
+    def do_GET(self):
+        if self.path.split("?", 1)[0] != "/metrics":
+            self.send_error(404)
+            return
+
+        body = self.store.render()
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Не засоряем stderr записями о каждом запросе
+        pass
+
+
+class MetricsServer:
+    """
+    Встроенный HTTP-сервер, отдающий метрики из MetricsStore по /metrics.
+
+    По умолчанию слушает только localhost.
+    """
+
+    def __init__(self, store, host=None, port=None):
+        self.store = store
+        self.host = host or METRICS_SETTINGS["host"]
+        self.port = port if port is not None else METRICS_SETTINGS["port"]
+        self.httpd = None
+        self.thread = None
+
+    def start(self):
+        """Запуск сервера в фоновом потоке"""
+        if self.httpd:
+            return
+
+        handler = type(
+            "MetricsRequestHandler", (_MetricsRequestHandler,), {"store": self.store}
+        )
+        self.httpd = ThreadingHTTPServer((self.host, self.port), handler)
+        self.httpd.daemon_threads = True
+        self.port = self.httpd.server_address[1]
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        logger.info(
+            f"Экспорт метрик доступен на http://{self.host}:{self.port}/metrics"
+        )
+
+    def stop(self):
+        """Остановка сервера"""
+        if not self.httpd:
+            return
+
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        self.thread.join(timeout=1)
+        self.httpd = None
+        self.thread = None
+        logger.info("Экспорт метрик остановлен")
+
+
+def start_metrics_export(process_monitor, performance_monitor, host=None, port=None):
+    """
+    Подключает хранилище метрик к мониторам и запускает HTTP-сервер.
+
+    Возвращает:
+        MetricsServer: Запущенный сервер
+    """
+    store = MetricsStore(top_k=METRICS_SETTINGS["top_k"])
+    process_monitor.register_callback(store.update_processes)
+    performance_monitor.register_callback(store.update_performance)
+
+    server = MetricsServer(store, host, port)
+    server.start()
+    return server
@@ -49,7 +49,8 @@ class PerformanceMonitor:
     def add_update_callback(self, callback):
         """Добавляет функцию обратного вызова для обновления UI"""
         logger.debug(
-            f"Добавлен callback для обновления UI: {callback.__name__ if hasattr(callback, '__name__') else 'anonymous'}"
+            "Добавлен callback для обновления UI: %s",
+            getattr(callback, "__name__", "anonymous"),
         )
         self.update_callbacks.append(callback)
 
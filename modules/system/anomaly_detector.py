@@ -0,0 +1,203 @@
+import math
+
+# Отдельный уровень логов для найденных аномалий
+ANOMALY_LEVEL = "ANOMALY"
+
+
+class EwmaDetector:
+    """
+    Потоковый детектор аномалий для одного ряда значений.
+
+    Хранит экспоненциально сглаженные среднее и дисперсию и обновляет их
+    за O(1) на каждое значение. Значение считается аномальным, если его
+    отклонение от базовой линии превышает threshold стандартных отклонений
+    и при этом не меньше min_delta в абсолютных единицах.
+
+    Аргументы:
+        name (str): Название ряда для сообщений
+        alpha (float): Коэффициент сглаживания EWMA
+        threshold (float): Порог по z-оценке
+        min_delta (float): Минимальное абсолютное отклонение
+        direction (str): "up" - только всплески, "down" - только провалы,
+            "both" - оба направления
+        warmup (int): Количество значений до начала обнаружения
+        cooldown (int): Количество значений после срабатывания, в течение
+            которых повторные срабатывания подавляются
+    """
+
+    def __init__(
+        self,
+        name,
+        alpha=0.05,
+        threshold=4.0,
+        min_delta=0.0,
+        direction="up",
+        warmup=20,
+        cooldown=30,
+    ):
+        self.name = name
+        self.alpha = alpha
+        self.threshold = threshold
+        self.min_delta = min_delta
+        self.direction = direction
+        self.warmup = warmup
+        self.cooldown = cooldown
+
+        self.mean = 0.0
+        self.var = 0.0
+        self.count = 0
+        self._quiet = 0
+
+    def update(self, value):
+        """
+        Добавляет значение в ряд.
+
+        Возвращает:
+            dict или None: Описание аномалии (value, mean, std, z) или None
+        """
+        if self.count == 0:
+            self.mean = value
+            self.count = 1
+            return None
+
+        diff = value - self.mean
+        std = math.sqrt(self.var)
+        z = diff / std if std > 0 else 0.0
+
+        event = None
+        if self._quiet > 0:
+            self._quiet -= 1
+        elif self.count >= self.warmup and abs(diff) >= self.min_delta:
+            is_spike = z >= self.threshold and self.direction in ("up", "both")
+            is_drop = z <= -self.threshold and self.direction in ("down", "both")
+            if is_spike or is_drop:
+                event = {
+                    "series": self.name,
+                    "value": value,
+                    "mean": self.mean,
+                    "std": std,
+                    "z": z,
+                }
+                self._quiet = self.cooldown
+
+        # Обновляем EWMA среднего и дисперсии
+        increment = self.alpha * diff
+        self.mean += increment
+        self.var = (1 - self.alpha) * (self.var + diff * increment)
+        self.count += 1
+        return event
+
+
+class VectorEwmaDetector:
+    """
+    Векторизованный EWMA-детектор для множества рядов с целочисленными
+    ключами (например, CPU каждого процесса по PID).
+
+    Состояние хранится в массивах numpy, отсортированных по ключу. Каждое
+    обновление сопоставляет новые ключи со старыми через searchsorted,
+    поэтому вся проверка выполняется без цикла Python по процессам.
+    Ключи, пропавшие из выборки (завершенные процессы), отбрасываются.
+    """
+
+    def __init__(
+        self,
+        name,
+        alpha=0.1,
+        threshold=4.0,
+        min_delta=0.0,
+        warmup=10,
+        cooldown=30,
+    ):
+        self.name = name
+        self.alpha = alpha
+        self.threshold = threshold
+        self.min_delta = min_delta
+        self.warmup = warmup
+        self.cooldown = cooldown
+
+        # Массивы состояния создаются при первом обновлении
+        self.keys = None
+        self.mean = None
+        self.var = None
+        self.count = None
+        self.quiet = None
+
+    def update(self, keys, values):
+        """
+        Добавляет по одному значению в каждый ряд.
+
+        Аргументы:
+            keys (array-like): Целочисленные ключи рядов
+            values (array-like): Значения в том же порядке
+
+        Возвращает:
+            list: Список словарей с описанием аномалий (key, value, mean, std, z)
+        """
+        # numpy импортируется при первом замере, а не при запуске приложения
+        import numpy as np
+
+        keys = np.asarray(keys, dtype=np.int64)
+        values = np.asarray(values, dtype=np.float64)
+        if keys.size == 0:
+            return []
+
+        order = np.argsort(keys, kind="stable")
+        keys = keys[order]
+        values = values[order]
+
+        # Сопоставляем новые ключи с текущим состоянием
+        mean = values.copy()
+        var = np.zeros_like(values)
+        count = np.zeros(keys.size, dtype=np.int32)
+        quiet = np.zeros(keys.size, dtype=np.int32)
+        if self.keys is not None and self.keys.size:
+            pos = np.searchsorted(self.keys, keys)
+            pos_clipped = np.minimum(pos, self.keys.size - 1)
+            known = self.keys[pos_clipped] == keys
+            src = pos_clipped[known]
+            mean[known] = self.mean[src]
+            var[known] = self.var[src]
+            count[known] = self.count[src]
+            quiet[known] = self.quiet[src]
+
+        diff = values - mean
+        std = np.sqrt(var)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            z = np.where(std > 0, diff / std, 0.0)
+
+        flagged = (
+            (count >= self.warmup)
+            & (quiet == 0)
+            & (z >= self.threshold)
+            & (diff >= self.min_delta)
+        )
+
+        # Обновляем состояние всех рядов одной операцией
+        increment = np.where(count > 0, self.alpha * diff, 0.0)
+        self.mean = mean + increment
+        self.var = (1 - self.alpha) * (var + diff * increment)
+        self.count = count + 1
+        self.quiet = np.where(flagged, self.cooldown, np.maximum(quiet - 1, 0))
+        self.keys = keys
+
+        return [
+            {
+                "series": self.name,
+                "key": int(keys[i]),
+                "value": float(values[i]),
+                "mean": float(mean[i]),
+                "std": float(std[i]),
+                "z": float(z[i]),
+            }
+            for i in np.flatnonzero(flagged)
+        ]
+
+
+def format_anomaly(event):
+    """Форматирует описание аномалии для записи в лог"""
+    kind = "всплеск" if event["z"] > 0 else "провал"
+    return (
+        f"Аномалия ({kind}) {event['series']}: {event['value']:.1f} "
+        f"при базовом уровне {event['mean']:.1f} ± {event['std']:.1f} "
+        f"(z={event['z']:.1f})"
+    )
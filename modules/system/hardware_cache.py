@@ -0,0 +1,63 @@
+import json
+import os
+import psutil
+
+# Файл кэша сведений об оборудовании
+CACHE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
+    "cache",
+    "hardware_facts.json",
+)
+BOOT_ID_PATH = "/proc/sys/kernel/random/boot_id"
+
+
+def get_boot_id():
+    """
+    Идентификатор текущей загрузки системы.
+
+    В Linux берется из /proc/sys/kernel/random/boot_id, в остальных
+    системах - время загрузки (оно тоже меняется при каждой перезагрузке).
+    """
+    try:
+        with open(BOOT_ID_PATH) as f:
+            return f.read().strip()
+    except OSError:
+        return f"boot-{int(psutil.boot_time())}"
+
+
+def load_hardware_facts(collect, path=CACHE_PATH):
+    """
+    Возвращает неизменные в пределах загрузки сведения об оборудовании.
+
+    Сведения читаются из кэша на диске, если он записан в текущей
+    загрузке системы. Иначе они собираются функцией collect (вызовы
+    внешних команд, чтение /proc и /sys) и сохраняются в кэш.
+
+    Аргументы:
+        collect (callable): Функция, собирающая сведения (возвращает dict)
+        path (str, optional): Путь к файлу кэша
+
+    Возвращает:
+        dict: Сведения об оборудовании
+    """
+    boot_id = get_boot_id()
+    try:
+        with open(path, encoding="utf-8") as f:
+            cached = json.load(f)
+        if cached.get("boot_id") == boot_id:
+            return cached["facts"]
+    except (OSError, ValueError, KeyError):
+        # Кэша нет или он поврежден: собираем сведения заново
+        pass
+
+    facts = collect()
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Запись через временный файл, чтобы не оставить поврежденный кэш
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump({"boot_id": boot_id, "facts": facts}, f, ensure_ascii=False)
+        os.replace(temp_path, path)
+    except OSError as e:
+        print(f"Не удалось сохранить кэш сведений об оборудовании: {e}")
+    return facts
@@ -0,0 +1,142 @@
+import os
+import re
+import time
+
+# Поля /proc/meminfo, которые нас интересуют (значения в кБ)
+MEMINFO_FIELDS = {
+    b"MemTotal": "total",
+    b"MemFree": "free",
+    b"Buffers": "buffers",
+    b"Cached": "cached",
+    b"AnonPages": "anon",
+    b"Dirty": "dirty",
+    b"Writeback": "writeback",
+    b"Slab": "slab",
+    b"SwapTotal": "swap_total",
+    b"SwapFree": "swap_free",
+}
+
+# Счетчики /proc/vmstat (значения в страницах). pgscan_anon/pgscan_file
+# дублируют kswapd/direct, поэтому берем только счетчики по источнику.
+VMSTAT_FIELDS = {
+    b"pswpin": "swap_in",
+    b"pswpout": "swap_out",
+    b"pgscan_kswapd": "scan",
+    b"pgscan_direct": "scan",
+    b"pgscan_khugepaged": "scan",
+    b"pgscan_proactive": "scan",
+    b"pgsteal_kswapd": "steal",
+    b"pgsteal_direct": "steal",
+    b"pgsteal_khugepaged": "steal",
+    b"pgsteal_proactive": "steal",
+}
+
+# Регулярные выражения компилируются один раз при импорте модуля
+_MEMINFO_RE = re.compile(
+    rb"^(" + b"|".join(re.escape(k) for k in MEMINFO_FIELDS) + rb"):\s+(\d+)",
+    re.MULTILINE,
+)
+_VMSTAT_RE = re.compile(
+    rb"^(" + b"|".join(re.escape(k) for k in VMSTAT_FIELDS) + rb") (\d+)",
+    re.MULTILINE,
+)
+
+_READ_SIZE = 16384
+
+
+class MemoryStatsCollector:
+    """
+    Сборщик подробной статистики памяти из /proc/meminfo и /proc/vmstat.
+
+    Файлы открываются один раз и перечитываются одним вызовом os.pread
+    за такт, поэтому стоимость сбора пренебрежимо мала. На системах без
+    /proc (Windows, macOS) сборщик недоступен и collect() возвращает None.
+    """
+
+    def __init__(self, proc_root="/proc"):
+        self._meminfo_fd = self._open(os.path.join(proc_root, "meminfo"))
+        self._vmstat_fd = self._open(os.path.join(proc_root, "vmstat"))
+        self._page_size = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+        self._last_counters = None
+        self._last_time = None
+
+    @property
+    def available(self):
+        return self._meminfo_fd is not None
+
+    @staticmethod
+    def _open(path):
+        try:
+            return os.open(path, os.O_RDONLY)
+        except (OSError, AttributeError):
+            return None
+
+    @staticmethod
+    def _read(fd):
+        return os.pread(fd, _READ_SIZE, 0)
+
+    def collect(self):
+        """
+        Считывает текущую структуру памяти и скорости подкачки/вытеснения.
+
+        Возвращает:
+            dict или None: Объемы в байтах (anon, file, dirty, writeback, slab,
+                free, total) и скорости в байтах/с (swap_in, swap_out) и
+                страницах/с (scan, steal)
+        """
+        if not self.available:
+            return None
+
+        try:
+            meminfo = {
+                MEMINFO_FIELDS[key]: int(value) * 1024
+                for key, value in _MEMINFO_RE.findall(self._read(self._meminfo_fd))
+            }
+
+            counters = {"swap_in": 0, "swap_out": 0, "scan": 0, "steal": 0}
+            if self._vmstat_fd is not None:
+                for key, value in _VMSTAT_RE.findall(self._read(self._vmstat_fd)):
+                    counters[VMSTAT_FIELDS[key]] += int(value)
+        except OSError as e:
+            print(f"Ошибка при чтении статистики памяти: {e}")
+            return None
+
+        current_time = time.monotonic()
+        rates = {"swap_in": 0.0, "swap_out": 0.0, "scan": 0.0, "steal": 0.0}
+        if self._last_counters is not None:
+            time_diff = max(current_time - self._last_time, 1e-6)
+            for name in rates:
+                rates[name] = (
+                    max(0, counters[name] - self._last_counters[name]) / time_diff
+                )
+            # Подкачка считается в страницах, переводим в байты
+            rates["swap_in"] *= self._page_size
+            rates["swap_out"] *= self._page_size
+        self._last_counters = counters
+        self._last_time = current_time
+
+        return {
+            "total": meminfo.get("total", 0),
+            "free": meminfo.get("free", 0),
+            "anon": meminfo.get("anon", 0),
+            "file": meminfo.get("cached", 0) + meminfo.get("buffers", 0),
+            "dirty": meminfo.get("dirty", 0),
+            "writeback": meminfo.get("writeback", 0),
+            "slab": meminfo.get("slab", 0),
+            "swap_used": meminfo.get("swap_total", 0) - meminfo.get("swap_free", 0),
+            "swap_in": rates["swap_in"],
+            "swap_out": rates["swap_out"],
+            "scan": rates["scan"],
+            "steal": rates["steal"],
+        }
+
+    def close(self):
+        """Закрывает открытые дескрипторы файлов /proc"""
+        for fd in (self._meminfo_fd, self._vmstat_fd):
+            if fd is not None:
+                try:
+                    os.close(fd)
+                except OSError:
+                    pass
+        self._meminfo_fd = None
+        self._vmstat_fd = None
@@ -0,0 +1,143 @@
+from collections import deque
+from modules.utils.event_bus import EventBus
+from modules.utils.logger import get_logger
+from modules.config.settings import MONITORING_SETTINGS
+
+# Инициализация логгера
+logger = get_logger()
+
+# Тема шины событий посредника
+DATA_TOPIC = "data"
+
+
+class SourceMonitor:
+    """
+    Монитор-посредник для внешних источников данных (запись сеанса,
+    удаленные агенты). Повторяет интерфейс ProcessMonitor/PerformanceMonitor
+    (register_callback, start_monitoring, process_callbacks, ...), поэтому
+    его можно передать в представления вместо настоящего монитора.
+
+    Аргументы:
+        source: Объект с методами start() и stop(), который поставляет данные
+    """
+
+    def __init__(self, source):
+        self.source = source
+        self.bus = EventBus(MONITORING_SETTINGS["stream_queue_size"])
+        self.update_interval = 0
+
+    @property
+    def latest(self):
+        return self.bus.latest(DATA_TOPIC)
+
+    def publish(self, data):
+        """Передает новые данные всем подписчикам"""
+        self.bus.publish(DATA_TOPIC, data)
+
+    def start_monitoring(self):
+        self.source.start()
+
+    def stop_monitoring(self):
+        self.source.stop()
+
+    def process_callbacks(self):
+        """Обработка обратных вызовов в основном потоке"""
+        self.bus.dispatch()
+
+    def register_callback(self, callback, stream=False):
+        """Регистрация функции обратного вызова для обновления UI"""
+        self.bus.subscribe(DATA_TOPIC, callback, stream=stream)
+
+    def unregister_callback(self, callback):
+        """Отмена регистрации функции обратного вызова"""
+        self.bus.unsubscribe(DATA_TOPIC, callback)
+
+
+class SourceProcessMonitor(SourceMonitor):
+    # Показывать ли в таблице колонку с именем хоста
+    show_host = False
+
+    def get_processes(self):
+        """Получение текущего списка процессов"""
+        return list(self.latest or [])
+
+    def kill_process(self, pid, process_info=None):
+        """Завершение процессов для внешних источников недоступно"""
+        logger.warning(
+            f"Завершение процесса {pid} недоступно для этого источника данных"
+        )
+        return False
+
+
+class SourcePerformanceMonitor(SourceMonitor):
+    """Восстанавливает историю из последовательности снимков snapshot_codec"""
+
+    def __init__(self, source, history_length):
+        super().__init__(source)
+        self.cpu_history = deque(maxlen=history_length)
+        self.memory_history = deque(maxlen=history_length)
+        self.disk_io_history = deque(maxlen=history_length)
+        self.network_history = deque(maxlen=history_length)
+        self.memory_breakdown_history = deque(maxlen=history_length)
+        self.anomaly_history = {
+            chart: deque(maxlen=history_length)
+            for chart in ("cpu", "memory", "disk_io", "network")
+        }
+        self.sample_count = 0
+
+    def publish_record(self, record):
+        """
+        Добавляет снимок (результат decode_performance) в историю и передает
+        подписчикам данные в том же виде, что и PerformanceMonitor.
+        """
+        self.cpu_history.append(record["cpu"])
+        self.memory_history.append(record["memory"])
+        self.disk_io_history.append(record["disk_io"])
+        self.network_history.append(record["network"])
+        for chart, flag in record["anomalies"].items():
+            self.anomaly_history[chart].append(flag)
+
+        breakdown = record["memory_breakdown"]
+        if breakdown:
+            total = breakdown["total"] or 1
+            self.memory_breakdown_history.append(
+                (
+                    breakdown["anon"] / total * 100,
+                    breakdown["file"] / total * 100,
+                    breakdown["slab"] / total * 100,
+                )
+            )
+
+        self.sample_count += 1
+        self.publish(
+            {
+                "sample": self.sample_count,
+                "cpu": {"current": record["cpu"], "history": list(self.cpu_history)},
+                "memory": {
+                    "current": record["memory"],
+                    "total": record["memory_total"],
+                    "used": record["memory_used"],
+                    "history": list(self.memory_history),
+                },
+                "disk_io": {
+                    "current": record["disk_io"],
+                    "history": list(self.disk_io_history),
+                },
+                "network": {
+                    "current": record["network"],
+                    "history": list(self.network_history),
+                },
+                "memory_breakdown": {
+                    "current": breakdown,
+                    "history": list(self.memory_breakdown_history),
+                },
+                "anomalies": {
+                    chart: list(history)
+                    for chart, history in self.anomaly_history.items()
+                },
+            }
+        )
+
+    def get_current_data(self):
+        """Получение последних данных"""
+        return self.latest
@@ -0,0 +1,108 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from modules.utils.logger import get_logger
+from modules.config.settings import MONITORING_SETTINGS
+
+# Инициализация логгера
+logger = get_logger()
+
+
+class MonitorRuntime:
+    """
+    Среда выполнения мониторов поверх цикла asyncio (цикл Flet).
+
+    Замеры выполняются задачами asyncio: блокирующий sample() монитора
+    уходит в ограниченный пул потоков, а между замерами задача спит в
+    цикле событий. Подписчики вызываются в потоке цикла только тогда,
+    когда в шину монитора действительно пришли данные, поэтому
+    периодического опроса очередей нет.
+
+    Аргументы:
+        loop (asyncio.AbstractEventLoop): Цикл событий приложения
+        max_workers (int, optional): Размер пула потоков для замеров
+    """
+
+    def __init__(self, loop, max_workers=None):
+        self.loop = loop
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers or MONITORING_SETTINGS["collector_workers"],
+            thread_name_prefix="collector",
+        )
+        self.monitors = []
+        self.tasks = {}
+        self._dispatch_scheduled = False
+
+    def attach(self, monitor):
+        """Подключает монитор: его шина будет доставлять данные в цикл"""
+        if monitor in self.monitors:
+            return
+        self.monitors.append(monitor)
+        monitor.bus.set_notifier(self._notify)
+        if hasattr(monitor, "sample"):
+            monitor.runtime = self
+
+    def start_collector(self, monitor):
+        """Запускает задачу замеров монитора (можно вызывать из любого потока)"""
+        self._call_in_loop(self._start_collector, monitor)
+
+    def stop_collector(self, monitor):
+        """Останавливает задачу замеров монитора"""
+        self._call_in_loop(self._stop_collector, monitor)
+
+    def stop(self):
+        """Останавливает все задачи и пул потоков"""
+        for monitor in self.monitors:
+            monitor.bus.set_notifier(None)
+            if getattr(monitor, "runtime", None) is self:
+                monitor.runtime = None
+        for task in list(self.tasks.values()):
+            self._call_in_loop(task.cancel)
+        self.tasks = {}
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def _call_in_loop(self, callback, *args):
+        if self.loop.is_closed():
+            return
+        try:
+            self.loop.call_soon_threadsafe(callback, *args)
+        except RuntimeError:
+            # Цикл был закрыт между проверкой и вызовом
+            pass
+
+    def _start_collector(self, monitor):
+        task = self.tasks.get(id(monitor))
+        if task and not task.done():
+            return
+        self.tasks[id(monitor)] = self.loop.create_task(self._collect(monitor))
+
+    def _stop_collector(self, monitor):
+        task = self.tasks.pop(id(monitor), None)
+        if task:
+            task.cancel()
+
+    async def _collect(self, monitor):
+        while monitor.running:
+            try:
+                await self.loop.run_in_executor(self.executor, monitor.sample)
+                delay = monitor.update_interval
+            except asyncio.CancelledError:
+                raise
+            except RuntimeError:
+                # Пул потоков остановлен при закрытии приложения
+                return
+            except Exception as e:
+                logger.exception(e, "Ошибка при выполнении замера:")
+                delay = 1
+            await asyncio.sleep(delay)
+
+    def _notify(self):
+        # Несколько публикаций подряд объединяются в одну доставку
+        if self._dispatch_scheduled:
+            return
+        self._dispatch_scheduled = True
+        self._call_in_loop(self._dispatch)
+
+    def _dispatch(self):
+        self._dispatch_scheduled = False
+        for monitor in self.monitors:
+            monitor.process_callbacks()
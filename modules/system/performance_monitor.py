@@ -1,8 +1,22 @@
 import psutil
 import time
 import threading
-import queue
 from collections import deque
+from modules.utils.event_bus import EventBus
+from modules.utils.logger import get_logger
+from modules.system.memory_stats import MemoryStatsCollector
+from modules.system.anomaly_detector import (
+    ANOMALY_LEVEL,
+    EwmaDetector,
+    format_anomaly,
+)
+from modules.config.settings import ANOMALY_SETTINGS, MONITORING_SETTINGS
+
+# Инициализация логгера
+logger = get_logger()
+
+# Тема шины событий с данными о производительности
+PERFORMANCE_TOPIC = "performance"
 
 
 class PerformanceMonitor:
@@ -11,11 +25,28 @@ class PerformanceMonitor:
         self.memory_history = deque(maxlen=history_length)
         self.disk_io_history = deque(maxlen=history_length)
         self.network_history = deque(maxlen=history_length)
+        # История структуры памяти: (anon, кэш, slab) в процентах от общего объема
+        self.memory_breakdown_history = deque(maxlen=history_length)
+        self.memory_stats = MemoryStatsCollector()
+
+        # Детекторы аномалий: ряд -> (график, детектор)
+        self.anomaly_detectors = self._create_anomaly_detectors()
+        self.anomaly_history = {
+            chart: deque(maxlen=history_length)
+            for chart in ("cpu", "memory", "disk_io", "network")
+        }
 
         self.running = False
+        # Событие остановки прерывает ожидание между замерами
+        self.stop_event = threading.Event()
+        # MonitorRuntime, если замеры выполняются в цикле asyncio
+        self.runtime = None
         self.update_interval = 1  # секунды
-        self.callbacks = []
-        self.callback_queue = queue.Queue()
+        # Номер последнего замера: по нему подписчики узнают, сколько
+        # новых точек появилось в истории
+        self.sample_count = 0
+        # Снимки передаются подписчикам через ограниченную шину событий
+        self.bus = EventBus(MONITORING_SETTINGS["stream_queue_size"])
 
         # Инициализация начальных значений для расчета скорости
         self.last_disk_read = 0
@@ -23,6 +54,59 @@ class PerformanceMonitor:
         self.last_net_sent = 0
         self.last_net_recv = 0
         self.last_time = time.time()
+        # Счетчики диска и сети еще не считаны: скорость первого замера
+        # считается нулевой, а не разницей с нулем
+        self.counters_primed = False
+
+        # Снимок, восстановленный из сохраненного состояния, до первого замера
+        self.stale_data = None
+
+    @staticmethod
+    def _create_anomaly_detectors():
+        """Создает детекторы аномалий для системных метрик"""
+        if not ANOMALY_SETTINGS["enabled"]:
+            return {}
+
+        def detector(name, min_delta, direction="up"):
+            return EwmaDetector(
+                name,
+                alpha=ANOMALY_SETTINGS["alpha"],
+                threshold=ANOMALY_SETTINGS["threshold"],
+                min_delta=min_delta,
+                direction=direction,
+                warmup=ANOMALY_SETTINGS["warmup"],
+                cooldown=ANOMALY_SETTINGS["cooldown"],
+            )
+
+        return {
+            "cpu": ("cpu", detector("CPU, %", 15.0)),
+            "memory": ("memory", detector("Память, %", 5.0)),
+            "disk_read": ("disk_io", detector("Чтение диска, МБ/с", 5.0)),
+            "disk_write": ("disk_io", detector("Запись диска, МБ/с", 5.0)),
+            # Для сети интересны и всплески, и обвалы скорости
+            "net_sent": ("network", detector("Отправка, МБ/с", 0.5, "both")),
+            "net_recv": ("network", detector("Получение, МБ/с", 0.5, "both")),
+        }
+
+    def _detect_anomalies(self, values):
+        """
+        Прогоняет новые значения через детекторы и отмечает аномалии.
+
+        Аргументы:
+            values (dict): Значения метрик по названиям рядов
+        """
+        flagged = set()
+        for series, value in values.items():
+            if series not in self.anomaly_detectors:
+                continue
+            chart, detector = self.anomaly_detectors[series]
+            event = detector.update(value)
+            if event:
+                flagged.add(chart)
+                logger.log(format_anomaly(event), ANOMALY_LEVEL)
+
+        for chart, history in self.anomaly_history.items():
+            history.append(chart in flagged)
 
     def start_monitoring(self):
         """Запуск мониторинга производительности"""
@@ -30,6 +114,12 @@ class PerformanceMonitor:
             return
 
         self.running = True
+        self.stop_event.clear()
+        if self.runtime:
+            # Замеры выполняются задачей asyncio через общий пул потоков
+            self.runtime.start_collector(self)
+            return
+
         self.monitor_thread = threading.Thread(target=self._monitor_performance)
         self.monitor_thread.daemon = True
         self.monitor_thread.start()
@@ -37,6 +127,9 @@ class PerformanceMonitor:
     def stop_monitoring(self):
         """Остановка мониторинга производительности"""
         self.running = False
+        self.stop_event.set()
+        if self.runtime:
+            self.runtime.stop_collector(self)
         if hasattr(self, "monitor_thread"):
             self.monitor_thread.join(timeout=1)
 
@@ -44,86 +137,190 @@ class PerformanceMonitor:
         """Фоновый мониторинг производительности"""
         while self.running:
             try:
-                current_time = time.time()
-                time_diff = current_time - self.last_time
-
-                # CPU
-                cpu_percent = psutil.cpu_percent(interval=None)
-                self.cpu_history.append(cpu_percent)
-
-                # Память
-                memory = psutil.virtual_memory()
-                memory_percent = memory.percent
-                self.memory_history.append(memory_percent)
-
-                # Диск I/O
-                disk_io = psutil.disk_io_counters()
-                if disk_io:
-                    read_speed = (
-                        (disk_io.read_bytes - self.last_disk_read)
-                        / time_diff
-                        / (1024 * 1024)
-                    )  # МБ/с
-                    write_speed = (
-                        (disk_io.write_bytes - self.last_disk_write)
-                        / time_diff
-                        / (1024 * 1024)
-                    )  # МБ/с
-                    self.disk_io_history.append((read_speed, write_speed))
-                    self.last_disk_read = disk_io.read_bytes
-                    self.last_disk_write = disk_io.write_bytes
-
-                # Сеть
-                net_io = psutil.net_io_counters()
-                sent_speed = (
-                    (net_io.bytes_sent - self.last_net_sent) / time_diff / (1024 * 1024)
-                )  # МБ/с
-                recv_speed = (
-                    (net_io.bytes_recv - self.last_net_recv) / time_diff / (1024 * 1024)
-                )  # МБ/с
-                self.network_history.append((sent_speed, recv_speed))
-                self.last_net_sent = net_io.bytes_sent
-                self.last_net_recv = net_io.bytes_recv
-
-                self.last_time = current_time
-
-                # Подготавливаем данные для обратных вызовов
-                performance_data = {
-                    "cpu": {"current": cpu_percent, "history": list(self.cpu_history)},
-                    "memory": {
-                        "current": memory_percent,
-                        "total": memory.total,
-                        "used": memory.used,
-                        "history": list(self.memory_history),
-                    },
-                    "disk_io": {
-                        "current": (read_speed, write_speed) if disk_io else (0, 0),
-                        "history": list(self.disk_io_history),
-                    },
-                    "network": {
-                        "current": (sent_speed, recv_speed),
-                        "history": list(self.network_history),
-                    },
-                }
-
-                # Помещаем данные в очередь для обработки в основном потоке
-                for callback in self.callbacks:
-                    self.callback_queue.put((callback, performance_data))
-
-                time.sleep(self.update_interval)
+                self.sample()
+                self.stop_event.wait(self.update_interval)
             except Exception as e:
                 print(f"Ошибка при мониторинге производительности: {e}")
-                time.sleep(1)
+                self.stop_event.wait(1)
+
+    def sample(self):
+        """
+        Выполняет один замер и публикует его подписчикам.
+
+        Метод блокирующий (psutil, /proc), поэтому вызывается из потока
+        мониторинга или из пула потоков MonitorRuntime.
+        """
+        current_time = time.time()
+        time_diff = current_time - self.last_time
+
+        # CPU
+        cpu_percent = psutil.cpu_percent(interval=None)
+        self.cpu_history.append(cpu_percent)
+
+        # Память
+        memory = psutil.virtual_memory()
+        memory_percent = memory.percent
+        self.memory_history.append(memory_percent)
+
+        # Подробная структура памяти (только Linux)
+        memory_breakdown = self.memory_stats.collect()
+        if memory_breakdown:
+            total = memory_breakdown["total"] or 1
+            self.memory_breakdown_history.append(
+                (
+                    memory_breakdown["anon"] / total * 100,
+                    memory_breakdown["file"] / total * 100,
+                    memory_breakdown["slab"] / total * 100,
+                )
+            )
+
+        # Диск I/O
+        disk_io = psutil.disk_io_counters()
+        if disk_io:
+            read_speed = (
+                (disk_io.read_bytes - self.last_disk_read) / time_diff / (1024 * 1024)
+            )  # МБ/с
+            write_speed = (
+                (disk_io.write_bytes - self.last_disk_write) / time_diff / (1024 * 1024)
+            )  # МБ/с
+            if not self.counters_primed:
+                read_speed = write_speed = 0.0
+            self.disk_io_history.append((read_speed, write_speed))
+            self.last_disk_read = disk_io.read_bytes
+            self.last_disk_write = disk_io.write_bytes
+
+        # Сеть
+        net_io = psutil.net_io_counters()
+        sent_speed = (
+            (net_io.bytes_sent - self.last_net_sent) / time_diff / (1024 * 1024)
+        )  # МБ/с
+        recv_speed = (
+            (net_io.bytes_recv - self.last_net_recv) / time_diff / (1024 * 1024)
+        )  # МБ/с
+        if not self.counters_primed:
+            sent_speed = recv_speed = 0.0
+        self.network_history.append((sent_speed, recv_speed))
+        self.last_net_sent = net_io.bytes_sent
+        self.last_net_recv = net_io.bytes_recv
+
+        self.last_time = current_time
+        self.counters_primed = True
+
+        # Обнаружение аномалий
+        self._detect_anomalies(
+            {
+                "cpu": cpu_percent,
+                "memory": memory_percent,
+                "disk_read": read_speed if disk_io else 0,
+                "disk_write": write_speed if disk_io else 0,
+                "net_sent": sent_speed,
+                "net_recv": recv_speed,
+            }
+        )
+
+        # Подготавливаем данные для обратных вызовов
+        self.sample_count += 1
+        self.stale_data = None
+        performance_data = self._snapshot(
+            cpu_percent,
+            memory_percent,
+            memory.total,
+            memory.used,
+            (read_speed, write_speed) if disk_io else (0, 0),
+            (sent_speed, recv_speed),
+            memory_breakdown,
+        )
+
+        # Публикуем данные в шину для обработки в основном потоке
+        self.bus.publish(PERFORMANCE_TOPIC, performance_data)
+        return performance_data
+
+    def _snapshot(
+        self, cpu, memory, memory_total, memory_used, disk_io, network, breakdown
+    ):
+        """Данные для подписчиков: текущие значения и копии истории"""
+        return {
+            "sample": self.sample_count,
+            "cpu": {"current": cpu, "history": list(self.cpu_history)},
+            "memory": {
+                "current": memory,
+                "total": memory_total,
+                "used": memory_used,
+                "history": list(self.memory_history),
+            },
+            "disk_io": {"current": disk_io, "history": list(self.disk_io_history)},
+            "network": {"current": network, "history": list(self.network_history)},
+            "memory_breakdown": {
+                "current": breakdown,
+                "history": list(self.memory_breakdown_history),
+            },
+            "anomalies": {
+                chart: list(history) for chart, history in self.anomaly_history.items()
+            },
+        }
+
+    def export_history(self):
+        """История для сохранения между запусками (формат encode_history)"""
+        return {
+            "cpu": list(self.cpu_history),
+            "memory": list(self.memory_history),
+            "disk_io": list(self.disk_io_history),
+            "network": list(self.network_history),
+            "memory_breakdown": list(self.memory_breakdown_history),
+            "anomalies": {
+                chart: list(history) for chart, history in self.anomaly_history.items()
+            },
+        }
+
+    def restore_history(self, history, sample_count, saved_at):
+        """
+        Восстанавливает историю, сохраненную при прошлом запуске.
+
+        Пока не выполнен первый замер, get_stale_data() возвращает снимок
+        из восстановленной истории, помеченный как устаревший, чтобы
+        графики сразу показывали контекст.
+
+        Аргументы:
+            history (dict): Результат export_history
+            sample_count (int): Номер последнего сохраненного замера
+            saved_at (float): Время сохранения (Unix time)
+        """
+        if self.sample_count or not history["cpu"]:
+            # Свежие замеры уже есть
+            return
+
+        self.cpu_history.extend(history["cpu"])
+        self.memory_history.extend(history["memory"])
+        self.disk_io_history.extend(history["disk_io"])
+        self.network_history.extend(history["network"])
+        self.memory_breakdown_history.extend(history["memory_breakdown"])
+        for chart, flags in history["anomalies"].items():
+            if chart in self.anomaly_history:
+                self.anomaly_history[chart].extend(flags)
+        # Номера замеров продолжаются, чтобы графики добавляли точки к
+        # восстановленной истории, а не строились заново
+        self.sample_count = sample_count
+
+        memory = psutil.virtual_memory()
+        performance_data = self._snapshot(
+            self.cpu_history[-1],
+            self.memory_history[-1],
+            memory.total,
+            memory.used,
+            self.disk_io_history[-1] if self.disk_io_history else (0, 0),
+            self.network_history[-1] if self.network_history else (0, 0),
+            None,
+        )
+        performance_data["stale"] = saved_at
+        self.stale_data = performance_data
+
+    def get_stale_data(self):
+        """Снимок из сохраненного состояния (None после первого замера)"""
+        return self.stale_data
 
     def process_callbacks(self):
         """Обработка обратных вызовов в основном потоке"""
-        try:
-            while not self.callback_queue.empty():
-                callback, data = self.callback_queue.get_nowait()
-                callback(data)
-                self.callback_queue.task_done()
-        except Exception as e:
-            print(f"Ошибка при обработке callback: {e}")
+        self.bus.dispatch()
 
     def get_current_data(self):
         """Получение текущих данных о производительности"""
@@ -131,6 +328,7 @@ class PerformanceMonitor:
         memory = psutil.virtual_memory()
 
         return {
+            "sample": self.sample_count,
             "cpu": {"current": cpu_percent, "history": list(self.cpu_history)},
             "memory": {
                 "current": memory.percent,
@@ -140,14 +338,24 @@ class PerformanceMonitor:
             },
             "disk_io": {"history": list(self.disk_io_history)},
             "network": {"history": list(self.network_history)},
+            "memory_breakdown": {
+                "current": None,
+                "history": list(self.memory_breakdown_history),
+            },
+            "anomalies": {
+                chart: list(history) for chart, history in self.anomaly_history.items()
+            },
         }
 
-    def register_callback(self, callback):
-        """Регистрация функции обратного вызова для обновления UI"""
-        if callback not in self.callbacks:
-            self.callbacks.append(callback)
+    def register_callback(self, callback, stream=False):
+        """
+        Регистрация функции обратного вызова для обновления UI.
+
+        По умолчанию callback получает только последний снимок; stream=True
+        доставляет каждый снимок через ограниченную очередь (для записи).
+        """
+        self.bus.subscribe(PERFORMANCE_TOPIC, callback, stream=stream)
 
     def unregister_callback(self, callback):
         """Отмена регистрации функции обратного вызова"""
-        if callback in self.callbacks:
-            self.callbacks.remove(callback)
+        self.bus.unsubscribe(PERFORMANCE_TOPIC, callback)
@@ -0,0 +1,128 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import Future
+from modules.config.settings import SYSTEM_INFO_SETTINGS
+
+# Опрос не уложился в отведенное время
+PROBE_TIMEOUT = "timeout"
+# Опрос завершился исключением
+PROBE_ERROR = "error"
+
+
+class ProbeResult:
+    """Результат одного опроса системы"""
+
+    __slots__ = ("name", "value", "status", "error", "elapsed")
+
+    def __init__(self, name, value=None, status="ok", error=None, elapsed=0.0):
+        self.name = name
+        self.value = value
+        self.status = status
+        self.error = error
+        self.elapsed = elapsed
+
+    @property
+    def ok(self):
+        return self.status == "ok"
+
+
+class ProbeRunner:
+    """
+    Параллельный запуск опросов системы с предельным временем ожидания.
+
+    Каждый опрос выполняется в своем фоновом потоке и ждется не дольше
+    своего предела, поэтому общее время загрузки ограничено самым долгим
+    пределом, а не суммой времени всех опросов. Поток зависшего опроса
+    прервать нельзя: он продолжает работать, а при повторном запуске того
+    же опроса ожидается его текущий вызов вместо нового. Так для каждого
+    опроса работает не больше одного потока, а потоки-демоны не мешают
+    завершению приложения.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.running = {}
+
+    async def run(self, probes, on_result, timeouts=None):
+        """
+        Запускает опросы одновременно и сообщает о каждом по завершении.
+
+        Аргументы:
+            probes (dict): Название опроса -> функция без аргументов
+            on_result (callable): Вызывается в цикле событий с ProbeResult
+                каждого опроса сразу после его завершения или истечения
+                предела
+            timeouts (dict, optional): Название опроса -> предел, секунды
+
+        Возвращает:
+            dict: Название опроса -> ProbeResult
+        """
+        timeouts = timeouts or SYSTEM_INFO_SETTINGS["probe_timeouts"]
+        results = await asyncio.gather(
+            *(
+                self._run_probe(name, probe, timeouts.get(name, 1.0), on_result)
+                for name, probe in probes.items()
+            )
+        )
+        return {result.name: result for result in results}
+
+    async def _run_probe(self, name, probe, timeout, on_result):
+        future = self._submit(name, probe)
+
+        started = time.perf_counter()
+        try:
+            # shield: истечение предела не отменяет ожидание самого вызова
+            value = await asyncio.wait_for(
+                asyncio.shield(asyncio.wrap_future(future)), timeout
+            )
+            result = ProbeResult(name, value, elapsed=time.perf_counter() - started)
+        except asyncio.TimeoutError:
+            result = ProbeResult(name, status=PROBE_TIMEOUT, elapsed=timeout)
+        except Exception as e:
+            result = ProbeResult(
+                name,
+                status=PROBE_ERROR,
+                error=e,
+                elapsed=time.perf_counter() - started,
+            )
+
+        try:
+            on_result(result)
+        except Exception as e:
+            print(f"Ошибка при обработке результата опроса {name}: {e}")
+        return result
+
+    def _submit(self, name, probe):
+        with self.lock:
+            future = self.running.get(name)
+            if future is not None and not future.done():
+                # Предыдущий вызов этого опроса еще не завершился
+                return future
+            future = Future()
+            self.running[name] = future
+
+        def target():
+            try:
+                future.set_result(probe())
+            except BaseException as e:
+                future.set_exception(e)
+
+        threading.Thread(target=target, name=f"probe-{name}", daemon=True).start()
+        return future
+
+    def pending(self):
+        """Названия опросов, вызовы которых еще не завершились"""
+        with self.lock:
+            return [name for name, f in self.running.items() if not f.done()]
+
+
+_probe_runner = None
+
+
+def get_probe_runner():
+    """Возвращает общий запускатель опросов системы"""
+    global _probe_runner
+    if _probe_runner is None:
+        _probe_runner = ProbeRunner()
+    return _probe_runner
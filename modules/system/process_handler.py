@@ -2,11 +2,17 @@ import psutil
 import platform
 import os
 from modules.utils.logger import get_logger
-from modules.database.db_service import get_db_service
 
-# Инициализация логгера и сервиса БД
+# Инициализация логгера
 logger = get_logger()
-db_service = get_db_service()
+
+
+def _save_terminated_process(process_info, terminated_by="user"):
+    """Сохраняет завершенный процесс в базу данных"""
+    # База данных открывается при первом завершении процесса, а не при импорте
+    from modules.database.db_service import get_db_service
+
+    get_db_service().add_terminated_process(process_info, terminated_by)
 
 
 class SystemInfo:
@@ -26,7 +32,7 @@ class SystemInfo:
                 "memory_total": psutil.virtual_memory().total,
                 "memory_available": psutil.virtual_memory().available,
             }
-            logger.debug(f"Информация о системе: {info}")
+            logger.debug("Информация о системе: %s", info)
             return info
         except Exception as e:
             logger.exception(e, "Ошибка при получении информации о системе:")
@@ -112,7 +118,7 @@ class ProcessHandler:
 
             # Сохраняем информацию о завершенном процессе в базу данных
             if process_info:
-                db_service.add_terminated_process(process_info)
+                _save_terminated_process(process_info)
 
             return True
         except psutil.NoSuchProcess:
@@ -139,7 +145,7 @@ class ProcessHandler:
 
                 # Сохраняем информацию о завершенном процессе в базу данных
                 if process_info:
-                    db_service.add_terminated_process(process_info, "system (elevated)")
+                    _save_terminated_process(process_info, "system (elevated)")
 
                 return True
             except Exception as e:
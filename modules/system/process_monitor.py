@@ -1,17 +1,46 @@
 import psutil
-import time
 import threading
-import queue
+from modules.utils.event_bus import EventBus
+from modules.utils.logger import get_logger
+from modules.system.anomaly_detector import ANOMALY_LEVEL, VectorEwmaDetector
+from modules.config.settings import ANOMALY_SETTINGS, MONITORING_SETTINGS
+
+# Инициализация логгера
+logger = get_logger()
+
+# Тема шины событий со списком процессов
+PROCESSES_TOPIC = "processes"
 
 
 class ProcessMonitor:
     def __init__(self):
         self.processes = []
         self.running = False
+        # Событие остановки прерывает ожидание между замерами
+        self.stop_event = threading.Event()
+        # MonitorRuntime, если замеры выполняются в цикле asyncio
+        self.runtime = None
         self.update_interval = 2  # секунды
         self.lock = threading.Lock()
-        self.callbacks = []
-        self.callback_queue = queue.Queue()
+        # Время сохранения списка процессов, восстановленного при запуске
+        # (None после первого замера)
+        self.stale_since = None
+        # Снимки передаются подписчикам через ограниченную шину событий
+        self.bus = EventBus(MONITORING_SETTINGS["stream_queue_size"])
+
+        # Векторизованный детектор всплесков CPU по всем процессам
+        self.cpu_anomaly_detector = (
+            VectorEwmaDetector(
+                "CPU процесса, %",
+                alpha=ANOMALY_SETTINGS["process_alpha"],
+                threshold=ANOMALY_SETTINGS["threshold"],
+                min_delta=ANOMALY_SETTINGS["process_cpu_min_delta"],
+                warmup=ANOMALY_SETTINGS["warmup"] // 2,
+                cooldown=ANOMALY_SETTINGS["cooldown"],
+            )
+            if ANOMALY_SETTINGS["enabled"]
+            else None
+        )
 
     def start_monitoring(self):
         """Запуск мониторинга процессов"""
@@ -19,6 +48,12 @@ class ProcessMonitor:
             return
 
         self.running = True
+        self.stop_event.clear()
+        if self.runtime:
+            # Замеры выполняются задачей asyncio через общий пул потоков
+            self.runtime.start_collector(self)
+            return
+
         self.monitor_thread = threading.Thread(target=self._monitor_processes)
         self.monitor_thread.daemon = True
         self.monitor_thread.start()
@@ -26,6 +61,9 @@ class ProcessMonitor:
     def stop_monitoring(self):
         """Остановка мониторинга процессов"""
         self.running = False
+        self.stop_event.set()
+        if self.runtime:
+            self.runtime.stop_collector(self)
         if hasattr(self, "monitor_thread"):
             self.monitor_thread.join(timeout=1)
 
@@ -33,29 +71,32 @@ class ProcessMonitor:
         """Фоновый мониторинг процессов"""
         while self.running:
             try:
-                new_processes = self._get_processes()
-                with self.lock:
-                    self.processes = new_processes
-
-                # Вместо прямого вызова callback, помещаем данные в очередь
-                # для последующей обработки в основном потоке
-                for callback in self.callbacks:
-                    self.callback_queue.put((callback, self.processes.copy()))
-
-                time.sleep(self.update_interval)
+                self.sample()
+                self.stop_event.wait(self.update_interval)
             except Exception as e:
                 print(f"Ошибка при мониторинге процессов: {e}")
-                time.sleep(1)
+                self.stop_event.wait(1)
+
+    def sample(self):
+        """
+        Выполняет один замер и публикует его подписчикам.
+
+        Метод блокирующий, поэтому вызывается из потока мониторинга или
+        из пула потоков MonitorRuntime.
+        """
+        new_processes = self._get_processes()
+        with self.lock:
+            self.processes = new_processes
+            self.stale_since = None
+
+        # Вместо прямого вызова callback, публикуем снимок в шину
+        # для последующей обработки в основном потоке
+        self.bus.publish(PROCESSES_TOPIC, new_processes.copy())
+        return new_processes
 
     def process_callbacks(self):
         """Обработка обратных вызовов в основном потоке"""
-        try:
-            while not self.callback_queue.empty():
-                callback, processes = self.callback_queue.get_nowait()
-                callback(processes)
-                self.callback_queue.task_done()
-        except Exception as e:
-            print(f"Ошибка при обработке callback: {e}")
+        self.bus.dispatch()
 
     def _get_processes(self):
         """Получение списка процессов"""
@@ -87,11 +128,14 @@ class ProcessMonitor:
                 ):
                     pass
 
+            self._detect_anomalies(all_processes)
+
             # Сортируем по использованию памяти (от большего к меньшему)
             all_processes.sort(key=lambda x: x[2], reverse=True)
 
-            # Берем только первые 50 процессов
-            top_processes = all_processes[:50]
+            # Список виртуализирован, поэтому по умолчанию берем все процессы
+            limit = MONITORING_SETTINGS["process_limit"]
+            top_processes = all_processes[:limit] if limit else all_processes
 
             # Форматируем значения для отображения
             for proc in top_processes:
@@ -104,11 +148,61 @@ class ProcessMonitor:
 
         return processes
 
+    def _detect_anomalies(self, all_processes):
+        """Проверяет CPU всех процессов на всплески одним векторным проходом"""
+        if self.cpu_anomaly_detector is None or not all_processes:
+            return
+
+        events = self.cpu_anomaly_detector.update(
+            [int(proc[1]) for proc in all_processes],
+            [proc[3] for proc in all_processes],
+        )
+        if not events:
+            return
+
+        names = {proc[1]: proc[0] for proc in all_processes}
+        for event in events:
+            pid = str(event["key"])
+            logger.log(
+                f"Аномалия (всплеск) CPU процесса {names.get(pid, '?')} "
+                f"(PID: {pid}): {event['value']:.1f}% при базовом уровне "
+                f"{event['mean']:.1f} ± {event['std']:.1f} (z={event['z']:.1f})",
+                ANOMALY_LEVEL,
+            )
+
     def get_processes(self):
         """Получение текущего списка процессов"""
         with self.lock:
             return self.processes.copy()
 
+    def restore_processes(self, processes, saved_at):
+        """
+        Восстанавливает список процессов, сохраненный при прошлом запуске.
+        Список показывается как устаревший до первого замера.
+
+        Аргументы:
+            processes (list): Строки [name, pid, memory, cpu, status]
+            saved_at (float): Время сохранения (Unix time)
+        """
+        with self.lock:
+            if self.processes:
+                # Свежий замер уже выполнен
+                return
+            self.processes = processes
+            self.stale_since = saved_at
+
+    def get_stale_processes(self):
+        """
+        Список процессов из сохраненного состояния.
+
+        Возвращает:
+            tuple или None: (processes, saved_at) или None после первого замера
+        """
+        with self.lock:
+            if self.stale_since is None:
+                return None
+            return self.processes.copy(), self.stale_since
+
     def kill_process(self, pid, process_info=None):
         """
         Завершает процесс с указанным идентификатором (PID).
@@ -140,8 +234,7 @@ class ProcessMonitor:
                     self.processes = new_processes
 
                 # Уведомляем UI об изменениях
-                for callback in self.callbacks:
-                    self.callback_queue.put((callback, self.processes.copy()))
+                self.bus.publish(PROCESSES_TOPIC, self.processes.copy())
 
             return success
         except Exception as e:
@@ -151,12 +244,15 @@ class ProcessMonitor:
             print(traceback.format_exc())
             return False
 
-    def register_callback(self, callback):
-        """Регистрация функции обратного вызова для обновления UI"""
-        if callback not in self.callbacks:
-            self.callbacks.append(callback)
+    def register_callback(self, callback, stream=False):
+        """
+        Регистрация функции обратного вызова для обновления UI.
+
+        По умолчанию callback получает только последний снимок; stream=True
+        доставляет каждый снимок через ограниченную очередь (для записи).
+        """
+        self.bus.subscribe(PROCESSES_TOPIC, callback, stream=stream)
 
     def unregister_callback(self, callback):
         """Отмена регистрации функции обратного вызова"""
-        if callback in self.callbacks:
-            self.callbacks.remove(callback)
+        self.bus.unsubscribe(PROCESSES_TOPIC, callback)
@@ -0,0 +1,272 @@
+import os
+import struct
+import threading
+import time
+import zlib
+from modules.system.snapshot_codec import (
+    encode_performance,
+    decode_performance,
+    encode_process_table,
+    decode_process_table,
+    encode_process_delta,
+    apply_process_delta,
+    index_processes,
+)
+from modules.system.monitor_facade import SourceProcessMonitor, SourcePerformanceMonitor
+from modules.config.settings import RECORDING_SETTINGS, MONITORING_SETTINGS
+from modules.utils.logger import get_logger
+
+# Инициализация логгера
+logger = get_logger()
+
+# Формат файла записи:
+#   заголовок MAGIC
+#   блоки: BLOCK_HEADER (метка, длина сжатых данных, число кадров) + zlib(кадры)
+#   кадр: FRAME_HEADER (тип, время, длина) + данные
+# Каждый блок начинается с полной таблицы процессов, поэтому блоки
+# декодируются независимо, а оборванный последний блок просто отбрасывается.
+MAGIC = b"SMREC\x00\x01\n"
+_BLOCK_HEADER = struct.Struct("<4sII")
+_BLOCK_TAG = b"BLK1"
+_FRAME_HEADER = struct.Struct("<BdI")
+
+FRAME_PERFORMANCE = 1
+FRAME_PROCESSES_FULL = 2
+FRAME_PROCESSES_DELTA = 3
+
+
+class SessionRecorder:
+    """
+    Потоковая запись снимков мониторов в компактный бинарный файл.
+
+    Подключается к мониторам как обычный callback. Кадры накапливаются
+    в памяти и сбрасываются на диск сжатыми блоками по количеству кадров
+    или по времени.
+    """
+
+    def __init__(self, path, block_frames=None, block_seconds=None):
+        self.path = path
+        self.block_frames = block_frames or RECORDING_SETTINGS["block_frames"]
+        self.block_seconds = block_seconds or RECORDING_SETTINGS["block_seconds"]
+        self.lock = threading.Lock()
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        is_new = not os.path.exists(path) or os.path.getsize(path) == 0
+        self._file = open(path, "ab")
+        if is_new:
+            self._file.write(MAGIC)
+            self._file.flush()
+
+        self._frames = []
+        self._block_started = time.monotonic()
+        self._process_index = None
+        self.frames_written = 0
+        self.bytes_written = 0
+
+    def attach(self, process_monitor, performance_monitor):
+        """
+        Подписывает запись на callback-и мониторов. Запись получает каждый
+        снимок (потоковая подписка), а не только последний.
+        """
+        process_monitor.register_callback(self.record_processes, stream=True)
+        performance_monitor.register_callback(self.record_performance, stream=True)
+
+    def detach(self, process_monitor, performance_monitor):
+        """Отписывает запись от мониторов"""
+        process_monitor.unregister_callback(self.record_processes)
+        performance_monitor.unregister_callback(self.record_performance)
+
+    def record_performance(self, performance_data):
+        """Callback для PerformanceMonitor"""
+        self._add_frame(FRAME_PERFORMANCE, encode_performance(performance_data))
+
+    def record_processes(self, processes):
+        """Callback для ProcessMonitor (таблица кодируется разницей с предыдущей)"""
+        with self.lock:
+            if self._process_index is None:
+                kind = FRAME_PROCESSES_FULL
+                data = encode_process_table(processes)
+            else:
+                kind = FRAME_PROCESSES_DELTA
+                data = encode_process_delta(self._process_index, processes)
+            self._process_index = index_processes(processes)
+            # Выбор типа кадра и добавление в блок - под одной блокировкой:
+            # иначе блок, сброшенный между ними, начался бы с разницы
+            self._add_frame_locked(kind, data)
+
+    def _add_frame(self, kind, data):
+        with self.lock:
+            self._add_frame_locked(kind, data)
+
+    def _add_frame_locked(self, kind, data):
+        """Добавляет кадр в текущий блок (под self.lock)"""
+        if self._file is None:
+            return
+        self._frames.append(_FRAME_HEADER.pack(kind, time.time(), len(data)) + data)
+        if (
+            len(self._frames) >= self.block_frames
+            or time.monotonic() - self._block_started >= self.block_seconds
+        ):
+            self._flush_block()
+
+    def _flush_block(self):
+        """Сжимает накопленные кадры и дописывает блок в файл (под self.lock)"""
+        if not self._frames:
+            return
+
+        payload = zlib.compress(b"".join(self._frames), 6)
+        self._file.write(
+            _BLOCK_HEADER.pack(_BLOCK_TAG, len(payload), len(self._frames))
+        )
+        self._file.write(payload)
+        self._file.flush()
+
+        self.frames_written += len(self._frames)
+        self.bytes_written += _BLOCK_HEADER.size + len(payload)
+        self._frames = []
+        self._block_started = time.monotonic()
+        # Следующий блок начнется с полной таблицы процессов
+        self._process_index = None
+
+    def close(self):
+        """Сбрасывает последний блок и закрывает файл"""
+        with self.lock:
+            if self._file is None:
+                return
+            self._flush_block()
+            self._file.close()
+            self._file = None
+        logger.info(
+            f"Запись сеанса завершена: {self.frames_written} кадров, "
+            f"{self.bytes_written / 1024:.1f} КБ"
+        )
+
+
+def read_frames(path):
+    """
+    Последовательно читает кадры из файла записи.
+
+    Возвращает:
+        generator: Кортежи (тип кадра, время, данные)
+    """
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"Файл {path} не является записью сеанса")
+
+        while True:
+            header = f.read(_BLOCK_HEADER.size)
+            if len(header) < _BLOCK_HEADER.size:
+                return
+            tag, length, count = _BLOCK_HEADER.unpack(header)
+            payload = f.read(length)
+            if tag != _BLOCK_TAG or len(payload) < length:
+                # Оборванный блок в конце файла (например, после сбоя)
+                return
+
+            data = zlib.decompress(payload)
+            offset = 0
+            for _ in range(count):
+                kind, timestamp, size = _FRAME_HEADER.unpack_from(data, offset)
+                offset += _FRAME_HEADER.size
+                yield kind, timestamp, data[offset : offset + size]
+                offset += size
+
+
+class ReplaySource:
+    """
+    Воспроизведение записанного сеанса.
+
+    Предоставляет process_monitor и performance_monitor, которые можно
+    передать в ProcessesView и PerformanceView вместо настоящих мониторов.
+
+    Аргументы:
+        path (str): Путь к файлу записи
+        speed (float или None): Множитель скорости (1, 10, ...) или None
+            для воспроизведения с максимальной скоростью. В этом режиме
+            следующий кадр выдается только после того, как интерфейс обработал
+            предыдущий, и по окончании в лог пишется достигнутая частота кадров,
+            что позволяет использовать запись как воспроизводимый тест
+            производительности интерфейса.
+    """
+
+    def __init__(self, path, speed=1.0, history_length=None):
+        self.path = path
+        self.speed = speed
+        self.running = False
+        self.stop_event = threading.Event()
+        self.thread = None
+        self.process_monitor = SourceProcessMonitor(self)
+        self.performance_monitor = SourcePerformanceMonitor(
+            self, history_length or MONITORING_SETTINGS["performance_history_length"]
+        )
+        self.frames_played = 0
+        self.elapsed = 0.0
+
+    def start(self):
+        """Запуск воспроизведения (повторные вызовы игнорируются)"""
+        if self.running:
+            return
+
+        self.running = True
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self._replay, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """Остановка воспроизведения"""
+        self.running = False
+        self.stop_event.set()
+        if self.thread and self.thread is not threading.current_thread():
+            self.thread.join(timeout=1)
+
+    def _replay(self):
+        logger.info(
+            f"Воспроизведение записи {self.path} (скорость: {self.speed or 'max'})"
+        )
+        started = time.perf_counter()
+        previous_timestamp = None
+        process_index = {}
+
+        try:
+            for kind, timestamp, data in read_frames(self.path):
+                if self.stop_event.is_set():
+                    break
+
+                if self.speed and previous_timestamp is not None:
+                    delay = (timestamp - previous_timestamp) / self.speed
+                    if delay > 0 and self.stop_event.wait(delay):
+                        break
+                previous_timestamp = timestamp
+
+                if kind == FRAME_PERFORMANCE:
+                    monitor = self.performance_monitor
+                    monitor.publish_record(decode_performance(data))
+                elif kind == FRAME_PROCESSES_FULL:
+                    monitor = self.process_monitor
+                    rows = decode_process_table(data)
+                    process_index = index_processes(rows)
+                    monitor.publish(rows)
+                elif kind == FRAME_PROCESSES_DELTA:
+                    monitor = self.process_monitor
+                    rows, process_index = apply_process_delta(process_index, data)
+                    monitor.publish(rows)
+                else:
+                    continue
+
+                self.frames_played += 1
+                if not self.speed:
+                    # Ждем, пока интерфейс обработает кадр
+                    while not monitor.bus.wait_idle(0.5):
+                        if self.stop_event.is_set():
+                            break
+        except Exception as e:
+            logger.exception(e, f"Ошибка при воспроизведении записи {self.path}:")
+
+        self.elapsed = time.perf_counter() - started
+        fps = self.frames_played / self.elapsed if self.elapsed > 0 else 0
+        logger.info(
+            f"Воспроизведение завершено: {self.frames_played} кадров "
+            f"за {self.elapsed:.2f} с ({fps:.1f} кадров/с)"
+        )
+        self.running = False
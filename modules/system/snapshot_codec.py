@@ -0,0 +1,258 @@
+import struct
+
+# Фиксированная часть снимка производительности:
+# cpu %, память %, память всего, память занято, чтение, запись, отправка,
+# получение (МБ/с), флаги (биты 0-3 - аномалии графиков, бит 7 - есть
+# структура памяти)
+_PERF = struct.Struct("<ffQQffffB")
+# Структура памяти: 8 объемов в байтах и 4 скорости
+_BREAKDOWN = struct.Struct("<8Q4f")
+_BREAKDOWN_SIZES = (
+    "total",
+    "free",
+    "anon",
+    "file",
+    "dirty",
+    "writeback",
+    "slab",
+    "swap_used",
+)
+_BREAKDOWN_RATES = ("swap_in", "swap_out", "scan", "steal")
+_ANOMALY_CHARTS = ("cpu", "memory", "disk_io", "network")
+_HAS_BREAKDOWN = 0x80
+
+# Строка таблицы процессов: pid, память (МБ), CPU %, длины имени и статуса
+_ROW = struct.Struct("<IffHB")
+_COUNT = struct.Struct("<I")
+
+
+def encode_performance(performance_data):
+    """
+    Кодирует текущие значения снимка PerformanceMonitor в компактный вид.
+
+    История не сохраняется: при декодировании она восстанавливается
+    из последовательности снимков.
+    """
+    anomalies = performance_data.get("anomalies") or {}
+    flags = 0
+    for bit, chart in enumerate(_ANOMALY_CHARTS):
+        history = anomalies.get(chart)
+        if history and history[-1]:
+            flags |= 1 << bit
+
+    breakdown = (performance_data.get("memory_breakdown") or {}).get("current")
+    if breakdown:
+        flags |= _HAS_BREAKDOWN
+
+    memory = performance_data["memory"]
+    read_speed, write_speed = performance_data["disk_io"].get("current", (0, 0))
+    sent_speed, recv_speed = performance_data["network"].get("current", (0, 0))
+    data = _PERF.pack(
+        performance_data["cpu"]["current"],
+        memory["current"],
+        int(memory["total"]),
+        int(memory["used"]),
+        read_speed,
+        write_speed,
+        sent_speed,
+        recv_speed,
+        flags,
+    )
+    if breakdown:
+        data += _BREAKDOWN.pack(
+            *(int(breakdown[key]) for key in _BREAKDOWN_SIZES),
+            *(breakdown[key] for key in _BREAKDOWN_RATES),
+        )
+    return data
+
+
+def decode_performance(data):
+    """
+    Декодирует снимок, записанный encode_performance.
+
+    Возвращает:
+        dict: Текущие значения (cpu, memory, memory_total, memory_used,
+            disk_io, network, memory_breakdown, anomalies)
+    """
+    cpu, memory, total, used, read_speed, write_speed, sent_speed, recv_speed, flags = (
+        _PERF.unpack_from(data)
+    )
+
+    breakdown = None
+    if flags & _HAS_BREAKDOWN:
+        values = _BREAKDOWN.unpack_from(data, _PERF.size)
+        breakdown = dict(zip(_BREAKDOWN_SIZES + _BREAKDOWN_RATES, values))
+
+    return {
+        "cpu": cpu,
+        "memory": memory,
+        "memory_total": total,
+        "memory_used": used,
+        "disk_io": (read_speed, write_speed),
+        "network": (sent_speed, recv_speed),
+        "memory_breakdown": breakdown,
+        "anomalies": {
+            chart: bool(flags & (1 << bit)) for bit, chart in enumerate(_ANOMALY_CHARTS)
+        },
+    }
+
+
+# Ряды истории производительности и число значений в одной точке
+_HISTORY_SERIES = (
+    ("cpu", 1),
+    ("memory", 1),
+    ("disk_io", 2),
+    ("network", 2),
+    ("memory_breakdown", 3),
+)
+
+
+def encode_history(history):
+    """
+    Кодирует кольцевые буферы истории PerformanceMonitor.
+
+    Аргументы:
+        history (dict): Ряд -> список значений (числа или кортежи),
+            "anomalies" -> график -> список флагов аномалий
+    """
+    parts = []
+    for series, width in _HISTORY_SERIES:
+        points = history.get(series) or []
+        values = [
+            float(value)
+            for point in points
+            for value in (point if width > 1 else (point,))
+        ]
+        parts.append(_COUNT.pack(len(points)))
+        parts.append(struct.pack(f"<{len(values)}f", *values))
+
+    anomalies = history.get("anomalies") or {}
+    for chart in _ANOMALY_CHARTS:
+        flags = anomalies.get(chart) or []
+        parts.append(_COUNT.pack(len(flags)))
+        parts.append(bytes(1 if flag else 0 for flag in flags))
+    return b"".join(parts)
+
+
+def decode_history(data, offset=0):
+    """
+    Декодирует историю, записанную encode_history.
+
+    Возвращает:
+        tuple: (history, offset) - история в формате encode_history и
+            смещение конца данных
+    """
+    history = {}
+    for series, width in _HISTORY_SERIES:
+        (count,) = _COUNT.unpack_from(data, offset)
+        offset += _COUNT.size
+        values = struct.unpack_from(f"<{count * width}f", data, offset)
+        offset += 4 * count * width
+        if width == 1:
+            history[series] = list(values)
+        else:
+            history[series] = [
+                tuple(values[i : i + width]) for i in range(0, len(values), width)
+            ]
+
+    history["anomalies"] = {}
+    for chart in _ANOMALY_CHARTS:
+        (count,) = _COUNT.unpack_from(data, offset)
+        offset += _COUNT.size
+        history["anomalies"][chart] = [
+            bool(flag) for flag in data[offset : offset + count]
+        ]
+        offset += count
+    return history, offset
+
+
+def _encode_rows(rows):
+    parts = [_COUNT.pack(len(rows))]
+    for name, pid, memory, cpu, status in rows:
+        name_bytes = str(name).encode("utf-8")[:0xFFFF]
+        status_bytes = str(status).encode("utf-8")[:0xFF]
+        parts.append(
+            _ROW.pack(
+                int(pid), float(memory), float(cpu), len(name_bytes), len(status_bytes)
+            )
+        )
+        parts.append(name_bytes)
+        parts.append(status_bytes)
+    return b"".join(parts)
+
+
+def _decode_rows(data, offset=0):
+    (count,) = _COUNT.unpack_from(data, offset)
+    offset += _COUNT.size
+    rows = []
+    for _ in range(count):
+        pid, memory, cpu, name_len, status_len = _ROW.unpack_from(data, offset)
+        offset += _ROW.size
+        name = data[offset : offset + name_len].decode("utf-8", "replace")
+        offset += name_len
+        status = data[offset : offset + status_len].decode("utf-8", "replace")
+        offset += status_len
+        rows.append([name, str(pid), f"{memory:.1f}", f"{cpu:.1f}", status])
+    return rows, offset
+
+
+def index_processes(rows):
+    """Строит словарь PID -> строка процесса"""
+    return {row[1]: row for row in rows}
+
+
+def encode_process_table(rows):
+    """Кодирует полную таблицу процессов [name, pid, memory, cpu, status]"""
+    return _encode_rows(rows)
+
+
+def decode_process_table(data):
+    """Декодирует полную таблицу процессов"""
+    rows, _ = _decode_rows(data)
+    return rows
+
+
+def encode_process_delta(previous, rows):
+    """
+    Кодирует разницу между предыдущей и новой таблицей процессов.
+
+    Аргументы:
+        previous (dict): PID -> строка процесса из предыдущего снимка
+        rows (list): Новая таблица процессов
+
+    Возвращает:
+        bytes: Измененные/новые строки и список исчезнувших PID
+    """
+    changed = [row for row in rows if previous.get(row[1]) != row]
+    current_pids = {row[1] for row in rows}
+    removed = [int(pid) for pid in previous if pid not in current_pids]
+    return (
+        _encode_rows(changed)
+        + _COUNT.pack(len(removed))
+        + struct.pack(f"<{len(removed)}I", *removed)
+    )
+
+
+def apply_process_delta(previous, data):
+    """
+    Применяет разницу к предыдущему снимку.
+
+    Аргументы:
+        previous (dict): PID -> строка процесса (не изменяется)
+        data (bytes): Результат encode_process_delta
+
+    Возвращает:
+        tuple: (rows, index) - таблица, отсортированная по памяти, и новый индекс
+    """
+    changed, offset = _decode_rows(data)
+    (removed_count,) = _COUNT.unpack_from(data, offset)
+    removed = struct.unpack_from(f"<{removed_count}I", data, offset + _COUNT.size)
+
+    index = dict(previous)
+    for pid in removed:
+        index.pop(str(pid), None)
+    for row in changed:
+        index[row[1]] = row
+
+    rows = sorted(index.values(), key=lambda row: float(row[2]), reverse=True)
+    return rows, index
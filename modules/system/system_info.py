@@ -32,12 +32,27 @@ class SystemInfo:
     @staticmethod
     def get_cpu_info():
         """Получение информации о процессоре"""
+        cpu_info = SystemInfo.get_cpu_model()
+        cpu_info.update(SystemInfo.get_cpu_load())
+        return cpu_info
+
+    @staticmethod
+    def get_cpu_load():
+        """Текущие частота и загрузка процессора (без ожидания замера)"""
+        frequency = psutil.cpu_freq()
+        return {
+            "frequency": frequency.current if frequency else 0,
+            # Загрузка с предыдущего вызова: не блокирует поток на 100 мс
+            "usage": psutil.cpu_percent(interval=None),
+        }
+
+    @staticmethod
+    def get_cpu_model():
+        """Модель процессора и количество ядер и потоков"""
         cpu_info = {
             "name": "Неизвестно",
             "cores": psutil.cpu_count(logical=False),
             "threads": psutil.cpu_count(logical=True),
-            "frequency": psutil.cpu_freq().current if psutil.cpu_freq() else 0,
-            "usage": psutil.cpu_percent(interval=0.1),
         }
 
         # Попытка получить имя процессора
@@ -262,6 +277,19 @@ class SystemInfo:
 
         return {"manufacturer": "Неизвестно", "product": "Неизвестно"}
 
+    @staticmethod
+    def get_static_info():
+        """
+        Сведения, которые не меняются до перезагрузки: ОС, модель
+        процессора, видеокарта и материнская плата
+        """
+        return {
+            "os": SystemInfo.get_os_info(),
+            "cpu": SystemInfo.get_cpu_model(),
+            "gpu": SystemInfo.get_gpu_info(),
+            "motherboard": SystemInfo.get_motherboard_info(),
+        }
+
     @staticmethod
     def get_all_info():
         """Получение всей системной информации"""
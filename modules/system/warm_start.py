@@ -0,0 +1,187 @@
+import os
+import struct
+import threading
+import time
+import zlib
+from modules.system.hardware_cache import get_boot_id
+from modules.system.snapshot_codec import (
+    encode_process_table,
+    decode_process_table,
+    encode_history,
+    decode_history,
+)
+from modules.config.settings import WARM_START_SETTINGS
+from modules.utils.logger import get_logger
+
+# Инициализация логгера
+logger = get_logger()
+
+# Файл состояния по умолчанию
+DEFAULT_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
+    "cache",
+    "monitor_state.bin",
+)
+
+# Формат файла состояния:
+#   MAGIC
+#   HEADER (время сохранения, номер последнего замера, длина boot ID)
+#   boot ID
+#   zlib(длина таблицы процессов + таблица процессов + история)
+MAGIC = b"SMWARM\x00\x01"
+_HEADER = struct.Struct("<dQH")
+_LENGTH = struct.Struct("<I")
+
+
+def encode_state(processes, history, sample_count, saved_at, boot_id):
+    """Кодирует состояние мониторов в компактный бинарный вид"""
+    table = encode_process_table(processes)
+    payload = _LENGTH.pack(len(table)) + table + encode_history(history)
+    boot = boot_id.encode("utf-8")
+    return (
+        MAGIC
+        + _HEADER.pack(saved_at, sample_count, len(boot))
+        + boot
+        + zlib.compress(payload, 6)
+    )
+
+
+def decode_state(data):
+    """
+    Декодирует состояние, записанное encode_state.
+
+    Возвращает:
+        dict: processes, history, sample_count, saved_at, boot_id
+    """
+    if not data.startswith(MAGIC):
+        raise ValueError("Файл не является сохраненным состоянием мониторов")
+    offset = len(MAGIC)
+    saved_at, sample_count, boot_length = _HEADER.unpack_from(data, offset)
+    offset += _HEADER.size
+    boot_id = data[offset : offset + boot_length].decode("utf-8")
+    payload = zlib.decompress(data[offset + boot_length :])
+
+    (table_length,) = _LENGTH.unpack_from(payload)
+    table = payload[_LENGTH.size : _LENGTH.size + table_length]
+    history, _ = decode_history(payload, _LENGTH.size + table_length)
+    return {
+        "processes": decode_process_table(table),
+        "history": history,
+        "sample_count": sample_count,
+        "saved_at": saved_at,
+        "boot_id": boot_id,
+    }
+
+
+class WarmStartStore:
+    """
+    Сохранение последнего снимка мониторов между запусками.
+
+    Список процессов и история производительности сохраняются в компактном
+    бинарном виде периодически в фоновом потоке и при остановке. При
+    запуске сохраненное состояние загружается в мониторы и сразу
+    показывается как устаревшее, а свежие замеры идут в фоне. Список
+    процессов восстанавливается только в пределах той же загрузки
+    системы, история - если она не старше max_age.
+
+    Аргументы:
+        process_monitor (ProcessMonitor): Монитор процессов
+        performance_monitor (PerformanceMonitor): Монитор производительности
+        path (str, optional): Файл состояния
+    """
+
+    def __init__(self, process_monitor, performance_monitor, path=None):
+        self.process_monitor = process_monitor
+        self.performance_monitor = performance_monitor
+        self.path = path or WARM_START_SETTINGS["path"] or DEFAULT_PATH
+        self.save_interval = WARM_START_SETTINGS["save_interval"]
+        self.max_age = WARM_START_SETTINGS["max_age"]
+        self.stop_event = threading.Event()
+        self.thread = None
+        self.lock = threading.Lock()
+
+    def restore(self):
+        """
+        Загружает сохраненное состояние в мониторы.
+
+        Возвращает:
+            bool: True, если состояние восстановлено
+        """
+        started = time.perf_counter()
+        try:
+            with open(self.path, "rb") as f:
+                state = decode_state(f.read())
+        except FileNotFoundError:
+            return False
+        except Exception as e:
+            logger.warning("Не удалось прочитать сохраненное состояние: %s", e)
+            return False
+
+        age = time.time() - state["saved_at"]
+        if age > self.max_age or age < 0:
+            logger.debug("Сохраненное состояние устарело (%.0f с)", age)
+            return False
+
+        # PID после перезагрузки указывают на другие процессы
+        if state["boot_id"] == get_boot_id():
+            self.process_monitor.restore_processes(
+                state["processes"], state["saved_at"]
+            )
+        self.performance_monitor.restore_history(
+            state["history"], state["sample_count"], state["saved_at"]
+        )
+        logger.info(
+            "Восстановлено состояние мониторов от %.0f с назад за %.1f мс",
+            age,
+            (time.perf_counter() - started) * 1000,
+        )
+        return True
+
+    def save(self):
+        """Сохраняет текущее состояние мониторов (атомарная замена файла)"""
+        if (
+            self.process_monitor.get_stale_processes() is not None
+            or self.performance_monitor.get_stale_data() is not None
+        ):
+            # Свежих замеров еще не было: файл уже содержит это состояние
+            return False
+        with self.lock:
+            try:
+                data = encode_state(
+                    self.process_monitor.get_processes(),
+                    self.performance_monitor.export_history(),
+                    self.performance_monitor.sample_count,
+                    time.time(),
+                    get_boot_id(),
+                )
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                temp_path = f"{self.path}.tmp"
+                with open(temp_path, "wb") as f:
+                    f.write(data)
+                os.replace(temp_path, self.path)
+                return True
+            except Exception as e:
+                print(f"Ошибка при сохранении состояния мониторов: {e}")
+                return False
+
+    def start(self):
+        """Запускает периодическое сохранение в фоновом потоке"""
+        if self.thread:
+            return
+        self.stop_event.clear()
+        self.thread = threading.Thread(
+            target=self._save_periodically, name="warm-start-save", daemon=True
+        )
+        self.thread.start()
+
+    def _save_periodically(self):
+        while not self.stop_event.wait(self.save_interval):
+            self.save()
+
+    def stop(self):
+        """Останавливает периодическое сохранение и сохраняет состояние"""
+        self.stop_event.set()
+        if self.thread:
+            self.thread.join(timeout=1)
+            self.thread = None
+        self.save()
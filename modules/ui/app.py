@@ -1,12 +1,20 @@
-import flet as ft
-import threading
 import time
-from modules.config.settings import WINDOW_SETTINGS, MONITORING_SETTINGS
+import flet as ft
+from modules.config.settings import (
+    WINDOW_SETTINGS,
+    MONITORING_SETTINGS,
+    METRICS_SETTINGS,
+    RECORDING_SETTINGS,
+    FLEET_SETTINGS,
+    WARM_START_SETTINGS,
+)
 from modules.ui.views.processes_view import ProcessesView
-from modules.ui.views.system_info_view import SystemInfoView
-from modules.ui.views.performance_view import PerformanceView
+from modules.ui.components.log_console import LogConsole
 from modules.system.process_monitor import ProcessMonitor
 from modules.system.performance_monitor import PerformanceMonitor
+from modules.system.monitor_runtime import MonitorRuntime
+from modules.ui.render_scheduler import init_render_scheduler
+from modules.utils import startup_report
 from modules.utils.logger import get_logger
 
 # Инициализация логгера
@@ -24,27 +32,18 @@ def SystemMonitorApp(page: ft.Page):
     page.padding = 0
     logger.debug("Настройки страницы применены")
     page.update()
+    startup_report.mark("Подключение страницы")
 
-    # Создаем область для логов
-    log_area = ft.TextField(
-        multiline=True,
-        read_only=True,
-        min_lines=10,
-        max_lines=15,
-        value="Логи приложения:\n",
-        text_size=12,
-        expand=True,
-        visible=False,  # По умолчанию скрыта
-    )
+    # Изменения интерфейса отправляются клиенту не чаще заданной частоты
+    render_scheduler = init_render_scheduler(page)
+
+    # Создаем консоль логов (по умолчанию скрыта)
+    log_console = LogConsole()
 
     # Настройка отображения логов в интерфейсе
-    def show_log_in_ui(message):
-        log_area.value += message + "\n"
-        # Ограничиваем количество строк в логе
-        lines = log_area.value.split("\n")
-        if len(lines) > 100:  # Оставляем только последние 100 строк
-            log_area.value = "\n".join(lines[-100:])
-        page.update(log_area)
+    def show_log_in_ui(message, level="INFO", source=""):
+        # Строки накапливаются и добавляются в консоль раз в кадр
+        log_console.append(message, level, source)
 
     # Устанавливаем функцию обратного вызова для логгера
     logger.set_chat_callback(show_log_in_ui)
@@ -55,7 +54,7 @@ def SystemMonitorApp(page: ft.Page):
     process_monitor = ProcessMonitor()
     process_monitor.update_interval = MONITORING_SETTINGS["process_update_interval"]
     logger.debug(
-        f"Интервал обновления процессов: {process_monitor.update_interval} сек"
+        "Интервал обновления процессов: %s сек", process_monitor.update_interval
     )
 
     performance_monitor = PerformanceMonitor(
@@ -65,58 +64,145 @@ def SystemMonitorApp(page: ft.Page):
         "performance_update_interval"
     ]
     logger.debug(
-        f"Интервал обновления производительности: {performance_monitor.update_interval} сек"
+        "Интервал обновления производительности: %s сек",
+        performance_monitor.update_interval,
     )
 
-    # Создаем компоненты
+    # Воспроизведение записанного сеанса вместо живых данных
+    replay_source = None
+    if RECORDING_SETTINGS["replay_path"]:
+        from modules.system.session_recorder import ReplaySource
+
+        replay_source = ReplaySource(
+            RECORDING_SETTINGS["replay_path"],
+            speed=RECORDING_SETTINGS["replay_speed"],
+            history_length=MONITORING_SETTINGS["performance_history_length"],
+        )
+        process_monitor = replay_source.process_monitor
+        performance_monitor = replay_source.performance_monitor
+        logger.info(f"Воспроизведение записи: {RECORDING_SETTINGS['replay_path']}")
+
+    # Сводные данные с нескольких агентов вместо локальных
+    aggregator = None
+    if FLEET_SETTINGS["agents"] and not replay_source:
+        from modules.fleet.aggregator import FleetAggregator
+
+        aggregator = FleetAggregator(
+            FLEET_SETTINGS["agents"],
+            history_length=MONITORING_SETTINGS["performance_history_length"],
+        )
+        process_monitor = aggregator.process_monitor
+        performance_monitor = aggregator.performance_monitor
+        logger.info(f"Агенты: {', '.join(FLEET_SETTINGS['agents'])}")
+
+    # Замеры и доставка данных выполняются в цикле asyncio Flet:
+    # интерфейс обновляется только при поступлении новых данных
+    runtime = MonitorRuntime(page.loop)
+    runtime.attach(process_monitor)
+    runtime.attach(performance_monitor)
+
+    # Запись сеанса (мониторы должны работать постоянно)
+    recorder = None
+    if RECORDING_SETTINGS["record_path"] and not (replay_source or aggregator):
+        from modules.system.session_recorder import SessionRecorder
+
+        recorder = SessionRecorder(RECORDING_SETTINGS["record_path"])
+        recorder.attach(process_monitor, performance_monitor)
+        process_monitor.start_monitoring()
+        performance_monitor.start_monitoring()
+        logger.info(f"Запись сеанса в файл: {RECORDING_SETTINGS['record_path']}")
+
+    # Экспорт метрик для Prometheus (мониторы должны работать постоянно)
+    metrics_server = None
+    if METRICS_SETTINGS["enabled"]:
+        from modules.monitoring.metrics_server import start_metrics_export
+
+        try:
+            metrics_server = start_metrics_export(process_monitor, performance_monitor)
+            process_monitor.start_monitoring()
+            performance_monitor.start_monitoring()
+        except OSError as e:
+            logger.exception(e, "Не удалось запустить экспорт метрик:")
+
+    # Последний снимок и история с прошлого запуска показываются сразу,
+    # пока идут первые замеры
+    warm_start = None
+    if WARM_START_SETTINGS["enabled"] and not (replay_source or aggregator):
+        from modules.system.warm_start import WarmStartStore
+
+        warm_start = WarmStartStore(process_monitor, performance_monitor)
+        warm_start.restore()
+        warm_start.start()
+        # История графиков копится с запуска, а не с первого открытия вкладки
+        performance_monitor.start_monitoring()
+
+    # Создаем компоненты: вкладки, кроме первой, создаются (и их модули
+    # импортируются) при первом переходе на них
     logger.info("Создание компонентов интерфейса")
-    processes_view = ProcessesView(process_monitor)
-    system_info_view = SystemInfoView()
-    performance_view = PerformanceView(performance_monitor)
+
+    def create_system_info_view():
+        from modules.ui.views.system_info_view import SystemInfoView
+
+        return SystemInfoView()
+
+    def create_performance_view():
+        from modules.ui.views.performance_view import PerformanceView
+
+        return PerformanceView(performance_monitor)
+
+    view_factories = [
+        lambda: ProcessesView(process_monitor),
+        create_system_info_view,
+        create_performance_view,
+    ]
+    views = {}
+
+    def get_view(index):
+        """Возвращает представление вкладки, создавая его при первом обращении"""
+        if index not in views:
+            started = time.perf_counter()
+            views[index] = view_factories[index]()
+            logger.debug(
+                "Вкладка %d создана за %.1f мс",
+                index,
+                (time.perf_counter() - started) * 1000,
+            )
+        return views[index]
 
     # Контейнер для содержимого вкладок
-    tabs_content = ft.Container(
-        content=processes_view,
+    # Смена вкладки анимируется на стороне клиента, без потока анимации
+    tabs_content = ft.AnimatedSwitcher(
+        content=get_view(0),
+        transition=ft.AnimatedSwitcherTransition.FADE,
+        duration=300,
+        reverse_duration=100,
         expand=True,
-        animate_opacity=300,
     )
 
     def handle_tab_change(e):
         logger.info(f"Переключение на вкладку: {e.control.selected_index}")
         if e.control.selected_index == 0:
-            tabs_content.content = processes_view
+            tabs_content.content = get_view(0)
             logger.debug("Активирована вкладка 'Процессы'")
         elif e.control.selected_index == 1:
-            tabs_content.content = system_info_view
+            tabs_content.content = get_view(1)
             logger.debug("Активирована вкладка 'О системе'")
         else:
-            tabs_content.content = performance_view
+            tabs_content.content = get_view(2)
             logger.debug("Активирована вкладка 'Графики'")
 
-        # Анимация смены вкладки
-        tabs_content.opacity = 0
         tabs_content.update()
 
-        # Плавное изменение прозрачности
-        def animate_opacity():
-            try:
-                for i in range(11):
-                    tabs_content.opacity = i / 10
-                    tabs_content.update()
-                    page.update()
-                    time.sleep(0.02)
-                logger.debug("Анимация смены вкладки завершена")
-            except Exception as e:
-                logger.exception(e, "Ошибка при анимации смены вкладки:")
-
-        # Запускаем анимацию в отдельном потоке
-        threading.Thread(target=animate_opacity, daemon=True).start()
+    async def toggle_logs(e):
+        # Асинхронный обработчик: консоль меняется только в цикле событий
+        log_console.show(not log_console.visible)
+        logger.debug("Видимость логов изменена: %s", log_console.visible)
 
     # Кнопка для отображения/скрытия логов
     toggle_logs_button = ft.IconButton(
         icon=ft.icons.ARTICLE_OUTLINED,
         tooltip="Показать/скрыть логи",
-        on_click=lambda e: toggle_logs(),
+        on_click=toggle_logs,
     )
 
     # Кнопка для переключения темы
@@ -138,23 +224,6 @@ def SystemMonitorApp(page: ft.Page):
             logger.info("Включена светлая тема")
         page.update()
 
-    def toggle_logs():
-        log_area.visible = not log_area.visible
-
-        # Если логи становятся видимыми, увеличиваем их размер
-        if log_area.visible:
-            log_area.min_lines = 10
-            log_area.max_lines = 15
-            log_area.height = 250  # Устанавливаем фиксированную высоту в пикселях
-        else:
-            # Если скрываем, можно уменьшить размер для экономии ресурсов
-            log_area.min_lines = 5
-            log_area.max_lines = 5
-            log_area.height = None
-
-        logger.debug(f"Видимость логов изменена: {log_area.visible}")
-        page.update(log_area)
-
     # Создание навигации
     tabs = ft.Tabs(
         selected_index=0,
@@ -181,52 +250,37 @@ def SystemMonitorApp(page: ft.Page):
                     bgcolor=ft.colors.SURFACE_VARIANT,
                 ),
                 tabs_content,
-                log_area,  # Добавляем область для логов
+                log_console,  # Добавляем консоль логов
             ],
             expand=True,
         )
     )
     logger.info("Элементы добавлены на страницу")
+    startup_age = startup_report.report()
+    if startup_age is not None:
+        logger.info(f"Первый кадр интерфейса через {startup_age * 1000:.0f} мс")
 
-    # Функция для обработки обратных вызовов от мониторов
-    def process_callbacks():
-        try:
-            process_monitor.process_callbacks()
-            performance_monitor.process_callbacks()
-            page.update()
-        except Exception as e:
-            logger.exception(e, "Ошибка при обработке обратных вызовов:")
-
-    # Флаг для управления работой таймера
-    timer_running = True
-
-    # Функция таймера с более коротким интервалом для более плавного обновления
-    def timer_thread():
-        logger.info("Запуск таймера обновления")
-        while timer_running:
-            try:
-                # Вызываем обработку обратных вызовов
-                process_callbacks()
-                time.sleep(0.3)  # Уменьшаем интервал для более плавного обновления
-            except Exception as e:
-                logger.exception(e, "Ошибка в таймере:")
-                time.sleep(1)  # Пауза при ошибке
-        logger.info("Таймер обновления остановлен")
-
-    # Запускаем таймер в отдельном потоке ПОСЛЕ добавления элементов на страницу
-    timer_thread = threading.Thread(target=timer_thread, daemon=True)
-    timer_thread.start()
-    logger.debug("Таймер обновления запущен")
-
-    # Функция для остановки таймера при закрытии приложения
+    # Функция для остановки мониторов при закрытии приложения
     def on_close():
         logger.info("Закрытие приложения")
-        nonlocal timer_running
-        timer_running = False
         # Останавливаем мониторы
         process_monitor.stop_monitoring()
         performance_monitor.stop_monitoring()
+        runtime.stop()
         logger.info("Мониторы остановлены")
+        if warm_start:
+            warm_start.stop()
+        stats = render_scheduler.stats()
+        logger.info(
+            f"Отрисовка: {stats['flushes']} обновлений, в среднем "
+            f"{stats['avg_controls']:.1f} элементов за {stats['avg_flush_ms']:.1f} мс"
+        )
+        if metrics_server:
+            metrics_server.stop()
+        if recorder:
+            recorder.close()
+        if aggregator:
+            aggregator.stop()
 
     # Регистрируем обработчик закрытия
     page.on_close = on_close
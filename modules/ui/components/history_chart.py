@@ -0,0 +1,189 @@
+import math
+from collections import deque
+import flet as ft
+
+# Цвет, которым отмечаются точки с обнаруженными аномалиями
+ANOMALY_COLOR = ft.colors.PINK_ACCENT_400
+
+
+def _nice_ceiling(value):
+    """Округляет верхнюю границу шкалы вверх до 1, 2 или 5 * 10^n"""
+    if value <= 0:
+        return 1
+    magnitude = 10 ** math.floor(math.log10(value))
+    for step in (1, 2, 5, 10):
+        if value <= step * magnitude:
+            return step * magnitude
+    return 10 * magnitude
+
+
+class HistoryChart(ft.LineChart):
+    """
+    Линейный график скользящей истории, обновляемый на месте.
+
+    Точки графика создаются один раз: на каждом такте в конец каждого ряда
+    добавляется новая точка, а самая старая удаляется, поэтому клиенту
+    отправляются только эти две точки. Шкала Y меняется только когда
+    меняется максимум окна (максимум ведется монотонной очередью за O(1)).
+
+    Аргументы:
+        colors (list): Цвета рядов
+        labels (list): Подписи рядов для всплывающих подсказок
+        capacity (int): Количество точек в окне
+        height (int): Высота графика
+        unit (str): Единица измерения для подсказок
+        max_y (float, optional): Фиксированная верхняя граница шкалы
+            (None - подбирается по данным)
+        stacked (bool): Ряды складываются друг с другом (график с накоплением)
+    """
+
+    def __init__(
+        self,
+        colors,
+        labels,
+        capacity,
+        height,
+        unit="%",
+        max_y=None,
+        stacked=False,
+    ):
+        self.series = [
+            ft.LineChartData(
+                data_points=[],
+                color=color,
+                stroke_width=2,
+                # Для графика с накоплением область под линией заливается
+                below_line_bgcolor=(
+                    ft.colors.with_opacity(0.5, color) if stacked else None
+                ),
+            )
+            for color in colors
+        ]
+        # Верхний слой накопления рисуется первым, чтобы нижние слои
+        # закрашивали его область
+        data_series = list(reversed(self.series)) if stacked else list(self.series)
+        super().__init__(
+            data_series=data_series,
+            min_y=0,
+            max_y=max_y or 1,
+            min_x=0,
+            max_x=capacity - 1,
+            height=height,
+            left_axis=ft.ChartAxis(labels_size=40),
+            bottom_axis=ft.ChartAxis(show_labels=False),
+            horizontal_grid_lines=ft.ChartGridLines(
+                color=ft.colors.with_opacity(0.2, ft.colors.ON_SURFACE), width=1
+            ),
+            tooltip_bgcolor=ft.colors.with_opacity(0.8, ft.colors.SURFACE_VARIANT),
+        )
+        self.labels = labels
+        self.capacity = capacity
+        self.unit = unit
+        self.fixed_max_y = max_y
+        self.stacked = stacked
+        # Номер следующей точки по оси X
+        self.next_x = 0
+        # Номер последнего показанного замера монитора
+        self.last_sample = None
+        # Монотонная очередь (x, значение) для максимума окна
+        self._max_window = deque()
+
+    def sync(self, sample, history, anomalies=None):
+        """
+        Приводит график в соответствие с историей монитора.
+
+        Если с прошлого вызова пришло несколько замеров (часть снимков
+        была пропущена шиной), добавляются только недостающие точки; при
+        первом вызове или слишком большом разрыве график строится заново.
+
+        Аргументы:
+            sample (int): Номер последнего замера
+            history (list): История значений (числа или кортежи по рядам)
+            anomalies (list, optional): Флаги аномалий для точек истории
+
+        Возвращает:
+            bool: True, если график изменился
+        """
+        if not history:
+            return False
+
+        if sample is None or self.last_sample is None:
+            # Номер замера неизвестен: строим график заново
+            new_points = self.capacity
+        else:
+            new_points = min(sample - self.last_sample, len(history))
+        self.last_sample = sample
+        if new_points <= 0:
+            return False
+
+        flags = list(anomalies or [])[-len(history) :]
+        flags = [False] * (len(history) - len(flags)) + flags
+
+        if new_points >= self.capacity or self.next_x == 0:
+            self.reset()
+            new_points = min(len(history), self.capacity)
+
+        for values, flag in zip(history[-new_points:], flags[-new_points:]):
+            self.push(values, flag)
+        return True
+
+    def reset(self):
+        """Удаляет все точки"""
+        for series in self.series:
+            series.data_points = []
+        self._max_window.clear()
+        self.next_x = 0
+
+    def push(self, values, anomaly=False):
+        """
+        Добавляет точку в конец окна и удаляет самую старую.
+
+        Аргументы:
+            values (float или tuple): Значение или значения по рядам
+            anomaly (bool): Отметить точку как аномальную
+        """
+        if not isinstance(values, (tuple, list)):
+            values = (values,)
+
+        x = self.next_x
+        self.next_x += 1
+        marker = (
+            ft.ChartCirclePoint(radius=4, color=ANOMALY_COLOR, stroke_width=0)
+            if anomaly
+            else False
+        )
+        suffix = " (аномалия)" if anomaly else ""
+
+        total = 0
+        for series, label, value in zip(self.series, self.labels, values):
+            total = total + value if self.stacked else value
+            series.data_points.append(
+                ft.LineChartDataPoint(
+                    x,
+                    total,
+                    tooltip=f"{label}: {value:.1f} {self.unit}{suffix}",
+                    point=marker,
+                )
+            )
+            if len(series.data_points) > self.capacity:
+                series.data_points.pop(0)
+
+        # Окно по X сдвигается вместе с точками
+        self.min_x = max(0, x - self.capacity + 1)
+        self.max_x = max(x, self.capacity - 1)
+        self._rescale(x, total if self.stacked else max(values))
+
+    def _rescale(self, x, value):
+        if self.fixed_max_y is not None:
+            return
+
+        window = self._max_window
+        while window and window[-1][1] <= value:
+            window.pop()
+        window.append((x, value))
+        while window[0][0] <= x - self.capacity:
+            window.popleft()
+
+        max_y = _nice_ceiling(max(window[0][1], 0.1) * 1.1)
+        if self.max_y != max_y:
+            self.max_y = max_y
@@ -0,0 +1,288 @@
+import threading
+from collections import deque
+import flet as ft
+from modules.config.settings import LOG_CONSOLE_SETTINGS, RENDER_SETTINGS
+
+# Уровни, доступные в фильтре консоли
+LEVELS = ["DEBUG", "INFO", "WARNING", "ERROR", "ANOMALY"]
+ALL_LEVELS = "Все уровни"
+
+# Цвета строк по уровню
+_LEVEL_COLORS = {
+    "DEBUG": ft.colors.GREY_600,
+    "WARNING": ft.colors.ORANGE_700,
+    "ERROR": ft.colors.RED_600,
+    "ANOMALY": ft.colors.PINK_ACCENT_400,
+}
+
+
+class LogEntry:
+    """Одна строка консоли (многострочные сообщения делятся на строки)"""
+
+    __slots__ = ("seq", "level", "source", "text")
+
+    def __init__(self, seq, level, source, text):
+        self.seq = seq
+        self.level = level
+        self.source = source
+        self.text = text
+
+
+class LogConsole(ft.Column):
+    """
+    Консоль логов на кольцевом буфере.
+
+    Хранит не более retention последних строк: старые строки вытесняются
+    из буфера за O(1), без разбора и склейки всего текста. Новые строки
+    можно добавлять из любого потока; они накапливаются и переносятся в
+    буфер одной пачкой раз в кадр. Список виртуализирован так же, как
+    список процессов: элементы управления создаются только для видимого
+    окна строк. Фильтры по уровню и источнику применяются к буферу в
+    приложении, без запросов к базе данных.
+
+    Буфер, отфильтрованный список и пул строк меняются только в цикле
+    событий страницы: обработчики событий консоли асинхронные, а show()
+    и set_filters() вызываются из асинхронных обработчиков.
+
+    Аргументы:
+        retention (int, optional): Размер кольцевого буфера, строк
+        height (int, optional): Высота списка, пиксели
+    """
+
+    def __init__(self, retention=None, height=None):
+        super().__init__(spacing=5, visible=False)
+        self.retention = retention or LOG_CONSOLE_SETTINGS["retention"]
+        self.row_height = LOG_CONSOLE_SETTINGS["row_height"]
+        self.overscan = LOG_CONSOLE_SETTINGS["overscan"]
+        self.list_height = height or LOG_CONSOLE_SETTINGS["height"]
+        self.frame_interval = 1 / RENDER_SETTINGS["max_hz"]
+
+        self.entries = deque(maxlen=self.retention)
+        self.view = deque()
+        self.next_seq = 0
+        self.start = 0
+        # Показывать последние строки, пока пользователь не прокрутил вверх
+        self.follow = True
+
+        self.level_filter = None
+        self.source_filter = ""
+
+        # Строки, пришедшие из других потоков и еще не перенесенные в буфер
+        self.lock = threading.Lock()
+        self.pending = deque(maxlen=self.retention)
+        self._flush_scheduled = False
+
+        self.level_dropdown = ft.Dropdown(
+            options=[ft.dropdown.Option(ALL_LEVELS)]
+            + [ft.dropdown.Option(level) for level in LEVELS],
+            value=ALL_LEVELS,
+            width=160,
+            dense=True,
+            on_change=self.handle_level_change,
+        )
+        self.source_field = ft.TextField(
+            hint_text="Источник (файл или функция)",
+            prefix_icon=ft.icons.FILTER_LIST,
+            dense=True,
+            expand=True,
+            on_change=self.handle_source_change,
+        )
+        self.counter = ft.Text("", size=12, color=ft.colors.GREY_600)
+
+        self.top_spacer = ft.Container(height=0)
+        self.bottom_spacer = ft.Container(height=0)
+        self.pool = []
+        size = int(self.list_height // self.row_height) + 1 + 2 * self.overscan
+        for _ in range(size):
+            text = ft.Text("", size=12, no_wrap=True, max_lines=1, selectable=True)
+            self.pool.append(
+                ft.Container(content=text, height=self.row_height, visible=False)
+            )
+        self.list_view = ft.ListView(
+            controls=[self.top_spacer, *self.pool, self.bottom_spacer],
+            spacing=0,
+            height=self.list_height,
+            on_scroll=self.handle_scroll,
+            on_scroll_interval=30,
+        )
+        self.controls = [
+            ft.Row([self.level_dropdown, self.source_field, self.counter]),
+            ft.Container(
+                content=self.list_view,
+                border=ft.border.all(1, ft.colors.OUTLINE),
+                border_radius=5,
+                padding=ft.padding.symmetric(horizontal=10),
+            ),
+        ]
+
+    def append(self, message, level="INFO", source=""):
+        """
+        Добавляет сообщение в консоль (можно вызывать из любого потока).
+        Сообщение появится в списке в ближайшем кадре.
+        """
+        with self.lock:
+            self.pending.append((message, level, source))
+            if self._flush_scheduled:
+                return
+            self._flush_scheduled = True
+
+        page = self.page
+        if page is None or page.loop.is_closed():
+            # Консоль еще не на странице: строки будут перенесены при показе
+            with self.lock:
+                self._flush_scheduled = False
+            return
+        try:
+            page.loop.call_soon_threadsafe(
+                page.loop.call_later, self.frame_interval, self.flush_pending
+            )
+        except RuntimeError:
+            # Цикл был закрыт между проверкой и вызовом
+            pass
+
+    def flush_pending(self):
+        """Переносит накопленные строки в буфер и обновляет видимое окно"""
+        self._take_pending()
+        self.render()
+
+    def _take_pending(self):
+        with self.lock:
+            pending = self.pending
+            self.pending = deque(maxlen=self.retention)
+            self._flush_scheduled = False
+
+        for message, level, source in pending:
+            for line in str(message).split("\n"):
+                entry = LogEntry(self.next_seq, level, source, line)
+                self.next_seq += 1
+                self.entries.append(entry)
+                if self._matches(entry):
+                    self.view.append(entry)
+
+        # Отбрасываем из отфильтрованного списка строки, вытесненные из буфера
+        oldest = self.next_seq - len(self.entries)
+        dropped = 0
+        while self.view and self.view[0].seq < oldest:
+            self.view.popleft()
+            dropped += 1
+        if not self.follow:
+            # Окно остается на тех же строках, хотя начало списка сдвинулось
+            self.start = max(0, self.start - dropped)
+
+    def render(self):
+        """Отправляет изменения видимого окна (скрытая консоль не отрисовывается)"""
+        if not self.visible or not self.page:
+            return
+        changes = self._render_window()
+        if changes:
+            # Строки уже собраны в пачку за кадр, поэтому отправляются сразу,
+            # вместе с прокруткой к концу списка
+            self.page.update(*changes)
+            self._scroll_to_end()
+
+    def _scroll_to_end(self):
+        if self.follow:
+            self.list_view.scroll_to(offset=-1, duration=0)
+
+    def _matches(self, entry):
+        if self.level_filter and entry.level != self.level_filter:
+            return False
+        if self.source_filter and self.source_filter not in entry.source.lower():
+            return False
+        return True
+
+    def _render_window(self):
+        if self.follow:
+            self.start = max(0, len(self.view) - len(self.pool))
+        self.start = max(0, min(self.start, len(self.view) - len(self.pool)))
+
+        changes = []
+        for offset, row in enumerate(self.pool):
+            index = self.start + offset
+            entry = self.view[index] if index < len(self.view) else None
+            changes.extend(self._bind(row, entry))
+
+        top = self.start * self.row_height
+        bottom = max(0, len(self.view) - self.start - len(self.pool)) * self.row_height
+        if self.top_spacer.height != top:
+            self.top_spacer.height = top
+            changes.append(self.top_spacer)
+        if self.bottom_spacer.height != bottom:
+            self.bottom_spacer.height = bottom
+            changes.append(self.bottom_spacer)
+
+        counter = f"{len(self.view)} из {len(self.entries)}"
+        if self.counter.value != counter:
+            self.counter.value = counter
+            changes.append(self.counter)
+        return changes
+
+    def _bind(self, row, entry):
+        if entry is None:
+            if not row.visible:
+                return []
+            row.visible = False
+            row.data = None
+            return [row]
+
+        if row.data == entry.seq and row.visible:
+            return []
+        text = row.content
+        text.value = f"[{entry.level}] [{entry.source}] {entry.text}"
+        text.color = _LEVEL_COLORS.get(entry.level)
+        row.data = entry.seq
+        if not row.visible:
+            row.visible = True
+            return [row]
+        return [text]
+
+    def set_filters(self, level=None, source=""):
+        """
+        Меняет фильтры по уровню и источнику и перестраивает список.
+
+        Аргументы:
+            level (str, optional): Уровень (None - все уровни)
+            source (str): Подстрока источника (без учета регистра)
+        """
+        self.level_filter = level
+        self.source_filter = source.lower()
+        self.view = deque(entry for entry in self.entries if self._matches(entry))
+        self.follow = True
+        self.render()
+
+    def show(self, visible):
+        """Показывает или скрывает консоль"""
+        self.visible = visible
+        if visible:
+            # Пока консоль была скрыта, окно не перерисовывалось
+            self._take_pending()
+            self.follow = True
+            self._render_window()
+        self.update()
+        if visible:
+            self._scroll_to_end()
+
+    async def handle_level_change(self, e):
+        level = e.control.value
+        self.set_filters(None if level == ALL_LEVELS else level, self.source_filter)
+
+    async def handle_source_change(self, e):
+        self.set_filters(self.level_filter, e.control.value or "")
+
+    async def handle_scroll(self, e):
+        """Сдвигает окно строк при прокрутке"""
+        first_visible = int(max(0, e.pixels or 0) // self.row_height)
+        if e.max_scroll_extent is not None:
+            # Прокрутка до конца снова включает слежение за новыми строками
+            self.follow = (e.pixels or 0) >= e.max_scroll_extent - self.row_height
+
+        start = max(
+            0, min(first_visible - self.overscan, len(self.view) - len(self.pool))
+        )
+        if start == self.start:
+            return
+        self.start = start
+        changes = self._render_window()
+        if changes:
+            # Прокрутка - реакция на действие пользователя
+            self.page.update(*changes)
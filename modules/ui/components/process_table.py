@@ -1,5 +1,7 @@
 import flet as ft
 from modules.utils.process_manager import ProcessManager
+from modules.config.settings import TABLE_SETTINGS
+from modules.ui.render_scheduler import schedule_update
 
 # Глобальные переменные для сохранения состояния сортировки
 _sort_column = None
@@ -18,101 +20,318 @@ def sort_processes(processes, column, ascending=True):
         return sorted(processes, key=lambda x: float(x[3]), reverse=not ascending)
     elif column == 4:  # Статус
         return sorted(processes, key=lambda x: x[4], reverse=not ascending)
+    elif column == 5:  # Хост (для данных с нескольких агентов)
+        return sorted(processes, key=lambda x: x[5], reverse=not ascending)
     return processes
 
 
-def kill_process(e, pid):
-    """
-    Обработчик нажатия на кнопку завершения процесса.
+# Заголовки и ширины колонок (None - колонка занимает оставшееся место)
+_COLUMNS = [
+    ("Имя", None),
+    ("PID", 70),
+    ("Память (МБ)", 110),
+    ("CPU %", 70),
+    ("Статус", 100),
+]
+_HOST_COLUMN = ("Хост", 140)
+_ACTIONS_WIDTH = 48
+
+
+def _process_values(process, show_host):
+    """Значения ячеек строки [name, pid, memory, cpu, status(, host)]"""
+    return tuple(process[:6] if show_host else process[:5])
+
+
+def _cell(control, width):
+    if width is None:
+        control.expand = True
+        return control
+    return ft.Container(content=control, width=width)
 
-    Аргументы:
-        e (ControlEvent): Событие нажатия на кнопку
-        pid (str): Идентификатор процесса для завершения
 
-    Действия:
-        1. Получает функцию обратного вызова из свойств кнопки
-        2. Вызывает функцию обратного вызова с передачей PID процесса
-        3. Обработка ошибок и логирование
+class _ProcessRow(ft.Container):
+    """
+    Строка списка процессов. Строки не привязаны к конкретному процессу:
+    при прокрутке одна и та же строка показывает разные процессы.
     """
-    try:
-        # Получаем функцию обратного вызова из свойств кнопки
-        on_kill = e.control.data
-
-        # Вызываем функцию обратного вызова
-        if on_kill:
-            success = on_kill(pid)
-
-            # Не вызываем update() для кнопки, так как она будет обновлена вместе с таблицей
-            # e.control.update()  # Удаляем эту строку, которая вызывает ошибку
-
-            # Если нужно показать результат, можно использовать диалоговое окно или снэкбар
-            if not success:
-                # Здесь можно показать сообщение об ошибке, если нужно
-                pass
-    except Exception as e:
-        import traceback
-
-        print(f"Ошибка при завершении процесса: {str(e)}")
-        print(traceback.format_exc())
-
-
-def ProcessTable(processes, on_kill=None):
-    """Создает таблицу процессов"""
-    global _sort_column, _sort_ascending
-
-    # Создаем таблицу
-    table = ft.DataTable(
-        columns=[
-            ft.DataColumn(ft.Text("Имя"), on_sort=lambda e: handle_sort(e, 0)),
-            ft.DataColumn(ft.Text("PID"), on_sort=lambda e: handle_sort(e, 1)),
-            ft.DataColumn(ft.Text("Память (МБ)"), on_sort=lambda e: handle_sort(e, 2)),
-            ft.DataColumn(ft.Text("CPU %"), on_sort=lambda e: handle_sort(e, 3)),
-            ft.DataColumn(ft.Text("Статус"), on_sort=lambda e: handle_sort(e, 4)),
-            ft.DataColumn(ft.Text("Действия")),
-        ],
-        rows=[],
-        sort_column_index=_sort_column,
-        sort_ascending=_sort_ascending,
-        heading_row_height=35,
-        data_row_min_height=35,
-        data_row_max_height=50,
-        border=ft.border.all(1, ft.colors.OUTLINE),
-        border_radius=10,
-        vertical_lines=ft.border.BorderSide(1, ft.colors.OUTLINE),
-        horizontal_lines=ft.border.BorderSide(1, ft.colors.OUTLINE),
-        column_spacing=10,
-    )
-
-    # Добавляем строки в таблицу
-    for process in processes:
-        name, pid, memory, cpu, status = process
 
+    def __init__(self, columns, on_kill_click, height):
+        self.texts = [ft.Text("", no_wrap=True) for _ in columns]
+        self.values = None
         # Создаем кнопку завершения процесса
-        kill_button = ft.IconButton(
+        self.kill_button = ft.IconButton(
             icon=ft.icons.CLOSE,
             tooltip="Завершить процесс",
             icon_color=ft.colors.RED_400,
-            data=on_kill,  # Сохраняем функцию обратного вызова в свойствах кнопки
-            on_click=lambda e, pid=pid: kill_process(e, pid),
+            icon_size=18,
+            on_click=on_kill_click,
+        )
+        super().__init__(
+            content=ft.Row(
+                [_cell(text, width) for text, (_, width) in zip(self.texts, columns)]
+                + [ft.Container(content=self.kill_button, width=_ACTIONS_WIDTH)],
+                spacing=10,
+            ),
+            height=height,
+            padding=ft.padding.symmetric(horizontal=10),
+            border=ft.border.only(bottom=ft.border.BorderSide(1, ft.colors.OUTLINE)),
         )
 
-        table.rows.append(
-            ft.DataRow(
-                cells=[
-                    ft.DataCell(ft.Text(name)),
-                    ft.DataCell(ft.Text(pid)),
-                    ft.DataCell(ft.Text(memory)),
-                    ft.DataCell(ft.Text(cpu)),
-                    ft.DataCell(ft.Text(status)),
-                    ft.DataCell(kill_button),
+    def bind(self, process, show_host):
+        """
+        Показывает в строке процесс (None - скрыть строку).
+
+        Возвращает:
+            list: Измененные элементы управления
+        """
+        if process is None:
+            if not self.visible:
+                return []
+            self.visible = False
+            self.values = None
+            return [self]
+
+        values = _process_values(process, show_host)
+        if not self.visible:
+            # Скрытая строка обновляется целиком вместе с ячейками
+            self.visible = True
+            for text, value in zip(self.texts, values):
+                text.value = value
+            self.values = values
+            self.kill_button.data = process[1]
+            return [self]
+
+        changes = []
+        # Меняем только изменившиеся ячейки
+        for text, old, new in zip(self.texts, self.values, values):
+            if old != new:
+                text.value = new
+                changes.append(text)
+        self.values = values
+        # PID хранится в свойствах кнопки для общего обработчика
+        self.kill_button.data = process[1]
+        return changes
+
+
+class ProcessTable(ft.Column):
+    """
+    Виртуализированный список процессов.
+
+    Элементы управления создаются только для видимого окна строк и
+    небольшого запаса сверху и снизу; при прокрутке эти же строки
+    получают данные других процессов по индексу. Место остальных строк
+    занимают две пустые вставки, поэтому полоса прокрутки соответствует
+    полному списку, а число элементов управления и объем памяти не
+    зависят от количества процессов.
+
+    Окно, отсортированный список и пул строк меняются только в цикле
+    событий страницы: там же таблица получает новые снимки, поэтому
+    обработчики прокрутки и сортировки асинхронные.
+
+    Аргументы:
+        on_kill (callable, optional): Функция завершения процесса по PID
+        show_host (bool, optional): Показывать колонку с именем хоста
+    """
+
+    def __init__(self, on_kill=None, show_host=False):
+        global _sort_column
+
+        super().__init__(spacing=0, expand=True)
+        self.on_kill = on_kill
+        self.show_host = show_host
+        self.columns = _COLUMNS + ([_HOST_COLUMN] if show_host else [])
+        self.row_height = TABLE_SETTINGS["row_height"]
+        self.overscan = TABLE_SETTINGS["overscan"]
+        self.processes = []
+        self.view = []
+        self.start = 0
+
+        # Сортировка по колонке хоста не имеет смысла без нее
+        if _sort_column == 5 and not show_host:
+            _sort_column = None
+        self.sort_column_index = _sort_column
+        self.sort_ascending = _sort_ascending
+
+        self.header_labels = [
+            ft.Text(title, weight=ft.FontWeight.BOLD, no_wrap=True)
+            for title, _ in self.columns
+        ]
+        header = ft.Container(
+            content=ft.Row(
+                [
+                    _cell(
+                        ft.Container(
+                            content=label,
+                            data=index,
+                            on_click=self.handle_sort,
+                        ),
+                        width,
+                    )
+                    for index, (label, (_, width)) in enumerate(
+                        zip(self.header_labels, self.columns)
+                    )
                 ]
+                + [
+                    ft.Container(
+                        content=ft.Text("", weight=ft.FontWeight.BOLD),
+                        width=_ACTIONS_WIDTH,
+                    )
+                ],
+                spacing=10,
+            ),
+            height=35,
+            padding=ft.padding.symmetric(horizontal=10),
+            border=ft.border.only(bottom=ft.border.BorderSide(2, ft.colors.OUTLINE)),
+        )
+        self._update_header()
+
+        self.top_spacer = ft.Container(height=0)
+        self.bottom_spacer = ft.Container(height=0)
+        self.pool = []
+        self._ensure_pool(TABLE_SETTINGS["height"])
+        self.list_view = ft.ListView(
+            controls=[self.top_spacer, *self.pool, self.bottom_spacer],
+            spacing=0,
+            expand=True,
+            on_scroll=self.handle_scroll,
+            on_scroll_interval=30,
+        )
+        self.controls = [header, self.list_view]
+
+    def _ensure_pool(self, viewport_height):
+        """Создает строки для окна высотой viewport_height с запасом"""
+        size = int(viewport_height // self.row_height) + 1 + 2 * self.overscan
+        added = 0
+        while len(self.pool) < size:
+            row = _ProcessRow(self.columns, self.handle_kill, self.row_height)
+            row.visible = False
+            self.pool.append(row)
+            added += 1
+        return added
+
+    def _update_header(self):
+        for index, label in enumerate(self.header_labels):
+            title = self.columns[index][0]
+            if index == self.sort_column_index:
+                title += " ▲" if self.sort_ascending else " ▼"
+            label.value = title
+
+    def sort_view(self, processes):
+        """
+        Сортирует процессы по текущему столбцу таблицы. Не меняет состояние
+        таблицы, поэтому может вызываться в фоновом потоке.
+
+        Возвращает:
+            tuple: (ключ сортировки, отсортированный список) для set_processes
+        """
+        sort_key = (self.sort_column_index, self.sort_ascending)
+        if self.sort_column_index is not None:
+            processes = sort_processes(
+                processes, self.sort_column_index, self.sort_ascending
             )
+        return sort_key, processes
+
+    def set_processes(self, processes, prepared=None):
+        """
+        Применяет новый снимок процессов к видимому окну.
+
+        Аргументы:
+            processes (list): Снимок процессов
+            prepared (tuple, optional): Результат sort_view для этого снимка;
+                если сортировка с тех пор изменилась, снимок сортируется заново
+
+        Возвращает:
+            list: Измененные элементы управления (пустой - список не изменился)
+        """
+        self.processes = processes
+        if prepared is None or prepared[0] != (
+            self.sort_column_index,
+            self.sort_ascending,
+        ):
+            prepared = self.sort_view(processes)
+        self.view = prepared[1]
+        # Окно не должно выходить за конец укороченного списка
+        self.start = min(self.start, max(0, len(self.view) - len(self.pool)))
+        return self._render_window()
+
+    def _render_window(self):
+        changes = []
+        for offset, row in enumerate(self.pool):
+            index = self.start + offset
+            process = self.view[index] if index < len(self.view) else None
+            changes.extend(row.bind(process, self.show_host))
+
+        top = self.start * self.row_height
+        bottom = max(0, len(self.view) - self.start - len(self.pool)) * self.row_height
+        if self.top_spacer.height != top:
+            self.top_spacer.height = top
+            changes.append(self.top_spacer)
+        if self.bottom_spacer.height != bottom:
+            self.bottom_spacer.height = bottom
+            changes.append(self.bottom_spacer)
+        return changes
+
+    def update_changes(self, changes):
+        """
+        Отправляет клиенту только измененные элементы управления, не
+        обходя все строки списка (через планировщик отрисовки).
+        """
+        if changes and self.page:
+            schedule_update(self.page, *changes)
+
+    async def handle_scroll(self, e):
+        """Сдвигает окно строк при прокрутке"""
+        added = 0
+        if e.viewport_dimension:
+            added = self._ensure_pool(e.viewport_dimension)
+            if added:
+                self.list_view.controls = [
+                    self.top_spacer,
+                    *self.pool,
+                    self.bottom_spacer,
+                ]
+
+        first_visible = int(max(0, e.pixels or 0) // self.row_height)
+        start = max(
+            0, min(first_visible - self.overscan, len(self.view) - len(self.pool))
         )
+        if start == self.start and not added:
+            return
+        self.start = start
+        changes = self._render_window()
+        # Прокрутка - реакция на действие пользователя, поэтому строки
+        # отправляются сразу, без ожидания следующего кадра
+        if added:
+            self.list_view.update()
+        elif changes:
+            self.page.update(*changes)
+
+    def handle_kill(self, e):
+        """
+        Обработчик нажатия на кнопку завершения процесса.
+
+        Один обработчик используется всеми строками: PID берется из свойств
+        нажатой кнопки.
+        """
+        try:
+            if self.on_kill:
+                success = self.on_kill(e.control.data)
+
+                # Если нужно показать результат, можно использовать диалоговое окно или снэкбар
+                if not success:
+                    # Здесь можно показать сообщение об ошибке, если нужно
+                    pass
+        except Exception as e:
+            import traceback
 
-    # Функция для обработки сортировки
-    def handle_sort(e, column_index):
+            print(f"Ошибка при завершении процесса: {str(e)}")
+            print(traceback.format_exc())
+
+    async def handle_sort(self, e):
+        """Обработка нажатия на заголовок колонки"""
         global _sort_column, _sort_ascending
 
+        column_index = e.control.data
         # Если нажали на тот же столбец, меняем направление сортировки
         if _sort_column == column_index:
             _sort_ascending = not _sort_ascending
@@ -121,42 +340,9 @@ def ProcessTable(processes, on_kill=None):
             _sort_ascending = True
 
         # Обновляем состояние сортировки в таблице
-        table.sort_column_index = _sort_column
-        table.sort_ascending = _sort_ascending
-
-        # Сортируем процессы
-        sorted_processes = sort_processes(processes, _sort_column, _sort_ascending)
-
-        # Очищаем таблицу
-        table.rows.clear()
-
-        # Добавляем отсортированные строки
-        for process in sorted_processes:
-            name, pid, memory, cpu, status = process
-
-            # Создаем кнопку завершения процесса
-            kill_button = ft.IconButton(
-                icon=ft.icons.CLOSE,
-                tooltip="Завершить процесс",
-                icon_color=ft.colors.RED_400,
-                data=on_kill,
-                on_click=lambda e, pid=pid: kill_process(e, pid),
-            )
-
-            table.rows.append(
-                ft.DataRow(
-                    cells=[
-                        ft.DataCell(ft.Text(name)),
-                        ft.DataCell(ft.Text(pid)),
-                        ft.DataCell(ft.Text(memory)),
-                        ft.DataCell(ft.Text(cpu)),
-                        ft.DataCell(ft.Text(status)),
-                        ft.DataCell(kill_button),
-                    ]
-                )
-            )
-
-        # Обновляем таблицу
-        table.update()
+        self.sort_column_index = _sort_column
+        self.sort_ascending = _sort_ascending
+        self._update_header()
 
-    return table
+        self.set_processes(self.processes)
+        self.update()
@@ -0,0 +1,175 @@
+import threading
+import time
+from modules.utils.logger import get_logger
+from modules.config.settings import RENDER_SETTINGS
+
+# Инициализация логгера
+logger = get_logger()
+
+
+class RenderScheduler:
+    """
+    Единая точка отправки изменений интерфейса клиенту.
+
+    Представления не вызывают page.update() сами, а помечают измененные
+    элементы управления через mark_dirty(). Помеченные элементы
+    накапливаются и отправляются одним вызовом page.update() не чаще
+    max_hz раз в секунду. Перед отправкой отбрасываются элементы, которых
+    нет на экране (скрытые или удаленные со страницы: их изменения уйдут
+    клиенту вместе с элементом, когда он снова появится), и элементы,
+    предок которых уже помечен.
+
+    Аргументы:
+        page (ft.Page): Страница приложения
+        max_hz (float, optional): Максимальная частота отправки изменений
+    """
+
+    def __init__(self, page, max_hz=None):
+        self.page = page
+        self.loop = page.loop
+        self.interval = 1 / (max_hz or RENDER_SETTINGS["max_hz"])
+        self.lock = threading.Lock()
+        self.dirty = {}
+        self._flush_scheduled = False
+        self._last_flush = 0.0
+
+        # Статистика отправок
+        self.marks = 0
+        self.flushes = 0
+        self.controls_sent = 0
+        self.controls_skipped = 0
+        self.flush_time = 0.0
+        self.max_flush_time = 0.0
+        self._stats_interval = RENDER_SETTINGS["stats_interval"]
+        self._stats_logged = time.monotonic()
+
+    def mark_dirty(self, *controls):
+        """
+        Помечает элементы управления как измененные (можно вызывать из
+        любого потока). Изменения будут отправлены в ближайшем кадре.
+        """
+        with self.lock:
+            for control in controls:
+                self.dirty[id(control)] = control
+            self.marks += len(controls)
+            if self._flush_scheduled or not self.dirty:
+                return
+            self._flush_scheduled = True
+
+        if self.loop.is_closed():
+            return
+        try:
+            self.loop.call_soon_threadsafe(self._schedule_flush)
+        except RuntimeError:
+            # Цикл был закрыт между проверкой и вызовом
+            pass
+
+    def _schedule_flush(self):
+        delay = self._last_flush + self.interval - self.loop.time()
+        self.loop.call_later(max(0.0, delay), self.flush)
+
+    def flush(self):
+        """Отправляет клиенту все накопленные изменения одним обновлением"""
+        with self.lock:
+            dirty = self.dirty
+            self.dirty = {}
+            self._flush_scheduled = False
+        self._last_flush = self.loop.time()
+
+        controls = [
+            control for control in dirty.values() if self._is_renderable(control, dirty)
+        ]
+        self.controls_skipped += len(dirty) - len(controls)
+        if not controls:
+            return
+
+        started = time.perf_counter()
+        try:
+            self.page.update(*controls)
+        except Exception as e:
+            print(f"Ошибка при обновлении интерфейса: {e}")
+            return
+        elapsed = time.perf_counter() - started
+
+        self.flushes += 1
+        self.controls_sent += len(controls)
+        self.flush_time += elapsed
+        self.max_flush_time = max(self.max_flush_time, elapsed)
+        self._log_stats()
+
+    def _is_renderable(self, control, dirty):
+        """
+        Проверяет, что элемент находится на экране и не будет отправлен
+        в составе уже помеченного предка.
+        """
+        uid = control.uid
+        if uid is None or self.page.index.get(uid) is not control:
+            # Элемент еще не добавлен на страницу или уже удален с нее
+            return False
+
+        node = control
+        while node is not None and node is not self.page:
+            if not node.visible:
+                return False
+            if node is not control and id(node) in dirty:
+                return False
+            node = node.parent
+        return True
+
+    def stats(self):
+        """Счетчики отправок: частота, время и размер обновлений"""
+        flushes = self.flushes or 1
+        return {
+            "marks": self.marks,
+            "flushes": self.flushes,
+            "controls_sent": self.controls_sent,
+            "controls_skipped": self.controls_skipped,
+            "avg_controls": self.controls_sent / flushes,
+            "avg_flush_ms": self.flush_time / flushes * 1000,
+            "max_flush_ms": self.max_flush_time * 1000,
+        }
+
+    def _log_stats(self):
+        now = time.monotonic()
+        if now - self._stats_logged < self._stats_interval:
+            return
+        self._stats_logged = now
+        if not logger.is_enabled_for("DEBUG"):
+            return
+        stats = self.stats()
+        logger.debug(
+            f"Отрисовка: {stats['flushes']} обновлений, "
+            f"в среднем {stats['avg_controls']:.1f} элементов за "
+            f"{stats['avg_flush_ms']:.1f} мс (макс. {stats['max_flush_ms']:.1f} мс), "
+            f"объединено пометок: {stats['marks']}, "
+            f"пропущено скрытых и вложенных: {stats['controls_skipped']}"
+        )
+
+
+_scheduler = None
+
+
+def init_render_scheduler(page, max_hz=None):
+    """Создает планировщик отрисовки для страницы приложения"""
+    global _scheduler
+    _scheduler = RenderScheduler(page, max_hz)
+    return _scheduler
+
+
+def get_render_scheduler():
+    """Возвращает планировщик отрисовки (None, если он не создан)"""
+    return _scheduler
+
+
+def schedule_update(page, *controls):
+    """
+    Отправляет изменения элементов через планировщик отрисовки страницы.
+
+    Если планировщик для страницы не создан, элементы обновляются сразу.
+    """
+    if page is None:
+        return
+    if _scheduler is not None and _scheduler.page is page:
+        _scheduler.mark_dirty(*controls)
+    else:
+        page.update(*controls)
@@ -1,62 +1,252 @@
+import asyncio
 import flet as ft
-import datetime
-from modules.database.db_service import get_db_service
+from modules.database.db_service import (
+    get_db_service,
+    HIGHLIGHT_START,
+    HIGHLIGHT_END,
+)
+from modules.config.settings import HISTORY_SETTINGS
 from modules.utils.logger import get_logger
 
-# Инициализация логгера и сервиса БД
+# Инициализация логгера
 logger = get_logger()
-db_service = get_db_service()
+
+
+def _keyset_cursor(rows, cursor):
+    """Курсор следующей страницы - (timestamp, id) последней записи"""
+    return (rows[-1].timestamp, rows[-1].id)
+
+
+def _offset_cursor(rows, cursor):
+    """Курсор следующей страницы результатов поиска - число показанных строк"""
+    return (cursor or 0) + len(rows)
+
+
+def _highlighted_text(snippet):
+    """Текст фрагмента, в котором совпадения выделены цветом"""
+    spans = []
+    for index, part in enumerate(snippet.split(HIGHLIGHT_START)):
+        if index == 0:
+            match, rest = "", part
+        else:
+            match, _, rest = part.partition(HIGHLIGHT_END)
+        if match:
+            spans.append(
+                ft.TextSpan(
+                    match,
+                    ft.TextStyle(
+                        weight=ft.FontWeight.BOLD, bgcolor=ft.colors.YELLOW_200
+                    ),
+                )
+            )
+        if rest:
+            spans.append(ft.TextSpan(rest))
+    return ft.Text(spans=spans, no_wrap=True, selectable=True)
+
+
+def _history_row(values, widths):
+    """Строка списка истории: ячейки фиксированной ширины (None - остаток)"""
+    cells = []
+    for value, width in zip(values, widths):
+        if isinstance(value, ft.Text):
+            text = value
+        else:
+            text = ft.Text(value, no_wrap=True, selectable=True)
+        if width is None:
+            text.expand = True
+            cells.append(text)
+        else:
+            cells.append(ft.Container(content=text, width=width))
+    return ft.Container(
+        content=ft.Row(cells, spacing=10),
+        padding=ft.padding.symmetric(horizontal=10, vertical=6),
+        border=ft.border.only(bottom=ft.border.BorderSide(1, ft.colors.OUTLINE)),
+    )
+
+
+class HistoryList(ft.Column):
+    """
+    Список записей истории с бесконечной прокруткой.
+
+    Записи читаются из базы страницами по курсору (timestamp, id): когда
+    до конца списка остается меньше prefetch_pixels, следующая страница
+    запрашивается в фоновом потоке и дописывается в конец. Каждая
+    страница читается за одно и то же время независимо от того, как
+    далеко пользователь прокрутил историю.
+
+    Аргументы:
+        columns (list): Пары (заголовок, ширина) колонок
+        fetch_page (callable): Функция (cursor, limit) -> список строк
+        format_row (callable): Функция строка -> значения ячеек (строки
+            или ft.Text)
+        next_cursor (callable, optional): Функция (rows, cursor) -> курсор
+            следующей страницы (по умолчанию (timestamp, id) последней строки)
+    """
+
+    def __init__(self, columns, fetch_page, format_row, next_cursor=_keyset_cursor):
+        super().__init__(spacing=0, expand=True)
+        self.fetch_page = fetch_page
+        self.format_row = format_row
+        self.next_cursor = next_cursor
+        self.widths = [width for _, width in columns]
+        self.page_size = HISTORY_SETTINGS["page_size"]
+        self.prefetch_pixels = HISTORY_SETTINGS["prefetch_pixels"]
+
+        self.cursor = None
+        self.exhausted = False
+        self.loading = False
+        # Номер загрузки: страница, запрошенная до сброса, не применяется
+        self.generation = 0
+        self.row_count = 0
+
+        header = _history_row([title for title, _ in columns], self.widths)
+        for cell in header.content.controls:
+            text = cell.content if isinstance(cell, ft.Container) else cell
+            text.weight = ft.FontWeight.BOLD
+        self.status = ft.Text("", size=12, color=ft.colors.GREY_600)
+        self.list_view = ft.ListView(
+            spacing=0,
+            expand=True,
+            on_scroll=self.handle_scroll,
+            on_scroll_interval=100,
+        )
+        self.controls = [header, self.list_view, self.status]
+
+    def did_mount(self):
+        # Первая страница загружается, когда список появляется на странице
+        if not self.row_count:
+            self.load_more()
+
+    def reset(self):
+        """Очищает список и загружает первую страницу"""
+        self.generation += 1
+        self.cursor = None
+        self.exhausted = False
+        self.loading = False
+        self.row_count = 0
+        self.list_view.controls = []
+        self.load_more()
+
+    def load_more(self):
+        """Запрашивает следующую страницу в фоновом потоке"""
+        if self.loading or self.exhausted or not self.page:
+            return
+        self.loading = True
+        self.page.run_task(self._load_page, self.generation, self.cursor)
+
+    async def _load_page(self, generation, cursor):
+        loop = asyncio.get_running_loop()
+        try:
+            rows = await loop.run_in_executor(
+                None, self.fetch_page, cursor, self.page_size
+            )
+        except Exception as e:
+            logger.exception(e, "Ошибка при загрузке истории:")
+            rows = []
+
+        if generation != self.generation:
+            # Пока страница загружалась, список был сброшен
+            return
+
+        self.loading = False
+        self.exhausted = len(rows) < self.page_size
+        if rows:
+            self.cursor = self.next_cursor(rows, cursor)
+            self.list_view.controls.extend(
+                _history_row(self.format_row(row), self.widths) for row in rows
+            )
+            self.row_count += len(rows)
+        self.status.value = f"Загружено записей: {self.row_count}" + (
+            "" if self.exhausted else " (прокрутите вниз, чтобы загрузить еще)"
+        )
+        self.update()
+
+    def handle_scroll(self, e):
+        """Подгружает следующую страницу при приближении к концу списка"""
+        if e.max_scroll_extent is None or e.pixels is None:
+            return
+        if e.max_scroll_extent - e.pixels <= self.prefetch_pixels:
+            self.load_more()
 
 
 class HistoryView(ft.Container):
     def __init__(self):
         super().__init__()
-        self.db_service = db_service
+        self.db_service = get_db_service()
         self.logs_table = None
         self.processes_table = None
         self.current_tab = "logs"  # По умолчанию показываем логи
 
         # Инициализируем содержимое
-        self.content = self.build()
+        self.content = self.create_content()
 
-    def build(self):
+    def create_content(self):
         logger.info("Инициализация представления истории")
+        self.log_level = None
+        self.search_text = ""
 
-        # Создаем таблицу для логов
-        self.logs_table = ft.DataTable(
-            columns=[
-                ft.DataColumn(ft.Text("Время")),
-                ft.DataColumn(ft.Text("Уровень")),
-                ft.DataColumn(ft.Text("Источник")),
-                ft.DataColumn(ft.Text("Сообщение")),
+        # Список логов
+        self.logs_table = HistoryList(
+            [
+                ("Время", 150),
+                ("Уровень", 80),
+                ("Источник", 200),
+                ("Сообщение", None),
+            ],
+            lambda before, limit: self.db_service.get_logs(
+                limit=limit, level=self.log_level, before=before
+            ),
+            lambda log: [
+                log.timestamp.strftime("%Y-%m-%d %H:%M:%S"),
+                log.level,
+                log.source,
+                log.message,
+            ],
+        )
+
+        # Результаты полнотекстового поиска по логам (по релевантности)
+        self.search_table = HistoryList(
+            [
+                ("Время", 150),
+                ("Уровень", 80),
+                ("Источник", 200),
+                ("Фрагмент", None),
+            ],
+            lambda offset, limit: self.db_service.search_logs(
+                self.search_text, limit=limit, level=self.log_level, offset=offset or 0
+            ),
+            lambda log: [
+                log.timestamp.strftime("%Y-%m-%d %H:%M:%S"),
+                log.level,
+                log.source,
+                _highlighted_text(log.snippet),
             ],
-            rows=[],
-            border=ft.border.all(1, ft.colors.OUTLINE),
-            border_radius=10,
-            vertical_lines=ft.border.BorderSide(1, ft.colors.OUTLINE),
-            horizontal_lines=ft.border.BorderSide(1, ft.colors.OUTLINE),
-            sort_column_index=0,
-            sort_ascending=False,
+            next_cursor=_offset_cursor,
         )
 
-        # Создаем таблицу для завершенных процессов
-        self.processes_table = ft.DataTable(
-            columns=[
-                ft.DataColumn(ft.Text("Время")),
-                ft.DataColumn(ft.Text("Имя процесса")),
-                ft.DataColumn(ft.Text("PID")),
-                ft.DataColumn(ft.Text("Память (МБ)")),
-                ft.DataColumn(ft.Text("CPU %")),
-                ft.DataColumn(ft.Text("Статус")),
-                ft.DataColumn(ft.Text("Завершен")),
+        # Список завершенных процессов
+        self.processes_table = HistoryList(
+            [
+                ("Время", 150),
+                ("Имя процесса", None),
+                ("PID", 70),
+                ("Память (МБ)", 100),
+                ("CPU %", 70),
+                ("Статус", 100),
+                ("Завершен", 100),
+            ],
+            lambda before, limit: self.db_service.get_terminated_processes(
+                limit=limit, before=before
+            ),
+            lambda process: [
+                process.timestamp.strftime("%Y-%m-%d %H:%M:%S"),
+                process.process_name,
+                process.pid,
+                f"{process.memory_usage:.2f}",
+                f"{process.cpu_usage:.1f}%",
+                process.status,
+                process.terminated_by,
             ],
-            rows=[],
-            border=ft.border.all(1, ft.colors.OUTLINE),
-            border_radius=10,
-            vertical_lines=ft.border.BorderSide(1, ft.colors.OUTLINE),
-            horizontal_lines=ft.border.BorderSide(1, ft.colors.OUTLINE),
-            sort_column_index=0,
-            sort_ascending=False,
         )
 
         # Создаем фильтры для логов
@@ -68,6 +258,7 @@ class HistoryView(ft.Container):
                 ft.dropdown.Option("WARNING"),
                 ft.dropdown.Option("ERROR"),
                 ft.dropdown.Option("DEBUG"),
+                ft.dropdown.Option("ANOMALY"),
             ],
             value="Все",
             on_change=lambda e: self.load_logs(
@@ -75,6 +266,18 @@ class HistoryView(ft.Container):
             ),
         )
 
+        # Поле полнотекстового поиска по логам
+        self.search_field = ft.TextField(
+            hint_text="Поиск по логам (Enter)",
+            prefix_icon=ft.icons.SEARCH,
+            width=260,
+            on_submit=lambda e: self.search_logs(e.control.value),
+            # Очистка поля возвращает обычный список логов
+            on_change=lambda e: (
+                self.search_logs("") if not e.control.value.strip() else None
+            ),
+        )
+
         # Создаем кнопки для переключения между логами и процессами
         logs_tab = ft.ElevatedButton(
             text="Логи",
@@ -108,16 +311,14 @@ class HistoryView(ft.Container):
         # Создаем контейнер для текущей таблицы
         self.table_container = ft.Container(
             content=(
-                self.logs_table if self.current_tab == "logs" else self.processes_table
+                self.current_logs_table()
+                if self.current_tab == "logs"
+                else self.processes_table
             ),
             padding=10,
             expand=True,
         )
 
-        # Загружаем данные
-        self.load_logs()
-        self.load_processes()
-
         # Возвращаем основной контейнер
         return ft.Column(
             [
@@ -127,6 +328,7 @@ class HistoryView(ft.Container):
                         logs_tab,
                         processes_tab,
                         ft.Container(expand=True),
+                        self.search_field,
                         log_level_dropdown,
                         refresh_button,
                     ],
@@ -137,11 +339,15 @@ class HistoryView(ft.Container):
             expand=True,
         )
 
+    def current_logs_table(self):
+        """Список логов или результатов поиска, если задан запрос"""
+        return self.search_table if self.search_text else self.logs_table
+
     def show_logs(self):
         """Показывает таблицу логов"""
         logger.debug("Переключение на вкладку логов")
         self.current_tab = "logs"
-        self.table_container.content = self.logs_table
+        self.table_container.content = self.current_logs_table()
         self.update()
 
     def show_processes(self):
@@ -155,94 +361,44 @@ class HistoryView(ft.Container):
         """Обновляет данные в текущей таблице"""
         logger.info("Обновление данных истории")
         if self.current_tab == "logs":
-            self.load_logs()
+            self.load_logs(level=self.log_level)
         else:
             self.load_processes()
 
-    def load_logs(self, limit=100, level=None):
+    def load_logs(self, level=None):
         """
-        Загружает логи из базы данных и отображает их в таблице.
+        Загружает первую страницу логов; следующие страницы подгружаются
+        при прокрутке.
 
         Аргументы:
-            limit (int, optional): Максимальное количество загружаемых логов (по умолчанию 100)
             level (str, optional): Уровень логов для фильтрации (если указан)
-
-        Действия:
-            1. Запрашивает логи из базы данных с применением фильтров
-            2. Очищает таблицу логов
-            3. Добавляет строки с логами в таблицу
-            4. Обновляет UI
         """
-        logger.debug(
-            f"Загрузка логов из базы данных (уровень: {level}, лимит: {limit})"
-        )
-        try:
-            logs = self.db_service.get_logs(limit=limit, level=level)
-
-            # Очищаем таблицу
-            self.logs_table.rows.clear()
-
-            # Добавляем строки в таблицу
-            for log in logs:
-                self.logs_table.rows.append(
-                    ft.DataRow(
-                        cells=[
-                            ft.DataCell(
-                                ft.Text(log.timestamp.strftime("%Y-%m-%d %H:%M:%S"))
-                            ),
-                            ft.DataCell(ft.Text(log.level)),
-                            ft.DataCell(ft.Text(log.source)),
-                            ft.DataCell(ft.Text(log.message)),
-                        ]
-                    )
-                )
-
-            # Обновляем таблицу
-            self.update()
-            logger.debug(f"Загружено {len(logs)} логов")
-        except Exception as e:
-            logger.exception(e, "Ошибка при загрузке логов:")
+        logger.debug("Загрузка логов из базы данных (уровень: %s)", level)
+        self.log_level = level
+        self.current_logs_table().reset()
 
-    def load_processes(self, limit=100):
+    def search_logs(self, search_text):
         """
-        Загружает информацию о завершенных процессах из базы данных.
+        Показывает результаты полнотекстового поиска по логам
+        (пустой запрос - обычный список логов).
 
         Аргументы:
-            limit (int, optional): Максимальное количество загружаемых записей (по умолчанию 100)
-
-        Действия:
-            1. Запрашивает информацию о завершенных процессах из базы данных
-            2. Очищает таблицу процессов
-            3. Добавляет строки с информацией о процессах в таблицу
-            4. Обновляет UI
+            search_text (str): Слова для поиска
         """
-        logger.debug(f"Загрузка завершенных процессов из базы данных (лимит: {limit})")
-        try:
-            processes = self.db_service.get_terminated_processes(limit=limit)
-
-            # Очищаем таблицу
-            self.processes_table.rows.clear()
-
-            # Добавляем строки в таблицу
-            for process in processes:
-                self.processes_table.rows.append(
-                    ft.DataRow(
-                        cells=[
-                            ft.DataCell(
-                                ft.Text(process.timestamp.strftime("%Y-%m-%d %H:%M:%S"))
-                            ),
-                            ft.DataCell(ft.Text(process.process_name)),
-                            ft.DataCell(ft.Text(process.pid)),
-                            ft.DataCell(ft.Text(f"{process.memory_usage:.2f}")),
-                            ft.DataCell(ft.Text(f"{process.cpu_usage:.1f}%")),
-                            ft.DataCell(ft.Text(process.status)),
-                            ft.DataCell(ft.Text(process.terminated_by)),
-                        ]
-                    )
-                )
+        search_text = search_text.strip()
+        if search_text == self.search_text:
+            return
+        logger.debug("Поиск по логам: '%s'", search_text)
+        self.search_text = search_text
+        if search_text:
+            self.search_table.reset()
+        if self.current_tab == "logs":
+            self.show_logs()
 
-            # Обновляем таблицу
-            self.update()
-            logger.debug(f"Загружено {len(processes)} завершенных процессов")
-        except Exception as e:
-            logger.exception(e, "Ошибка при загрузке завершенных процессов:")
+    def load_processes(self):
+        """
+        Загружает первую страницу завершенных процессов; следующие
+        страницы подгружаются при прокрутке.
+        """
+        logger.debug("Загрузка завершенных процессов из базы данных")
+        self.processes_table.reset()
@@ -1,5 +1,9 @@
+import datetime
 import flet as ft
 from modules.system.performance_monitor import PerformanceMonitor
+from modules.ui.components.history_chart import HistoryChart
+from modules.ui.render_scheduler import schedule_update
+from modules.config.settings import MONITORING_SETTINGS
 
 
 class PerformanceView(ft.Container):
@@ -7,8 +11,16 @@ class PerformanceView(ft.Container):
         super().__init__()
         self.performance_monitor = performance_monitor
         self.performance_data = None
+        self.anomalies = {}
+        self.sample = None
+        self.changed_controls = []
         self.loading = True
 
+        # Пометка истории, сохраненной при прошлом запуске
+        self.stale_label = ft.Text(
+            "", size=12, color=ft.colors.ORANGE_700, visible=False
+        )
+
         # Создаем индикатор загрузки
         loading_container = ft.Container(
             content=ft.Column(
@@ -28,38 +40,45 @@ class PerformanceView(ft.Container):
             expand=True,
         )
 
-        # Создаем контейнеры для графиков
-        self.cpu_chart_container = ft.Container(
-            content=ft.Text("Загрузка..."),
-            height=200,
-            border_radius=10,
-            padding=10,
-            bgcolor=ft.colors.BLACK12,
+        # Графики создаются один раз и обновляются на месте
+        capacity = MONITORING_SETTINGS["performance_history_length"]
+        self.cpu_chart = HistoryChart(
+            [ft.colors.BLUE], ["ЦП"], capacity, 180, max_y=100
         )
-
-        self.memory_chart_container = ft.Container(
-            content=ft.Text("Загрузка..."),
-            height=200,
-            border_radius=10,
-            padding=10,
-            bgcolor=ft.colors.BLACK12,
+        self.memory_chart = HistoryChart(
+            [ft.colors.GREEN], ["Память"], capacity, 180, max_y=100
         )
-
-        self.disk_chart_container = ft.Container(
-            content=ft.Text("Загрузка..."),
-            height=200,
-            border_radius=10,
-            padding=10,
-            bgcolor=ft.colors.BLACK12,
+        self.memory_breakdown_chart = HistoryChart(
+            [ft.colors.TEAL, ft.colors.AMBER, ft.colors.BROWN],
+            ["Анонимная", "Кэш", "Slab"],
+            capacity,
+            180,
+            max_y=100,
+            stacked=True,
+        )
+        self.disk_chart = HistoryChart(
+            [ft.colors.ORANGE, ft.colors.RED],
+            ["Чтение", "Запись"],
+            capacity,
+            180,
+            unit="МБ/с",
+        )
+        self.network_chart = HistoryChart(
+            [ft.colors.PURPLE, ft.colors.INDIGO],
+            ["Отправка", "Получение"],
+            capacity,
+            180,
+            unit="МБ/с",
         )
 
-        self.network_chart_container = ft.Container(
-            content=ft.Text("Загрузка..."),
-            height=200,
-            border_radius=10,
-            padding=10,
-            bgcolor=ft.colors.BLACK12,
+        # Создаем контейнеры для графиков
+        self.cpu_chart_container = self.create_chart_container(self.cpu_chart)
+        self.memory_chart_container = self.create_chart_container(self.memory_chart)
+        self.memory_breakdown_chart_container = self.create_chart_container(
+            self.memory_breakdown_chart
         )
+        self.disk_chart_container = self.create_chart_container(self.disk_chart)
+        self.network_chart_container = self.create_chart_container(self.network_chart)
 
         # Создаем контейнеры для метрик
         self.cpu_metric = self.create_metric_card(
@@ -71,6 +90,12 @@ class PerformanceView(ft.Container):
             ft.colors.GREEN,
             self.memory_chart_container,
         )
+        self.memory_breakdown_metric = self.create_metric_card(
+            "Структура памяти",
+            "Анонимная / Кэш / Slab",
+            ft.colors.TEAL,
+            self.memory_breakdown_chart_container,
+        )
         self.disk_metric = self.create_metric_card(
             "Активность диска",
             "0 МБ/с чтение, 0 МБ/с запись",
@@ -93,6 +118,7 @@ class PerformanceView(ft.Container):
                     weight=ft.FontWeight.BOLD,
                     text_align=ft.TextAlign.CENTER,
                 ),
+                self.stale_label,
                 ft.Container(height=20),
                 (
                     loading_container
@@ -103,6 +129,8 @@ class PerformanceView(ft.Container):
                             ft.Container(height=20),
                             self.memory_metric,
                             ft.Container(height=20),
+                            self.memory_breakdown_metric,
+                            ft.Container(height=20),
                             self.disk_metric,
                             ft.Container(height=20),
                             self.network_metric,
@@ -120,6 +148,11 @@ class PerformanceView(ft.Container):
     def did_mount(self):
         # Регистрируем callback для обновления UI
         self.performance_monitor.register_callback(self.update_performance)
+        # Пока идет первый замер, показываем историю с прошлого запуска
+        get_stale_data = getattr(self.performance_monitor, "get_stale_data", None)
+        stale_data = get_stale_data() if get_stale_data else None
+        if stale_data and self.loading:
+            self.update_performance(stale_data)
         # Запускаем мониторинг производительности
         self.performance_monitor.start_monitoring()
 
@@ -135,6 +168,10 @@ class PerformanceView(ft.Container):
         # Обновляем данные
         self.performance_data = performance_data
         self.loading = False
+        self.anomalies = performance_data.get("anomalies", {})
+        self.sample = performance_data.get("sample")
+        self.changed_controls = []
+        self.set_stale(performance_data.get("stale"))
 
         # Обновляем CPU
         cpu_percent = performance_data["cpu"]["current"]
@@ -150,6 +187,10 @@ class PerformanceView(ft.Container):
             memory_percent, memory_total, memory_used, memory_history
         )
 
+        # Обновляем структуру памяти
+        memory_breakdown = performance_data.get("memory_breakdown")
+        self.update_memory_breakdown_chart(memory_breakdown)
+
         # Обновляем диск
         disk_io_current = performance_data["disk_io"]["current"]
         disk_io_history = performance_data["disk_io"]["history"]
@@ -176,6 +217,7 @@ class PerformanceView(ft.Container):
                         weight=ft.FontWeight.BOLD,
                         text_align=ft.TextAlign.CENTER,
                     ),
+                    self.stale_label,
                     ft.Container(height=20),
                     ft.ListView(
                         [
@@ -183,6 +225,8 @@ class PerformanceView(ft.Container):
                             ft.Container(height=20),
                             self.memory_metric,
                             ft.Container(height=20),
+                            self.memory_breakdown_metric,
+                            ft.Container(height=20),
                             self.disk_metric,
                             ft.Container(height=20),
                             self.network_metric,
@@ -193,11 +237,32 @@ class PerformanceView(ft.Container):
                 ],
                 expand=True,
             )
-        # Иначе просто обновляем существующий контент
-        # Не нужно ничего делать, так как мы уже обновили все метрики и графики выше
+            schedule_update(self.page, self)
+        elif self.changed_controls:
+            # Иначе отправляем только изменившиеся значения и графики
+            schedule_update(self.page, *self.changed_controls)
+
+    def set_stale(self, stale_since):
+        """Показывает или скрывает пометку истории с прошлого запуска"""
+        visible = stale_since is not None
+        if visible:
+            saved = datetime.datetime.fromtimestamp(stale_since).strftime("%H:%M:%S")
+            self.stale_label.value = (
+                f"Показана история с прошлого запуска ({saved}), идет обновление..."
+            )
+        elif not self.stale_label.visible:
+            return
+        self.stale_label.visible = visible
+        self.changed_controls.append(self.stale_label)
 
-        # Обновляем UI
-        self.update()
+    def create_chart_container(self, chart):
+        return ft.Container(
+            content=chart,
+            height=200,
+            border_radius=10,
+            padding=10,
+            bgcolor=ft.colors.BLACK12,
+        )
 
     def create_metric_card(self, title, value, chart_color, chart_container):
         return ft.Container(
@@ -224,14 +289,25 @@ class PerformanceView(ft.Container):
             border_radius=10,
         )
 
+    def set_metric_value(self, metric, value):
+        """Меняет подпись карточки, если текст изменился"""
+        text = metric.content.controls[0].controls[1]
+        if text.value != value:
+            text.value = value
+            self.changed_controls.append(text)
+
+    def sync_chart(self, chart, history, anomalies=None):
+        """Добавляет на график новые точки истории"""
+        if chart.sync(self.sample, history, anomalies):
+            self.changed_controls.append(chart)
+
     def update_cpu_chart(self, cpu_percent, cpu_history):
         """Обновление графика CPU"""
         # Обновляем значение
-        self.cpu_metric.content.controls[0].controls[1].value = f"{cpu_percent:.1f}%"
+        self.set_metric_value(self.cpu_metric, f"{cpu_percent:.1f}%")
 
         # Обновляем график
-        chart = self.create_chart(cpu_history, ft.colors.BLUE, 200, single_value=True)
-        self.cpu_chart_container.content = chart
+        self.sync_chart(self.cpu_chart, cpu_history, self.anomalies.get("cpu"))
 
     def update_memory_chart(
         self, memory_percent, memory_total, memory_used, memory_history
@@ -240,105 +316,61 @@ class PerformanceView(ft.Container):
         # Обновляем значение
         used_gb = memory_used / (1024**3)
         total_gb = memory_total / (1024**3)
-        self.memory_metric.content.controls[0].controls[
-            1
-        ].value = f"{used_gb:.1f} ГБ / {total_gb:.1f} ГБ ({memory_percent:.1f}%)"
+        self.set_metric_value(
+            self.memory_metric,
+            f"{used_gb:.1f} ГБ / {total_gb:.1f} ГБ ({memory_percent:.1f}%)",
+        )
 
         # Обновляем график
-        chart = self.create_chart(
-            memory_history, ft.colors.GREEN, 200, single_value=True
+        self.sync_chart(self.memory_chart, memory_history, self.anomalies.get("memory"))
+
+    def update_memory_breakdown_chart(self, memory_breakdown):
+        """Обновление графика структуры памяти"""
+        # Без /proc/meminfo (Windows, macOS) карточка не показывается
+        visible = bool(memory_breakdown and memory_breakdown["current"])
+        if self.memory_breakdown_metric.visible != visible:
+            self.memory_breakdown_metric.visible = visible
+            self.changed_controls.append(self.memory_breakdown_metric)
+        if not visible:
+            return
+
+        current = memory_breakdown["current"]
+        mb = 1024 * 1024
+        self.set_metric_value(
+            self.memory_breakdown_metric,
+            f"Грязные {current['dirty'] / mb:.0f} МБ, "
+            f"запись {current['writeback'] / mb:.0f} МБ, "
+            f"swap in/out {current['swap_in'] / mb:.1f}/{current['swap_out'] / mb:.1f} МБ/с, "
+            f"scan/steal {current['scan']:.0f}/{current['steal']:.0f} стр/с",
         )
-        self.memory_chart_container.content = chart
+
+        # Обновляем график
+        self.sync_chart(self.memory_breakdown_chart, memory_breakdown["history"])
 
     def update_disk_chart(self, disk_io_current, disk_io_history):
         """Обновление графика диска"""
         # Обновляем значение
         read_speed, write_speed = disk_io_current
-        self.disk_metric.content.controls[0].controls[
-            1
-        ].value = f"{read_speed:.1f} МБ/с чтение, {write_speed:.1f} МБ/с запись"
+        self.set_metric_value(
+            self.disk_metric,
+            f"{read_speed:.1f} МБ/с чтение, {write_speed:.1f} МБ/с запись",
+        )
 
         # Обновляем график
-        chart = self.create_chart(
-            disk_io_history, ft.colors.ORANGE, 200, single_value=False
-        )
-        self.disk_chart_container.content = chart
+        self.sync_chart(self.disk_chart, disk_io_history, self.anomalies.get("disk_io"))
 
     def update_network_chart(self, network_current, network_history):
         """Обновление графика сети"""
         # Обновляем значение
         sent_speed, recv_speed = network_current
-        self.network_metric.content.controls[0].controls[
-            1
-        ].value = f"{sent_speed:.1f} МБ/с отправка, {recv_speed:.1f} МБ/с получение"
-
-        # Обновляем график
-        chart = self.create_chart(
-            network_history, ft.colors.PURPLE, 200, single_value=False
+        self.set_metric_value(
+            self.network_metric,
+            f"{sent_speed:.1f} МБ/с отправка, {recv_speed:.1f} МБ/с получение",
         )
-        self.network_chart_container.content = chart
-
-    def create_chart(self, data, color, height, single_value=True):
-        """Создание графика"""
-        if not data:
-            return ft.Text("Нет данных")
-
-        if single_value:
-            # Для CPU и памяти (один показатель)
-            bars = [
-                ft.Container(
-                    width=5,
-                    height=max(5, value / 100 * height),
-                    bgcolor=color,
-                    border_radius=5,
-                    tooltip=f"{value:.1f}%",
-                )
-                for value in data
-            ]
-        else:
-            # Для диска и сети (два показателя)
-            max_value = max([max(read, write) for read, write in data]) if data else 1
-            max_value = max(max_value, 0.1)  # Избегаем деления на ноль
-
-            bars = []
-            for read, write in data:
-                read_height = max(5, read / max_value * height * 0.8)
-                write_height = max(5, write / max_value * height * 0.8)
-
-                bars.append(
-                    ft.Row(
-                        [
-                            ft.Container(
-                                width=2,
-                                height=read_height,
-                                bgcolor=color,
-                                border_radius=5,
-                                tooltip=f"Чтение: {read:.1f} МБ/с",
-                            ),
-                            ft.Container(
-                                width=2,
-                                height=write_height,
-                                bgcolor=ft.colors.RED,
-                                border_radius=5,
-                                tooltip=f"Запись: {write:.1f} МБ/с",
-                            ),
-                        ],
-                        spacing=1,
-                        alignment=ft.MainAxisAlignment.CENTER,
-                    )
-                )
 
-        return ft.Container(
-            content=ft.Row(
-                bars,
-                spacing=2,
-                alignment=ft.MainAxisAlignment.CENTER,
-                vertical_alignment=ft.CrossAxisAlignment.END,
-            ),
-            height=height,
-            border_radius=10,
-            padding=10,
-            bgcolor=ft.colors.BLACK12,
+        # Обновляем график
+        self.sync_chart(
+            self.network_chart, network_history, self.anomalies.get("network")
         )
 
     def update_performance_data(self):
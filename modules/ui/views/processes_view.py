@@ -1,11 +1,15 @@
+import asyncio
+import datetime
+import time
 import flet as ft
-from modules.ui.components.process_table import (
-    ProcessTable,
-    sort_processes,
-    _sort_column,
-    _sort_ascending,
-)
+from modules.ui.components.process_table import ProcessTable
+from modules.utils.process_manager import ProcessManager
 from modules.config.settings import TABLE_SETTINGS
+from modules.ui.render_scheduler import schedule_update
+from modules.utils.logger import get_logger
+
+# Инициализация логгера
+logger = get_logger()
 
 
 class ProcessesView(ft.Container):
@@ -14,8 +18,24 @@ class ProcessesView(ft.Container):
         self.process_monitor = process_monitor
         self.processes = []
         self.search_text = ""
-        self.process_table = None
         self.loading = True
+        # Текущая фоновая фильтрация и номер последнего запроса: результат
+        # устаревшего запроса не применяется
+        self.search_task = None
+        self.search_generation = 0
+        # Время нажатия клавиши, результат которого еще не показан
+        self.search_typed_at = None
+        # Время предыдущего нажатия: по нему определяется начало серии
+        self.search_last_key = 0.0
+        # Задержка от ввода до показа результата и время обработки, мс
+        self.search_latency = None
+        self.search_processing = None
+        # Данные с нескольких хостов показываются с колонкой хоста
+        self.show_host = getattr(process_monitor, "show_host", False)
+        # Таблица создается один раз и обновляется на месте
+        self.process_table = ProcessTable(
+            on_kill=self.kill_process, show_host=self.show_host
+        )
 
         # Создаем поле поиска
         self.search_field = ft.TextField(
@@ -27,6 +47,11 @@ class ProcessesView(ft.Container):
             border_radius=20,
         )
 
+        # Пометка списка, сохраненного при прошлом запуске
+        self.stale_label = ft.Text(
+            "", size=12, color=ft.colors.ORANGE_700, visible=False
+        )
+
         # Создаем индикатор загрузки
         loading_indicator = ft.ProgressRing()
 
@@ -43,17 +68,23 @@ class ProcessesView(ft.Container):
         self.content = ft.Column(
             [
                 ft.Text(
-                    "Процессы (показаны топ-50 по использованию памяти)",
+                    (
+                        "Процессы всех хостов (общий топ по использованию памяти)"
+                        if self.show_host
+                        else "Процессы (все, по использованию памяти)"
+                    ),
                     size=20,
                     weight=ft.FontWeight.BOLD,
                     text_align=ft.TextAlign.CENTER,
                 ),
+                self.stale_label,
                 self.search_field,
                 self.process_table_container,
             ],
             spacing=20,
             horizontal_alignment=ft.CrossAxisAlignment.CENTER,
-            scroll=ft.ScrollMode.AUTO,  # Включаем прокрутку на Column, а не на Container
+            # Прокручивается сам список процессов, поэтому колонка должна
+            # иметь ограниченную высоту
             expand=True,  # Позволяем колонке расширяться
         )
         self.padding = 20
@@ -63,30 +94,47 @@ class ProcessesView(ft.Container):
     def did_mount(self):
         # Регистрируем callback для обновления UI
         self.process_monitor.register_callback(self.update_processes)
+        # Пока идет первый замер, показываем список с прошлого запуска
+        get_stale_processes = getattr(self.process_monitor, "get_stale_processes", None)
+        stale = get_stale_processes() if get_stale_processes else None
+        if stale and self.loading:
+            processes, saved_at = stale
+            self.update_processes(processes, stale_since=saved_at)
         # Запускаем мониторинг процессов
         self.process_monitor.start_monitoring()
 
     def will_unmount(self):
         # Отменяем регистрацию callback при удалении компонента
         self.process_monitor.unregister_callback(self.update_processes)
+        self.cancel_search()
 
-    def update_processes(self, processes):
-        """Обновление списка процессов - теперь не асинхронная функция"""
+    def update_processes(self, processes, stale_since=None):
+        """
+        Обновление списка процессов - теперь не асинхронная функция.
+
+        Аргументы:
+            processes (list): Список процессов
+            stale_since (float, optional): Время сохранения, если список
+                восстановлен с прошлого запуска и еще не обновлен
+        """
         self.processes = processes
         self.loading = False
+        self.set_stale(stale_since)
 
-        # Применяем фильтр поиска
-        from modules.utils.process_manager import ProcessManager
-
-        filtered_processes = ProcessManager.filter_processes(
-            self.processes, self.search_text
-        )
+        self.refresh_table()
 
-        # Обновляем таблицу
-        self.process_table_container.content = ProcessTable(
-            filtered_processes, on_kill=self.kill_process
-        )
-        self.update()
+    def set_stale(self, stale_since):
+        """Показывает или скрывает пометку устаревшего списка"""
+        visible = stale_since is not None
+        if visible:
+            saved = datetime.datetime.fromtimestamp(stale_since).strftime("%H:%M:%S")
+            self.stale_label.value = (
+                f"Показан список с прошлого запуска ({saved}), идет обновление..."
+            )
+        elif not self.stale_label.visible:
+            return
+        self.stale_label.visible = visible
+        schedule_update(self.page, self.stale_label)
 
     def kill_process(self, pid):
         """
@@ -128,28 +176,93 @@ class ProcessesView(ft.Container):
             print(traceback.format_exc())
             return False
 
-    def handle_search(self, e):
-        """Обработка поиска"""
+    async def handle_search(self, e):
+        """
+        Обработка поиска: первое нажатие серии фильтруется сразу, а
+        следующие за ним быстрые нажатия - только после паузы в наборе
+        """
         self.search_text = e.control.value
+        now = time.perf_counter()
+        debounce = TABLE_SETTINGS["search_debounce"]
+        # Нажатие после паузы - начало новой серии
+        leading = now - self.search_last_key >= debounce
+        self.search_last_key = now
+        self.search_typed_at = now
+
+        self.refresh_table(debounce=0 if leading else debounce)
 
-        # Фильтруем процессы
-        from modules.utils.process_manager import ProcessManager
+    def refresh_table(self, debounce=0):
+        """
+        Запускает фильтрацию последнего снимка в фоновом потоке.
+        Незавершенная фильтрация по предыдущему запросу отменяется.
 
-        filtered_processes = ProcessManager.filter_processes(
-            self.processes, self.search_text
+        Аргументы:
+            debounce (float): Задержка перед фильтрацией, секунды
+        """
+        self.cancel_search()
+        if not self.page:
+            return
+        self.search_generation += 1
+        self.search_task = self.page.run_task(
+            self.run_search, self.search_generation, debounce
         )
 
-        # Применяем сохраненную сортировку к отфильтрованным процессам
-        if _sort_column is not None:
-            filtered_processes = sort_processes(
-                filtered_processes, _sort_column, _sort_ascending
-            )
+    def cancel_search(self):
+        """Отменяет ожидающую или выполняющуюся фильтрацию"""
+        if self.search_task:
+            self.search_task.cancel()
+            self.search_task = None
+
+    def filter_processes(self, processes, search_text):
+        """Фильтрует и сортирует снимок (выполняется в фоновом потоке)"""
+        filtered_processes = ProcessManager.filter_processes(processes, search_text)
+        return filtered_processes, self.process_table.sort_view(filtered_processes)
 
-        # Обновляем таблицу
-        self.process_table_container.content = ProcessTable(
-            filtered_processes, on_kill=self.kill_process
+    async def run_search(self, generation, debounce):
+        if debounce:
+            await asyncio.sleep(debounce)
+
+        started = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        filtered_processes, prepared = await loop.run_in_executor(
+            None, self.filter_processes, self.processes, self.search_text
         )
-        self.update()
+        if generation != self.search_generation:
+            # Пока шла фильтрация, пришел новый запрос или снимок
+            return
+
+        # Результат поиска - ответ на ввод пользователя, поэтому он
+        # отправляется сразу, а не в следующем кадре
+        typed = self.search_typed_at is not None
+        self.apply_search_results(filtered_processes, prepared, immediate=typed)
+
+        finished = time.perf_counter()
+        self.search_processing = (finished - started) * 1000
+        if typed:
+            self.search_latency = (finished - self.search_typed_at) * 1000
+            self.search_typed_at = None
+            logger.debug(
+                "Поиск '%s': %d из %d процессов, обработка %.1f мс, от ввода %.1f мс",
+                self.search_text,
+                len(filtered_processes),
+                len(self.processes),
+                self.search_processing,
+                self.search_latency,
+            )
+
+    def apply_search_results(self, filtered_processes, prepared=None, immediate=False):
+        """Передает отфильтрованный снимок в таблицу"""
+        changes = self.process_table.set_processes(filtered_processes, prepared)
+
+        if self.process_table_container.content is not self.process_table:
+            # Первый снимок: заменяем индикатор загрузки таблицей
+            self.process_table_container.content = self.process_table
+            schedule_update(self.page, self.process_table_container)
+        elif immediate:
+            if changes:
+                self.page.update(*changes)
+        else:
+            self.process_table.update_changes(changes)
 
     def terminate_process(self, e, pid):
         """Обработчик нажатия на кнопку завершения процесса"""
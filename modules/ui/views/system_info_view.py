@@ -1,11 +1,27 @@
 import flet as ft
 from modules.system.system_info import SystemInfo
-import threading
+from modules.system.hardware_cache import load_hardware_facts
+from modules.system.probe_runner import get_probe_runner, PROBE_TIMEOUT
+from modules.ui.render_scheduler import schedule_update
+from modules.utils.logger import get_logger
+import asyncio
 import platform
 import psutil
 import time
 import subprocess
 
+# Инициализация логгера
+logger = get_logger()
+
+# Разделы страницы в порядке отображения
+SECTION_TITLES = {
+    "general": "Общая информация",
+    "memory": "Память",
+    "network": "Сеть",
+    "uptime": "Время работы",
+    "disks": "Диски",
+}
+
 
 class SystemInfoView(ft.Container):
     def __init__(self):
@@ -13,8 +29,9 @@ class SystemInfoView(ft.Container):
         self.system_info = None
         self.system_data = None
         self.loading = True
-        self.uptime_timer = None
-        self.uptime_timer_running = True
+        self.uptime_task = None
+        self.load_task = None
+        self.sections = {}
         self.uptime_row = None  # Добавляем ссылку на строку с временем работы
 
         # Создаем индикатор загрузки
@@ -62,120 +79,184 @@ class SystemInfoView(ft.Container):
         self.start_uptime_timer()
 
     def will_unmount(self):
-        # Останавливаем таймер при размонтировании компонента
+        # Останавливаем таймер и ожидание опросов при размонтировании компонента
         self.stop_uptime_timer()
+        self.cancel_loading()
 
     def load_system_info(self):
-        """Загрузка системной информации"""
-        try:
-            self.system_info = SystemInfo.get_all_info()
-
-            # Исправляем отображение операционной системы
-            if self.system_info["os"] == "Darwin":
-                # Получаем более подробную информацию о версии macOS
-                try:
-                    # Получаем версию macOS из системной команды
-                    mac_version = (
-                        subprocess.check_output("sw_vers -productVersion", shell=True)
-                        .decode()
-                        .strip()
-                    )
+        """
+        Запуск сбора системной информации.
+
+        Опросы выполняются одновременно, каждый раздел страницы
+        отрисовывается, как только завершился его опрос. Раздел, опрос
+        которого не уложился в свой предел, показывает ошибку.
+        """
+        self.cancel_loading()
+        self.system_info = {}
+        self.loading = True
+        self.show_sections()
+        if self.page:
+            self.load_task = self.page.run_task(self.run_probes)
+
+    def cancel_loading(self):
+        """Прекращает ожидание результатов опросов"""
+        if self.load_task:
+            self.load_task.cancel()
+            self.load_task = None
+
+    def get_probes(self):
+        """Опросы системы по разделам страницы"""
+        return {
+            "general": self.probe_general,
+            "memory": SystemInfo.get_memory_info,
+            "network": SystemInfo.get_network_info,
+            "uptime": SystemInfo.get_uptime,
+            "disks": SystemInfo.get_disk_info,
+        }
+
+    def probe_general(self):
+        """Общая информация: сведения об оборудовании и частота процессора"""
+        # Сведения об оборудовании берутся из кэша текущей загрузки системы
+        info = dict(load_hardware_facts(self.collect_static_info))
+        info["cpu"] = {**info["cpu"], **SystemInfo.get_cpu_load()}
+        return info
+
+    async def run_probes(self):
+        """Выполняет опросы и отрисовывает разделы по мере их завершения"""
+        started = time.perf_counter()
+        results = await get_probe_runner().run(
+            self.get_probes(), self.apply_probe_result
+        )
+        self.loading = False
+        self.system_data = self.system_info
+        self.load_task = None
+
+        if logger.is_enabled_for("DEBUG"):
+            timings = ", ".join(
+                f"{name} {result.elapsed * 1000:.0f} мс ({result.status})"
+                for name, result in results.items()
+            )
+            logger.debug(
+                "Информация о системе собрана за %.0f мс: %s",
+                (time.perf_counter() - started) * 1000,
+                timings,
+            )
 
-                    # Получаем название macOS из системной команды
-                    mac_name = (
-                        subprocess.check_output("sw_vers -productName", shell=True)
-                        .decode()
-                        .strip()
-                    )
+    def apply_probe_result(self, result):
+        """Отрисовывает раздел страницы по результату его опроса"""
+        section = self.sections.get(result.name)
+        if section is None:
+            return
 
-                    # Определяем полное название версии macOS
-                    full_name = mac_name
-                    version_parts = mac_version.split(".")
-
-                    # Добавляем кодовое название, если известно
-                    if version_parts[0] == "14":
-                        full_name = "macOS Sonoma"
-                    elif version_parts[0] == "13":
-                        full_name = "macOS Ventura"
-                    elif version_parts[0] == "12":
-                        full_name = "macOS Monterey"
-                    elif version_parts[0] == "11":
-                        full_name = "macOS Big Sur"
-                    elif version_parts[0] == "10":
-                        if version_parts[1] == "15":
-                            full_name = "macOS Catalina"
-                        elif version_parts[1] == "14":
-                            full_name = "macOS Mojave"
-                        elif version_parts[1] == "13":
-                            full_name = "macOS High Sierra"
-                        elif version_parts[1] == "12":
-                            full_name = "macOS Sierra"
-                        elif version_parts[1] == "11":
-                            full_name = "OS X El Capitan"
-                        elif version_parts[1] == "10":
-                            full_name = "OS X Yosemite"
-                        elif version_parts[1] == "9":
-                            full_name = "OS X Mavericks"
-                        elif version_parts[1] == "8":
-                            full_name = "OS X Mountain Lion"
-                        elif version_parts[1] == "7":
-                            full_name = "OS X Lion"
-
-                    # Устанавливаем полное название с версией
-                    self.system_info["os"] = f"{full_name} {mac_version}"
-
-                    # Выводим информацию в консоль для отладки
-                    print(f"Определена операционная система: {self.system_info['os']}")
-
-                except Exception as e:
-                    print(f"Ошибка при определении версии macOS: {e}")
-                    # Если не удалось получить подробную информацию, используем стандартный метод
-                    self.system_info["os"] = f"macOS {platform.mac_ver()[0]}"
-
-            # Исправляем отображение материнской платы
-            self.fix_motherboard_info()
-
-            self.system_data = self.system_info
-            self.loading = False
-            self.update_ui()
-        except Exception as e:
-            print(f"Ошибка при загрузке системной информации: {e}")
-            self.loading = False
-            self.info_container.content = ft.Column(
-                [
-                    ft.Text(
-                        "Ошибка при загрузке информации о системе",
-                        size=16,
-                        color=ft.colors.ERROR,
-                        weight=ft.FontWeight.BOLD,
-                        text_align=ft.TextAlign.CENTER,
-                    ),
-                    ft.Text(
-                        f"Подробности: {str(e)}",
-                        size=14,
-                        text_align=ft.TextAlign.CENTER,
-                    ),
-                    ft.ElevatedButton(
-                        "Повторить загрузку",
-                        on_click=lambda _: self.reload_info(),
-                    ),
-                ],
-                alignment=ft.MainAxisAlignment.CENTER,
-                horizontal_alignment=ft.CrossAxisAlignment.CENTER,
-                spacing=20,
+        if result.ok:
+            if result.name == "general":
+                self.system_info.update(result.value)
+            else:
+                self.system_info[result.name] = result.value
+            try:
+                rows = self.section_builders[result.name]()
+            except Exception as e:
+                print(f"Ошибка при отображении раздела {result.name}: {e}")
+                rows = self.create_error_rows(f"Ошибка при отображении: {e}")
+        elif result.status == PROBE_TIMEOUT:
+            logger.warning(
+                f"Опрос системы '{result.name}' не уложился в {result.elapsed:.1f} с"
             )
-            self.update()
+            rows = self.create_error_rows(
+                f"Нет ответа за {result.elapsed:.1f} с, данные недоступны"
+            )
+        else:
+            logger.error(f"Ошибка опроса системы '{result.name}': {result.error}")
+            rows = self.create_error_rows(f"Ошибка: {result.error}")
+
+        self.set_section_rows(section, rows)
+        schedule_update(self.page, section)
+
+    def collect_static_info(self):
+        """
+        Сбор сведений, не меняющихся до перезагрузки (ОС, процессор,
+        видеокарта, материнская плата). Выполняет внешние команды, поэтому
+        результат кэшируется на диске. Вызывается в фоновом потоке.
+        """
+        info = SystemInfo.get_static_info()
+
+        # Исправляем отображение операционной системы
+        if info["os"] == "Darwin":
+            # Получаем более подробную информацию о версии macOS
+            try:
+                # Получаем версию macOS из системной команды
+                mac_version = (
+                    subprocess.check_output("sw_vers -productVersion", shell=True)
+                    .decode()
+                    .strip()
+                )
 
-    def fix_motherboard_info(self):
+                # Получаем название macOS из системной команды
+                mac_name = (
+                    subprocess.check_output("sw_vers -productName", shell=True)
+                    .decode()
+                    .strip()
+                )
+
+                # Определяем полное название версии macOS
+                full_name = mac_name
+                version_parts = mac_version.split(".")
+
+                # Добавляем кодовое название, если известно
+                if version_parts[0] == "14":
+                    full_name = "macOS Sonoma"
+                elif version_parts[0] == "13":
+                    full_name = "macOS Ventura"
+                elif version_parts[0] == "12":
+                    full_name = "macOS Monterey"
+                elif version_parts[0] == "11":
+                    full_name = "macOS Big Sur"
+                elif version_parts[0] == "10":
+                    if version_parts[1] == "15":
+                        full_name = "macOS Catalina"
+                    elif version_parts[1] == "14":
+                        full_name = "macOS Mojave"
+                    elif version_parts[1] == "13":
+                        full_name = "macOS High Sierra"
+                    elif version_parts[1] == "12":
+                        full_name = "macOS Sierra"
+                    elif version_parts[1] == "11":
+                        full_name = "OS X El Capitan"
+                    elif version_parts[1] == "10":
+                        full_name = "OS X Yosemite"
+                    elif version_parts[1] == "9":
+                        full_name = "OS X Mavericks"
+                    elif version_parts[1] == "8":
+                        full_name = "OS X Mountain Lion"
+                    elif version_parts[1] == "7":
+                        full_name = "OS X Lion"
+
+                # Устанавливаем полное название с версией
+                info["os"] = f"{full_name} {mac_version}"
+
+                # Выводим информацию в консоль для отладки
+                print(f"Определена операционная система: {info['os']}")
+
+            except Exception as e:
+                print(f"Ошибка при определении версии macOS: {e}")
+                # Если не удалось получить подробную информацию, используем стандартный метод
+                info["os"] = f"macOS {platform.mac_ver()[0]}"
+
+        # Исправляем отображение материнской платы
+        self.fix_motherboard_info(info)
+
+        return info
+
+    def fix_motherboard_info(self, info):
         """Исправление информации о материнской плате для macOS"""
         try:
             # Проверяем, есть ли информация о материнской плате
             if (
-                not self.system_info.get("motherboard")
-                or not self.system_info["motherboard"].get("manufacturer")
-                or not self.system_info["motherboard"].get("product")
-                or self.system_info["motherboard"]["manufacturer"] == "Unknown"
-                or self.system_info["motherboard"]["product"] == "Unknown"
+                not info.get("motherboard")
+                or not info["motherboard"].get("manufacturer")
+                or not info["motherboard"].get("product")
+                or info["motherboard"]["manufacturer"] == "Unknown"
+                or info["motherboard"]["product"] == "Unknown"
             ):
                 # Пытаемся получить информацию о материнской плате другим способом
                 if platform.system() == "Darwin":  # macOS
@@ -204,18 +285,18 @@ class SystemInfoView(ft.Container):
                                     product = parts[1].strip()
                                     break
 
-                        if not self.system_info.get("motherboard"):
-                            self.system_info["motherboard"] = {}
+                        if not info.get("motherboard"):
+                            info["motherboard"] = {}
 
-                        self.system_info["motherboard"]["manufacturer"] = manufacturer
-                        self.system_info["motherboard"]["product"] = product
+                        info["motherboard"]["manufacturer"] = manufacturer
+                        info["motherboard"]["product"] = product
                     except:
                         # Если не удалось получить информацию, устанавливаем значения по умолчанию
-                        if not self.system_info.get("motherboard"):
-                            self.system_info["motherboard"] = {}
+                        if not info.get("motherboard"):
+                            info["motherboard"] = {}
 
-                        self.system_info["motherboard"]["manufacturer"] = "Apple"
-                        self.system_info["motherboard"]["product"] = "Mac"
+                        info["motherboard"]["manufacturer"] = "Apple"
+                        info["motherboard"]["product"] = "Mac"
 
                 elif platform.system() == "Windows":
                     # Код для Windows остается без изменений
@@ -231,13 +312,11 @@ class SystemInfoView(ft.Container):
                                 " ".join(parts[1:]) if len(parts) > 1 else "Unknown"
                             )
 
-                            if not self.system_info.get("motherboard"):
-                                self.system_info["motherboard"] = {}
+                            if not info.get("motherboard"):
+                                info["motherboard"] = {}
 
-                            self.system_info["motherboard"][
-                                "manufacturer"
-                            ] = manufacturer
-                            self.system_info["motherboard"]["product"] = product
+                            info["motherboard"]["manufacturer"] = manufacturer
+                            info["motherboard"]["product"] = product
 
                 elif platform.system() == "Linux":
                     # Код для Linux остается без изменений
@@ -259,11 +338,11 @@ class SystemInfoView(ft.Container):
                             .strip()
                         )
 
-                        if not self.system_info.get("motherboard"):
-                            self.system_info["motherboard"] = {}
+                        if not info.get("motherboard"):
+                            info["motherboard"] = {}
 
-                        self.system_info["motherboard"]["manufacturer"] = manufacturer
-                        self.system_info["motherboard"]["product"] = product
+                        info["motherboard"]["manufacturer"] = manufacturer
+                        info["motherboard"]["product"] = product
                     except:
                         pass
         except Exception as e:
@@ -271,95 +350,39 @@ class SystemInfoView(ft.Container):
 
     def reload_info(self):
         """Повторная загрузка информации о системе"""
-        self.loading = True
-        self.info_container.content = ft.Column(
-            [
-                ft.Text(
-                    "Загрузка информации о системе...",
-                    size=20,
-                    weight=ft.FontWeight.BOLD,
-                    text_align=ft.TextAlign.CENTER,
-                ),
-                ft.ProgressRing(),
-            ],
-            alignment=ft.MainAxisAlignment.CENTER,
-            horizontal_alignment=ft.CrossAxisAlignment.CENTER,
-        )
-        self.update()
         self.load_system_info()
 
-    def update_ui(self):
-        """Обновление UI с системной информацией"""
-        if not self.system_info:
-            return
+    def show_sections(self):
+        """Показывает разделы страницы с индикаторами загрузки"""
+        self.sections = {name: self.create_section(name) for name in SECTION_TITLES}
+        controls = []
+        for section in self.sections.values():
+            if controls:
+                controls.append(ft.Container(height=20))
+            controls.append(section)
 
-        # Создаем контейнер с общей информацией
-        general_info = ft.Container(
-            content=ft.Column(
-                [
-                    ft.Text(
-                        "Общая информация",
-                        weight=ft.FontWeight.BOLD,
-                        size=18,
-                        text_align=ft.TextAlign.CENTER,
-                    ),
-                    ft.Divider(),
-                    self.create_info_row(
-                        "Операционная система:", self.system_info["os"]
-                    ),
-                    self.create_info_row("Процессор:", self.system_info["cpu"]["name"]),
-                    self.create_info_row(
-                        "Ядра / Потоки:",
-                        f"{self.system_info['cpu']['cores']} / {self.system_info['cpu']['threads']}",
-                    ),
-                    self.create_info_row(
-                        "Частота процессора:",
-                        f"{self.system_info['cpu']['frequency']:.2f} МГц",
-                    ),
-                    self.create_info_row(
-                        "Материнская плата:",
-                        f"{self.system_info['motherboard']['manufacturer']} {self.system_info['motherboard']['product']}",
-                    ),
-                    self.create_info_row(
-                        "Видеокарта:", self.system_info["gpu"]["name"]
-                    ),
-                ],
-                spacing=10,
-            ),
-            padding=15,
-            border=ft.border.all(1, ft.colors.OUTLINE),
-            border_radius=10,
+        self.info_container.content = ft.Column(
+            controls,
+            spacing=0,
+            scroll=ft.ScrollMode.AUTO,
+            expand=True,
         )
+        if self.page:
+            self.update()
 
-        # Создаем контейнер с информацией о памяти
-        memory_info = ft.Container(
+    def create_section(self, name):
+        """Создание раздела страницы с индикатором загрузки"""
+        return ft.Container(
             content=ft.Column(
                 [
                     ft.Text(
-                        "Память",
+                        SECTION_TITLES[name],
                         weight=ft.FontWeight.BOLD,
                         size=18,
                         text_align=ft.TextAlign.CENTER,
                     ),
                     ft.Divider(),
-                    self.create_info_row(
-                        "Оперативная память:",
-                        f"{self.system_info['memory']['used'] / (1024**3):.1f} ГБ / {self.system_info['memory']['total'] / (1024**3):.1f} ГБ ({self.system_info['memory']['percent']}%)",
-                    ),
-                    ft.ProgressBar(
-                        value=self.system_info["memory"]["percent"] / 100,
-                        bgcolor=ft.colors.BLACK12,
-                        color=(
-                            ft.colors.BLUE
-                            if self.system_info["memory"]["percent"] < 90
-                            else ft.colors.RED
-                        ),
-                        height=10,
-                    ),
-                    self.create_info_row(
-                        "Доступно:",
-                        f"{self.system_info['memory']['available'] / (1024**3):.1f} ГБ",
-                    ),
+                    ft.ProgressRing(width=20, height=20, stroke_width=2),
                 ],
                 spacing=10,
             ),
@@ -368,63 +391,84 @@ class SystemInfoView(ft.Container):
             border_radius=10,
         )
 
-        # Создаем контейнер с информацией о сети
-        network_info = ft.Container(
-            content=ft.Column(
-                [
-                    ft.Text(
-                        "Сеть",
-                        weight=ft.FontWeight.BOLD,
-                        size=18,
-                        text_align=ft.TextAlign.CENTER,
-                    ),
-                    ft.Divider(),
-                    self.create_info_row(
-                        "Имя хоста:", self.system_info["network"]["hostname"]
-                    ),
-                    self.create_info_row(
-                        "IP-адрес:", self.system_info["network"]["ip"]
-                    ),
-                    self.create_info_row(
-                        "Отправлено:",
-                        f"{self.system_info['network']['bytes_sent'] / (1024**2):.1f} МБ",
-                    ),
-                    self.create_info_row(
-                        "Получено:",
-                        f"{self.system_info['network']['bytes_recv'] / (1024**2):.1f} МБ",
-                    ),
-                ],
-                spacing=10,
-            ),
-            padding=15,
-            border=ft.border.all(1, ft.colors.OUTLINE),
-            border_radius=10,
-        )
+    def set_section_rows(self, section, rows):
+        """Заменяет содержимое раздела (заголовок и разделитель остаются)"""
+        section.content.controls[2:] = rows
 
-        # Создаем контейнер с информацией о времени работы
-        uptime_info = self.create_uptime_info()
+    def create_error_rows(self, message):
+        """Строки раздела, данные которого получить не удалось"""
+        return [
+            ft.Text(message, color=ft.colors.ERROR),
+            ft.TextButton("Повторить загрузку", on_click=lambda _: self.reload_info()),
+        ]
 
-        # Создаем контейнер с информацией о дисках
-        disks_info = self.create_disks_info()
+    @property
+    def section_builders(self):
+        return {
+            "general": self.create_general_rows,
+            "memory": self.create_memory_rows,
+            "network": self.create_network_rows,
+            "uptime": self.create_uptime_rows,
+            "disks": self.create_disks_rows,
+        }
+
+    def create_general_rows(self):
+        """Строки раздела с общей информацией"""
+        return [
+            self.create_info_row("Операционная система:", self.system_info["os"]),
+            self.create_info_row("Процессор:", self.system_info["cpu"]["name"]),
+            self.create_info_row(
+                "Ядра / Потоки:",
+                f"{self.system_info['cpu']['cores']} / {self.system_info['cpu']['threads']}",
+            ),
+            self.create_info_row(
+                "Частота процессора:",
+                f"{self.system_info['cpu']['frequency']:.2f} МГц",
+            ),
+            self.create_info_row(
+                "Материнская плата:",
+                f"{self.system_info['motherboard']['manufacturer']} {self.system_info['motherboard']['product']}",
+            ),
+            self.create_info_row("Видеокарта:", self.system_info["gpu"]["name"]),
+        ]
 
-        # Обновляем контейнер с информацией
-        self.info_container.content = ft.Column(
-            [
-                general_info,
-                ft.Container(height=20),
-                memory_info,
-                ft.Container(height=20),
-                network_info,
-                ft.Container(height=20),
-                uptime_info,
-                ft.Container(height=20),
-                disks_info,
-            ],
-            spacing=0,
-            scroll=ft.ScrollMode.AUTO,
-            expand=True,
-        )
-        self.update()
+    def create_memory_rows(self):
+        """Строки раздела с информацией о памяти"""
+        return [
+            self.create_info_row(
+                "Оперативная память:",
+                f"{self.system_info['memory']['used'] / (1024**3):.1f} ГБ / {self.system_info['memory']['total'] / (1024**3):.1f} ГБ ({self.system_info['memory']['percent']}%)",
+            ),
+            ft.ProgressBar(
+                value=self.system_info["memory"]["percent"] / 100,
+                bgcolor=ft.colors.BLACK12,
+                color=(
+                    ft.colors.BLUE
+                    if self.system_info["memory"]["percent"] < 90
+                    else ft.colors.RED
+                ),
+                height=10,
+            ),
+            self.create_info_row(
+                "Доступно:",
+                f"{self.system_info['memory']['available'] / (1024**3):.1f} ГБ",
+            ),
+        ]
+
+    def create_network_rows(self):
+        """Строки раздела с информацией о сети"""
+        return [
+            self.create_info_row("Имя хоста:", self.system_info["network"]["hostname"]),
+            self.create_info_row("IP-адрес:", self.system_info["network"]["ip"]),
+            self.create_info_row(
+                "Отправлено:",
+                f"{self.system_info['network']['bytes_sent'] / (1024**2):.1f} МБ",
+            ),
+            self.create_info_row(
+                "Получено:",
+                f"{self.system_info['network']['bytes_recv'] / (1024**2):.1f} МБ",
+            ),
+        ]
 
     def create_info_row(self, label, value):
         return ft.Row(
@@ -435,8 +479,8 @@ class SystemInfoView(ft.Container):
             alignment=ft.MainAxisAlignment.SPACE_BETWEEN,
         )
 
-    def create_disks_info(self):
-        """Создание контейнера с информацией о дисках с улучшенным отображением для macOS"""
+    def create_disks_rows(self):
+        """Строки раздела с информацией о дисках с улучшенным отображением для macOS"""
         disks_rows = []
 
         if self.system_info and "disks" in self.system_info:
@@ -531,99 +575,48 @@ class SystemInfoView(ft.Container):
 
                 disks_rows.append(ft.Divider())
 
-        # Создаем содержимое для контейнера
-        content_controls = [
-            ft.Text(
-                "Диски",
-                weight=ft.FontWeight.BOLD,
-                size=18,
-                text_align=ft.TextAlign.CENTER,
-            ),
-            ft.Divider(),
-        ]
-
-        # Добавляем строки с информацией о дисках или сообщение об отсутствии информации
-        if disks_rows:
-            content_controls.extend(disks_rows)
-        else:
-            content_controls.append(ft.Text("Информация о дисках недоступна"))
-
-        return ft.Container(
-            content=ft.Column(
-                content_controls,
-                spacing=10,
-            ),
-            padding=15,
-            border=ft.border.all(1, ft.colors.OUTLINE),
-            border_radius=10,
-        )
+        # Строки с информацией о дисках или сообщение об отсутствии информации
+        return disks_rows or [ft.Text("Информация о дисках недоступна")]
 
-    def create_uptime_info(self):
-        """Создание контейнера с информацией о времени работы"""
-        uptime_seconds = self.system_info["uptime"]
-
-        # Создаем строку с временем работы
+    def create_uptime_rows(self):
+        """Строки раздела с информацией о времени работы"""
+        # Строка с временем работы обновляется таймером
         self.uptime_row = self.create_info_row(
-            "Система работает:", self.format_uptime(uptime_seconds)
-        )
-
-        uptime_info = ft.Container(
-            content=ft.Column(
-                [
-                    ft.Text(
-                        "Время работы",
-                        weight=ft.FontWeight.BOLD,
-                        size=18,
-                        text_align=ft.TextAlign.CENTER,
-                    ),
-                    ft.Divider(),
-                    self.uptime_row,
-                ],
-                spacing=10,
-            ),
-            padding=15,
-            border=ft.border.all(1, ft.colors.OUTLINE),
-            border_radius=10,
+            "Система работает:", self.format_uptime(self.system_info["uptime"])
         )
-
-        return uptime_info
+        return [self.uptime_row]
 
     def start_uptime_timer(self):
-        """Запуск таймера для обновления времени работы"""
-        self.uptime_timer_running = True
-        self.uptime_timer = threading.Thread(target=self.update_uptime_loop)
-        self.uptime_timer.daemon = True
-        self.uptime_timer.start()
+        """Запуск задачи обновления времени работы в цикле событий Flet"""
+        if self.page and not self.uptime_task:
+            self.uptime_task = self.page.run_task(self.update_uptime_loop)
 
     def stop_uptime_timer(self):
-        """Остановка таймера"""
-        self.uptime_timer_running = False
-        if self.uptime_timer:
-            self.uptime_timer.join(timeout=1)
+        """Остановка задачи"""
+        if self.uptime_task:
+            self.uptime_task.cancel()
+            self.uptime_task = None
 
-    def update_uptime_loop(self):
+    async def update_uptime_loop(self):
         """Цикл обновления времени работы"""
-        while self.uptime_timer_running:
+        boot_time = psutil.boot_time()
+        while True:
+            uptime_seconds = time.time() - boot_time
             try:
-                # Получаем текущее время работы
-                boot_time = psutil.boot_time()
-                uptime_seconds = time.time() - boot_time
-
                 # Обновляем текст времени работы, если строка существует
                 if (
                     hasattr(self, "uptime_row")
                     and self.uptime_row
                     and len(self.uptime_row.controls) > 1
                 ):
-                    self.uptime_row.controls[1].value = self.format_uptime(
-                        uptime_seconds
-                    )
-                    self.update()
+                    uptime_text = self.uptime_row.controls[1]
+                    uptime_text.value = self.format_uptime(uptime_seconds)
+                    schedule_update(self.page, uptime_text)
             except Exception as e:
                 print(f"Ошибка при обновлении времени работы: {e}")
 
-            # Ждем 1 секунду перед следующим обновлением
-            time.sleep(1)
+            # Просыпаемся к началу следующей секунды
+            await asyncio.sleep(1 - uptime_seconds % 1)
 
     def format_uptime(self, seconds):
         """Форматирование времени работы"""
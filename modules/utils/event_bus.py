@@ -0,0 +1,176 @@
+import threading
+from collections import deque
+
+
+class Subscription:
+    """
+    Подписка на тему шины событий.
+
+    Подписка в режиме "последнее значение" хранит только самый свежий
+    снимок: если новый снимок пришел раньше, чем был доставлен
+    предыдущий, предыдущий отбрасывается и учитывается в dropped.
+    Потоковая подписка хранит ограниченную очередь: при переполнении
+    отбрасываются самые старые элементы.
+    """
+
+    def __init__(self, topic, callback, stream=False, maxsize=1):
+        self.topic = topic
+        self.callback = callback
+        self.stream = stream
+        self.pending = deque(maxlen=maxsize if stream else 1)
+        self.published = 0
+        self.delivered = 0
+        self.dropped = 0
+
+    @property
+    def lag(self):
+        """Количество опубликованных, но еще не доставленных элементов"""
+        return self.published - self.delivered - self.dropped
+
+    def stats(self):
+        name = getattr(self.callback, "__qualname__", repr(self.callback))
+        return {
+            "topic": self.topic,
+            "callback": name,
+            "stream": self.stream,
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "lag": self.lag,
+        }
+
+
+class EventBus:
+    """
+    Шина событий между потоками сборщиков и потоком-потребителем.
+
+    Публикация никогда не блокирует сборщик и не накапливает данные без
+    ограничения: для каждой темы хранится последнее значение, а у каждого
+    подписчика - слот последнего значения или ограниченная очередь.
+    Доставка выполняется методом dispatch() в потоке-потребителе.
+
+    Аргументы:
+        stream_maxsize (int): Размер очереди потоковых подписок по умолчанию
+    """
+
+    def __init__(self, stream_maxsize=256):
+        self.stream_maxsize = stream_maxsize
+        self.lock = threading.Lock()
+        self.idle = threading.Condition(self.lock)
+        self.subscriptions = {}
+        self.latest_values = {}
+        self.notifier = None
+        self._in_flight = 0
+
+    def set_notifier(self, notifier):
+        """
+        Устанавливает функцию, вызываемую после каждой публикации (из потока
+        издателя). Через нее потребитель узнает, что пора вызвать dispatch(),
+        и не опрашивает шину по таймеру.
+        """
+        self.notifier = notifier
+
+    def subscribe(self, topic, callback, stream=False, maxsize=None):
+        """
+        Подписывает callback на тему (повторная подписка игнорируется).
+
+        Аргументы:
+            topic (str): Название темы
+            callback (callable): Функция, принимающая опубликованные данные
+            stream (bool): True - доставлять каждый элемент через ограниченную
+                очередь, False - доставлять только последнее значение
+            maxsize (int, optional): Размер очереди потоковой подписки
+        """
+        with self.lock:
+            subscriptions = self.subscriptions.setdefault(topic, [])
+            if any(sub.callback == callback for sub in subscriptions):
+                return
+            subscriptions.append(
+                Subscription(topic, callback, stream, maxsize or self.stream_maxsize)
+            )
+
+    def unsubscribe(self, topic, callback):
+        """Отменяет подписку callback на тему"""
+        with self.lock:
+            subscriptions = self.subscriptions.get(topic, [])
+            self.subscriptions[topic] = [
+                sub for sub in subscriptions if sub.callback != callback
+            ]
+            self.idle.notify_all()
+
+    def publish(self, topic, data):
+        """Публикует данные в тему, не блокируя вызывающий поток"""
+        with self.lock:
+            self.latest_values[topic] = data
+            for sub in self.subscriptions.get(topic, ()):
+                if len(sub.pending) == sub.pending.maxlen:
+                    sub.dropped += 1
+                sub.pending.append(data)
+                sub.published += 1
+            notifier = self.notifier
+
+        if notifier:
+            notifier()
+
+    def latest(self, topic, default=None):
+        """Последнее опубликованное в тему значение"""
+        with self.lock:
+            return self.latest_values.get(topic, default)
+
+    def dispatch(self):
+        """
+        Доставляет накопленные данные подписчикам в текущем потоке.
+
+        Возвращает:
+            int: Количество вызванных callback-ов
+        """
+        with self.lock:
+            batch = []
+            for subscriptions in self.subscriptions.values():
+                for sub in subscriptions:
+                    if sub.pending:
+                        batch.append((sub, list(sub.pending)))
+                        sub.pending.clear()
+            self._in_flight += 1
+
+        delivered = 0
+        try:
+            for sub, items in batch:
+                for data in items:
+                    try:
+                        sub.callback(data)
+                    except Exception as e:
+                        print(f"Ошибка при обработке callback: {e}")
+                    delivered += 1
+        finally:
+            with self.lock:
+                for sub, items in batch:
+                    sub.delivered += len(items)
+                self._in_flight -= 1
+                self.idle.notify_all()
+        return delivered
+
+    def wait_idle(self, timeout=None):
+        """
+        Ждет, пока все опубликованные данные будут доставлены.
+
+        Возвращает:
+            bool: True, если очередь пуста, False по истечении timeout
+        """
+        with self.lock:
+            return self.idle.wait_for(self._is_idle, timeout)
+
+    def _is_idle(self):
+        return not self._in_flight and not any(
+            sub.pending
+            for subscriptions in self.subscriptions.values()
+            for sub in subscriptions
+        )
+
+    def stats(self):
+        """Счетчики доставки, потерь и отставания по каждой подписке"""
+        with self.lock:
+            return [
+                sub.stats()
+                for subscriptions in self.subscriptions.values()
+                for sub in subscriptions
+            ]
@@ -0,0 +1,185 @@
+import datetime
+import gzip
+import os
+import queue
+import shutil
+import threading
+
+# Префикс файлов лога: log_ГГГГ-ММ-ДД.log, log_ГГГГ-ММ-ДД.N.log(.gz)
+_PREFIX = "log_"
+
+
+class RotatingLogFile:
+    """
+    Файл лога с ротацией по дням и по размеру.
+
+    Записи пишутся в log_ГГГГ-ММ-ДД.log текущего дня. При смене дня файл
+    закрывается и открывается файл нового дня, а при превышении max_bytes
+    текущий файл переименовывается в log_ГГГГ-ММ-ДД.N.log и запись
+    продолжается в новый файл. Закрытые файлы сжимаются gzip в отдельном
+    фоновом потоке, после чего самые старые файлы удаляются, пока все логи
+    не уместятся в max_total_bytes.
+
+    Методы write() и flush() вызываются только потоком фоновой записи
+    логов (LogWriter), поэтому ни ротация, ни сжатие не задерживают
+    вызывающих logger.log.
+
+    Аргументы:
+        directory (str): Каталог логов
+        max_bytes (int): Размер файла, после которого он ротируется
+            (0 - только ротация по дням)
+        max_total_bytes (int): Предельный размер всех файлов лога
+            (0 - без ограничения)
+        compress (bool): Сжимать закрытые файлы
+        compress_level (int): Уровень сжатия gzip (1-9)
+    """
+
+    def __init__(
+        self,
+        directory,
+        max_bytes=10 * 1024 * 1024,
+        max_total_bytes=200 * 1024 * 1024,
+        compress=True,
+        compress_level=6,
+    ):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_total_bytes = max_total_bytes
+        self.compress = compress
+        self.compress_level = compress_level
+
+        self.file = None
+        self.path = None
+        self.day = None
+        self.size = 0
+        self.closed = False
+        self.rotations = 0
+
+        # Файлы для сжатия; None останавливает поток
+        self.pending = queue.Queue()
+        self.thread = threading.Thread(
+            target=self._run_compression, name="log-compress", daemon=True
+        )
+        self.thread.start()
+
+    def path_for(self, day, index=None):
+        """Путь к файлу лога за день day (index - номер закрытой части)"""
+        suffix = f".{index}" if index else ""
+        return os.path.join(self.directory, f"{_PREFIX}{day:%Y-%m-%d}{suffix}.log")
+
+    def write(self, data):
+        """Записывает строки, при необходимости ротируя файл"""
+        today = datetime.date.today()
+        if self.file is None:
+            self._open(today)
+            # Незакрытые файлы прошлых запусков
+            self._queue_leftovers()
+        elif today != self.day:
+            self._rotate(today)
+        elif self.max_bytes and self.size >= self.max_bytes:
+            self._rotate(today)
+
+        self.file.write(data)
+        self.size += len(data.encode("utf-8"))
+
+    def flush(self):
+        if self.file is not None:
+            self.file.flush()
+
+    def close(self, timeout=5.0):
+        """Закрывает файл и ждет сжатия уже закрытых файлов"""
+        if self.closed:
+            return
+        self.closed = True
+        if self.file is not None:
+            self.file.close()
+        self.pending.put(None)
+        self.thread.join(timeout)
+
+    def _open(self, day):
+        os.makedirs(self.directory, exist_ok=True)
+        self.day = day
+        self.path = self.path_for(day)
+        self.file = open(self.path, "a", encoding="utf-8")
+        self.size = os.path.getsize(self.path)
+
+    def _rotate(self, day):
+        self.file.close()
+        closed_path = self.path
+        if self.path_for(day) == self.path:
+            # Ротация по размеру: закрытая часть получает следующий номер
+            index = 1
+            while os.path.exists(self.path_for(day, index)) or os.path.exists(
+                self.path_for(day, index) + ".gz"
+            ):
+                index += 1
+            closed_path = self.path_for(day, index)
+            os.replace(self.path, closed_path)
+        self.rotations += 1
+        self.pending.put(closed_path)
+        self._open(day)
+
+    def _queue_leftovers(self):
+        """Ставит в очередь на сжатие несжатые файлы, кроме текущего"""
+        for name in sorted(os.listdir(self.directory)):
+            path = os.path.join(self.directory, name)
+            if name.startswith(_PREFIX) and name.endswith(".log") and path != self.path:
+                self.pending.put(path)
+        # Проверка предельного размера даже без закрытых файлов
+        self.pending.put("")
+
+    def _run_compression(self):
+        while True:
+            path = self.pending.get()
+            if path is None:
+                break
+            try:
+                if path and self.compress:
+                    self._compress(path)
+                self._enforce_limit()
+            except Exception as e:
+                print(f"Ошибка при сжатии файла лога {path}: {str(e)}")
+
+    def _compress(self, path):
+        """Сжимает файл в path.gz (через временный файл) и удаляет исходный"""
+        if not os.path.exists(path):
+            return
+        temp_path = f"{path}.gz.tmp"
+        with open(path, "rb") as source, open(temp_path, "wb") as target:
+            with gzip.GzipFile(
+                filename=os.path.basename(path),
+                mode="wb",
+                fileobj=target,
+                compresslevel=self.compress_level,
+            ) as compressed:
+                shutil.copyfileobj(source, compressed, 1024 * 1024)
+        os.replace(temp_path, f"{path}.gz")
+        os.remove(path)
+
+    def _enforce_limit(self):
+        """Удаляет самые старые файлы лога сверх max_total_bytes"""
+        if not self.max_total_bytes:
+            return
+        files = []
+        total = 0
+        for name in os.listdir(self.directory):
+            if not name.startswith(_PREFIX):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            total += stat.st_size
+            # Текущий файл не удаляется
+            if path != self.path and not name.endswith(".tmp"):
+                files.append((stat.st_mtime, path, stat.st_size))
+
+        for _, path, size in sorted(files):
+            if total <= self.max_total_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
@@ -0,0 +1,223 @@
+import datetime
+import threading
+import time
+from collections import deque
+
+# Уровни, записи которых при заполненной очереди ждут места (остальные
+# отбрасываются сразу)
+_IMPORTANT_LEVELS = frozenset(("WARNING", "ERROR", "CRITICAL", "ANOMALY"))
+
+
+class LogRecord:
+    """Запись лога в очереди фоновой записи"""
+
+    __slots__ = ("timestamp", "level", "source", "message", "line")
+
+    def __init__(self, timestamp, level, source, message, line):
+        self.timestamp = timestamp
+        self.level = level
+        self.source = source
+        self.message = message
+        # Готовая строка для файла лога
+        self.line = line
+
+
+class LogWriter:
+    """
+    Фоновая запись логов в файл и базу данных пачками.
+
+    Вызывающий поток только кладет запись в ограниченную очередь. Фоновый
+    поток забирает записи пачками (до batch_size записей или все, что
+    накопилось за flush_interval) и записывает каждую пачку в файл одним
+    вызовом write() и в базу данных одной многострочной вставкой с одним
+    commit. База данных открывается в фоновом потоке при первой пачке.
+
+    При заполненной очереди записи уровня WARNING и выше ждут места не
+    дольше block_timeout (обратное давление), остальные отбрасываются
+    сразу; о количестве отброшенных записей сообщается в самом логе.
+
+    Аргументы:
+        log_file: Файл лога (RotatingLogFile или любой объект с write/flush)
+        open_db (callable, optional): Возвращает сервис базы данных
+            (None - записи сохраняются только в файл)
+        queue_size (int): Максимальное количество записей в очереди
+        batch_size (int): Максимальное количество записей в одной пачке
+        flush_interval (float): Максимальная задержка записи, секунды
+        block_timeout (float): Ожидание места в очереди для важных записей
+    """
+
+    def __init__(
+        self,
+        log_file,
+        open_db=None,
+        queue_size=10000,
+        batch_size=500,
+        flush_interval=0.5,
+        block_timeout=0.5,
+    ):
+        self.log_file = log_file
+        self.open_db = open_db
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.block_timeout = block_timeout
+
+        self.lock = threading.Lock()
+        # Сигнал фоновому потоку: появились записи или нужна запись на диск
+        self.not_empty = threading.Condition(self.lock)
+        # Сигнал ждущим вызывающим потокам: в очереди освободилось место
+        self.not_full = threading.Condition(self.lock)
+        # Сигнал flush(): все записи, поставленные в очередь, записаны
+        self.written_cond = threading.Condition(self.lock)
+        self.queue = deque()
+        self.closed = False
+        self.flush_requested = False
+        # Записи, взятые из очереди и еще не записанные
+        self._in_flight = 0
+
+        # Счетчики
+        self.enqueued = 0
+        self.written = 0
+        self.dropped = 0
+        self.batches = 0
+        self._reported_dropped = 0
+
+        self.db_service = None
+        self._db_opened = open_db is None
+
+        self.thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self.thread.start()
+
+    def put(self, record):
+        """
+        Ставит запись в очередь, не выполняя ввод-вывод.
+
+        Возвращает:
+            bool: False, если запись отброшена из-за переполнения очереди
+        """
+        with self.lock:
+            if self.closed:
+                return False
+            if len(self.queue) >= self.queue_size:
+                if record.level not in _IMPORTANT_LEVELS:
+                    self.dropped += 1
+                    return False
+                deadline = time.monotonic() + self.block_timeout
+                while len(self.queue) >= self.queue_size and not self.closed:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.dropped += 1
+                        return False
+                    self.not_full.wait(remaining)
+            self.queue.append(record)
+            self.enqueued += 1
+            if len(self.queue) >= self.batch_size:
+                self.not_empty.notify()
+            return True
+
+    def flush(self, timeout=5.0):
+        """
+        Ждет, пока все записи, поставленные в очередь до вызова, будут
+        записаны.
+
+        Возвращает:
+            bool: True, если записи сохранены до истечения timeout
+        """
+        if threading.current_thread() is self.thread:
+            return False
+        with self.lock:
+            target = self.enqueued
+            self.flush_requested = True
+            self.not_empty.notify()
+            return self.written_cond.wait_for(lambda: self.written >= target, timeout)
+
+    def close(self, timeout=5.0):
+        """Записывает оставшиеся записи и останавливает фоновый поток"""
+        with self.lock:
+            if self.closed:
+                return
+            self.closed = True
+            self.not_empty.notify()
+            self.not_full.notify_all()
+        self.thread.join(timeout)
+
+    def _run(self):
+        while True:
+            with self.lock:
+                # Пачка набирается в течение flush_interval, если раньше не
+                # набралось batch_size записей и не запрошена запись на диск
+                if (
+                    len(self.queue) < self.batch_size
+                    and not self.closed
+                    and not self.flush_requested
+                ):
+                    self.not_empty.wait(self.flush_interval)
+                batch = [
+                    self.queue.popleft()
+                    for _ in range(min(self.batch_size, len(self.queue)))
+                ]
+                self._in_flight = len(batch)
+                if not self.queue:
+                    self.flush_requested = False
+                self.not_full.notify_all()
+                closing = self.closed and not self.queue
+                dropped = self.dropped - self._reported_dropped
+                self._reported_dropped = self.dropped
+
+            if dropped:
+                batch.append(self._dropped_record(dropped))
+            if batch:
+                self._write_batch(batch)
+
+            with self.lock:
+                self.written += self._in_flight
+                self._in_flight = 0
+                self.written_cond.notify_all()
+            if closing and not batch:
+                break
+
+    def _dropped_record(self, count):
+        timestamp = datetime.datetime.now()
+        message = f"Очередь логов переполнена, пропущено записей: {count}"
+        source = "log_writer.py"
+        return LogRecord(
+            timestamp,
+            "WARNING",
+            source,
+            message,
+            f"[{timestamp:%Y-%m-%d %H:%M:%S}] [WARNING] [{source}] {message}",
+        )
+
+    def _write_batch(self, batch):
+        """Записывает пачку в файл и в базу данных"""
+        try:
+            self.log_file.write("".join(record.line + "\n" for record in batch))
+            self.log_file.flush()
+        except Exception as e:
+            print(f"Ошибка при записи лога в файл: {str(e)}")
+
+        if not self._db_opened:
+            self._db_opened = True
+            try:
+                self.db_service = self.open_db()
+            except Exception as e:
+                print(f"Ошибка при открытии базы данных логов: {str(e)}")
+        if self.db_service:
+            self.db_service.add_logs(
+                [
+                    (record.timestamp, record.level, record.source, record.message)
+                    for record in batch
+                ]
+            )
+        self.batches += 1
+
+    def stats(self):
+        """Счетчики очереди: поставлено, записано, отброшено, пачек"""
+        with self.lock:
+            return {
+                "enqueued": self.enqueued,
+                "written": self.written,
+                "dropped": self.dropped,
+                "batches": self.batches,
+                "queued": len(self.queue),
+            }
@@ -1,14 +1,60 @@
+import atexit
 import datetime
 import os
-import inspect
+import sys
+import threading
+import time
 import traceback
+from modules.utils.log_writer import LogRecord, LogWriter
+from modules.utils.log_rotation import RotatingLogFile
+
+# Числовые значения уровней: сообщения ниже минимального уровня
+# отбрасываются до форматирования и определения места вызова
+LEVELS = {
+    "DEBUG": 10,
+    "INFO": 20,
+    "WARNING": 30,
+    "ANOMALY": 35,
+    "ERROR": 40,
+    "CRITICAL": 50,
+}
+DEBUG = LEVELS["DEBUG"]
+INFO = LEVELS["INFO"]
+WARNING = LEVELS["WARNING"]
+ERROR = LEVELS["ERROR"]
+
+
+def _open_db_service():
+    """Открывает базу данных логов (вызывается в потоке записи)"""
+    # Импортируем здесь, чтобы избежать циклических импортов
+    from modules.database.db_service import get_db_service
+
+    return get_db_service()
+
+
+def _log_settings():
+    """Настройки логгера (пустой словарь, если они недоступны)"""
+    try:
+        # Настройки импортируют логгер, поэтому читаются при первой записи
+        from modules.config.settings import LOG_SETTINGS
+
+        return LOG_SETTINGS
+    except ImportError:
+        return {}
+
+
+def _format(message, args):
+    """Подставляет аргументы в сообщение (как в модуле logging)"""
+    try:
+        return message % args
+    except (TypeError, ValueError):
+        return f"{message} {args}"
 
 
 class Logger:
     _instance = None
     _log_file = None
     _chat_callback = None
-    _db_service = None
 
     @classmethod
     def get_instance(cls):
@@ -20,95 +66,212 @@ class Logger:
         if Logger._instance is not None:
             raise Exception("Logger - это Singleton класс!")
 
-        # Создаем директорию для логов, если её нет
-        log_dir = os.path.join(
+        # Директория для логов (файл открывается при первой записи)
+        self._log_dir = os.path.join(
             os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "logs"
         )
-        os.makedirs(log_dir, exist_ok=True)
-
-        # Создаем файл лога с текущей датой
-        current_date = datetime.datetime.now().strftime("%Y-%m-%d")
-        log_path = os.path.join(log_dir, f"log_{current_date}.log")
-        self._log_file = open(log_path, "a", encoding="utf-8")
-
-        # Инициализируем сервис базы данных позже, чтобы избежать циклических импортов
-        self._db_service = None
-        self._db_initialized = False
-
-    def _init_db_service(self):
-        """Инициализирует сервис базы данных при первом использовании"""
-        if not self._db_initialized:
-            try:
-                # Импортируем здесь, чтобы избежать циклических импортов
-                from modules.database.db_service import get_db_service
-
-                self._db_service = get_db_service()
-                self._db_initialized = True
-            except ImportError:
-                # Если модуль еще не доступен, пропускаем инициализацию
-                pass
+
+        # До загрузки настроек записываются все уровни
+        self._min_level = DEBUG
+        # Не больше rate_limit сообщений в секунду из одного места вызова
+        # (0 - без ограничения) для уровней до rate_limit_level включительно
+        self._rate_limit = 0
+        self._rate_limit_level = INFO
+        # (код, строка) -> "файл:функция:строка"
+        self._sources = {}
+        # (код, строка) -> [секунда, сообщений за секунду, пропущено]
+        self._rates = {}
+
+        # Файл и база данных пишутся фоновым потоком пачками
+        self._writer = None
+        self._writer_lock = threading.Lock()
+        # Оставшиеся записи сохраняются при завершении процесса
+        atexit.register(self.close)
+
+    def _get_writer(self):
+        """Создает фоновую запись логов при первом использовании"""
+        if self._writer is None:
+            with self._writer_lock:
+                if self._writer is None:
+                    # Импорт настроек вызывает configure() с LOG_SETTINGS
+                    settings = _log_settings()
+                    # Файл лога с ротацией по дням и размеру
+                    self._log_file = RotatingLogFile(
+                        self._log_dir,
+                        max_bytes=settings.get("max_file_bytes", 10 * 1024 * 1024),
+                        max_total_bytes=settings.get(
+                            "max_total_bytes", 200 * 1024 * 1024
+                        ),
+                        compress=settings.get("compress", True),
+                        compress_level=settings.get("compress_level", 6),
+                    )
+                    self._writer = LogWriter(
+                        self._log_file,
+                        open_db=_open_db_service,
+                        queue_size=settings.get("queue_size", 10000),
+                        batch_size=settings.get("batch_size", 500),
+                        flush_interval=settings.get("flush_interval", 0.5),
+                        block_timeout=settings.get("block_timeout", 0.5),
+                    )
+        return self._writer
+
+    def configure(self, settings):
+        """
+        Применяет настройки логгера: минимальный уровень и ограничение
+        частоты сообщений из одного места вызова. Ограничение действует
+        только на уровни ниже WARNING: предупреждения, аномалии и ошибки
+        записываются всегда.
+
+        Аргументы:
+            settings (dict): Словарь вида LOG_SETTINGS
+        """
+        if settings.get("level"):
+            self.set_level(settings["level"])
+        self._rate_limit = settings.get("rate_limit", 0) or 0
+        level = LEVELS[settings.get("rate_limit_level", "INFO").upper()]
+        self._rate_limit_level = min(level, INFO)
+
+    def set_level(self, level):
+        """Устанавливает минимальный записываемый уровень ("DEBUG", "INFO", ...)"""
+        self._min_level = LEVELS[level.upper()]
+
+    def is_enabled_for(self, level):
+        """
+        Проверяет, будет ли записано сообщение уровня level. Нужна перед
+        подготовкой дорогих данных для сообщения.
+        """
+        return LEVELS.get(level, INFO) >= self._min_level
 
     def set_chat_callback(self, callback):
-        """Устанавливает функцию обратного вызова для отображения логов в чате"""
+        """
+        Устанавливает функцию обратного вызова для отображения логов в чате.
+        Функция вызывается с аргументами (message, level, source).
+        """
         self._chat_callback = callback
 
-    def log(self, message, level="INFO"):
+    def log(self, message, level="INFO", *args):
         """Записывает сообщение в лог и отправляет в чат, если установлен callback"""
-        # Получаем информацию о вызывающем файле и функции
-        caller_frame = inspect.currentframe().f_back
-        caller_info = inspect.getframeinfo(caller_frame)
-        file_name = os.path.basename(caller_info.filename)
-        line_number = caller_info.lineno
-        function_name = caller_info.function
-        source = f"{file_name}:{function_name}:{line_number}"
-
-        timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        if LEVELS.get(level, INFO) < self._min_level:
+            return None
+        return self._log(level, message, args)
+
+    def _caller_source(self, frame):
+        """Место вызова "файл:функция:строка" (кэшируется по коду и строке)"""
+        key = (frame.f_code, frame.f_lineno)
+        source = self._sources.get(key)
+        if source is None:
+            code = frame.f_code
+            source = (
+                f"{os.path.basename(code.co_filename)}:{code.co_name}:{frame.f_lineno}"
+            )
+            self._sources[key] = source
+        return key, source
+
+    def _rate_limited(self, key):
+        """
+        Учитывает сообщение в ограничении частоты места вызова.
+
+        Возвращает:
+            int или None: None, если сообщение нужно пропустить, иначе
+            количество пропущенных перед ним сообщений
+        """
+        second = int(time.monotonic())
+        rate = self._rates.get(key)
+        if rate is None or rate[0] != second:
+            suppressed = rate[2] if rate is not None else 0
+            self._rates[key] = [second, 1, 0]
+            return suppressed
+        if rate[1] >= self._rate_limit:
+            rate[2] += 1
+            return None
+        rate[1] += 1
+        return 0
+
+    def _log(self, level, message, args):
+        # Кадр 0 - _log, 1 - метод логгера, 2 - вызывающий код
+        key, source = self._caller_source(sys._getframe(2))
+
+        if self._rate_limit and LEVELS.get(level, INFO) <= self._rate_limit_level:
+            suppressed = self._rate_limited(key)
+            if suppressed is None:
+                return None
+        else:
+            suppressed = 0
+
+        if args:
+            message = _format(message, args)
+        if suppressed:
+            message = f"{message} (пропущено повторов: {suppressed})"
+
+        now = datetime.datetime.now()
+        timestamp = now.strftime("%Y-%m-%d %H:%M:%S")
         log_message = f"[{timestamp}] [{level}] [{source}] {message}"
 
-        # Запись в файл
-        self._log_file.write(log_message + "\n")
-        self._log_file.flush()
+        # Запись в файл и базу данных выполняется фоновым потоком
+        self._get_writer().put(LogRecord(now, level, source, message, log_message))
 
         # Отправка в чат, если установлен callback
         if self._chat_callback:
-            self._chat_callback(log_message)
-
-        # Сохранение в базу данных (отложенная инициализация)
-        try:
-            self._init_db_service()
-            if self._db_service and self._db_initialized:
-                self._db_service.add_log(level, source, message)
-        except Exception as e:
-            # Не используем self.error() здесь, чтобы избежать рекурсии
-            print(f"Ошибка при сохранении лога в базу данных: {str(e)}")
+            self._chat_callback(log_message, level, source)
 
         return log_message
 
-    def info(self, message):
-        return self.log(message, "INFO")
+    def flush(self, timeout=5.0):
+        """Ждет, пока все записанные до вызова сообщения будут сохранены"""
+        if self._writer is None:
+            return True
+        return self._writer.flush(timeout)
 
-    def warning(self, message):
-        return self.log(message, "WARNING")
+    def close(self):
+        """Сохраняет оставшиеся сообщения и останавливает фоновую запись"""
+        if self._writer is not None:
+            self._writer.close()
+        if self._log_file is not None:
+            self._log_file.close()
+
+    def stats(self):
+        """Счетчики фоновой записи логов"""
+        if self._writer is None:
+            return None
+        return self._writer.stats()
+
+    # Сообщения форматируются только если они будут записаны:
+    # logger.debug("Отфильтровано %d процессов", count)
+
+    def info(self, message, *args):
+        if self._min_level > INFO:
+            return None
+        return self._log("INFO", message, args)
 
-    def error(self, message, include_traceback=True):
+    def warning(self, message, *args):
+        if self._min_level > WARNING:
+            return None
+        return self._log("WARNING", message, args)
+
+    def error(self, message, *args, include_traceback=True):
+        if self._min_level > ERROR:
+            return None
+        if args:
+            # Трассировка добавляется после подстановки аргументов
+            message, args = _format(message, args), ()
         if include_traceback:
             tb = traceback.format_exc()
             if tb != "NoneType: None\n":
                 message = f"{message}\n{tb}"
-        return self.log(message, "ERROR")
+        return self._log("ERROR", message, args)
 
-    def debug(self, message):
-        return self.log(message, "DEBUG")
+    def debug(self, message, *args):
+        if self._min_level > DEBUG:
+            return None
+        return self._log("DEBUG", message, args)
 
     def exception(self, e, message="Произошло исключение:"):
         """Логирует исключение с трассировкой"""
+        if self._min_level > ERROR:
+            return None
         error_message = f"{message} {str(e)}"
         tb = traceback.format_exc()
-        return self.log(f"{error_message}\n{tb}", "ERROR")
-
-    def __del__(self):
-        if self._log_file:
-            self._log_file.close()
+        return self._log("ERROR", f"{error_message}\n{tb}", ())
 
 
 # Создаем глобальный экземпляр логгера
@@ -22,7 +22,7 @@ class ProcessManager:
             2. Фильтрует процессы по имени и PID, содержащим поисковый запрос
             3. Возвращает отфильтрованный список
         """
-        logger.debug(f"Фильтрация процессов по тексту: '{search_text}'")
+        logger.debug("Фильтрация процессов по тексту: '%s'", search_text)
         if not search_text:
             return processes.copy()
         search_text = search_text.lower()
@@ -34,16 +34,18 @@ class ProcessManager:
             or search_text in process[2]
             or search_text in process[3]
             or search_text in process[4].lower()
+            # Метка хоста для данных с нескольких агентов
+            or (len(process) > 5 and search_text in process[5].lower())
         ]
-        logger.info(
-            f"Отфильтровано {len(filtered_processes)} из {len(processes)} процессов"
+        logger.debug(
+            "Отфильтровано %d из %d процессов", len(filtered_processes), len(processes)
         )
         return filtered_processes
 
     @staticmethod
     def sort_processes(processes, column_index, ascending=True):
         logger.debug(
-            f"Сортировка процессов по колонке {column_index}, ascending={ascending}"
+            "Сортировка процессов по колонке %s, ascending=%s", column_index, ascending
         )
 
         def to_number(value):
@@ -72,5 +74,5 @@ class ProcessManager:
             key = lambda x: x[0].lower()
 
         sorted_processes = sorted(processes, key=key, reverse=not ascending)
-        logger.debug(f"Процессы отсортированы успешно")
+        logger.debug("Процессы отсортированы успешно")
         return sorted_processes
@@ -0,0 +1,66 @@
+import sys
+import time
+
+# Этапы запуска: (название, время perf_counter)
+_marks = []
+_enabled = False
+_reported = False
+
+
+def enable():
+    """Включает вывод отчета о запуске (флаг --startup-report)"""
+    global _enabled
+    _enabled = True
+
+
+def mark(phase):
+    """
+    Отмечает завершение этапа запуска.
+
+    Аргументы:
+        phase (str): Название этапа
+    """
+    _marks.append((phase, time.perf_counter()))
+
+
+def _process_age():
+    """Время от старта процесса до текущего момента, секунды"""
+    try:
+        import psutil
+
+        return time.time() - psutil.Process().create_time()
+    except Exception:
+        return None
+
+
+def report(final_phase="Первый кадр"):
+    """
+    Отмечает последний этап и выводит отчет о запуске в stderr в формате,
+    похожем на python -X importtime: время этапа | время с начала | этап.
+
+    Отчет выводится один раз и только если он включен.
+
+    Возвращает:
+        float или None: Время от старта процесса до последнего этапа, секунды
+    """
+    global _reported
+    mark(final_phase)
+    if _reported or not _enabled:
+        return None
+    _reported = True
+
+    # Время до первой отметки - запуск интерпретатора и импорт main
+    age = _process_age()
+    now = time.perf_counter()
+    start = now - age if age is not None else _marks[0][1]
+
+    lines = ["startup: этап [мс] | с начала [мс] | название"]
+    previous = start
+    for phase, moment in _marks:
+        lines.append(
+            f"startup: {(moment - previous) * 1000:9.1f} | "
+            f"{(moment - start) * 1000:13.1f} | {phase}"
+        )
+        previous = moment
+    print("\n".join(lines), file=sys.stderr)
+    return _marks[-1][1] - start